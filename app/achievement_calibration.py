@@ -3,11 +3,11 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import event, func, inspect, update
+from sqlalchemy.orm import Session, object_session
 
+from .achievement_catalog import active_achievement_definitions
 from .models import (
-    AchievementDefinition,
     AchievementFamilyCalibration,
     Family,
     PointsLedger,
@@ -27,6 +27,8 @@ MIN_POINT_SCALE = 35
 MAX_POINT_SCALE = 800
 HISTORICAL_SAMPLE_DAYS = 56
 SCALABLE_POINT_METRICS = {"earned_points_total", "current_points_balance"}
+CALIBRATION_RECOMPUTE_INTERVAL = timedelta(days=1)
+CALIBRATION_DIRTY_FAMILIES_KEY = "achievement_calibration_dirty_families"
 CONFIGURED_TASK_STATUSES = {
     TaskStatusEnum.open.value,
     TaskStatusEnum.submitted.value,
@@ -60,6 +62,8 @@ def ensure_family_achievement_calibration(
     calibration = _get_or_create_calibration(db, family_id, now)
     if calibration.status == "applied":
         return calibration
+    if _calibration_is_fresh(db, calibration, now):
+        return calibration
 
     computation = compute_family_achievement_calibration(db, family_id, calibration.started_at, now=now)
 
@@ -70,7 +74,9 @@ def ensure_family_achievement_calibration(
         calibration.status = computation.status
 
     _copy_computation_to_row(calibration, computation)
+    calibration.computed_at = now
     db.flush()
+    db.info.get(CALIBRATION_DIRTY_FAMILIES_KEY, set()).discard(int(family_id))
     return calibration
 
 
@@ -102,6 +108,7 @@ def apply_family_achievement_recalibration(
     calibration.status = "applied"
     calibration.calibrated_at = now
     _copy_computation_to_row(calibration, computation)
+    calibration.computed_at = now
     calibration.preview_payload = dict(calibration.preview_payload or {})
     calibration.preview_payload["status"] = "applied"
     calibration.preview_payload["message"] = (
@@ -206,6 +213,75 @@ def calibration_overview_payload(calibration: AchievementFamilyCalibration | Non
     return _calibration_payload(calibration)
 
 
+def _calibration_is_fresh(db: Session, calibration: AchievementFamilyCalibration, now: datetime) -> bool:
+    if int(calibration.family_id) in db.info.get(CALIBRATION_DIRTY_FAMILIES_KEY, ()):
+        return False
+    computed_at = calibration.computed_at
+    return computed_at is not None and now - computed_at < CALIBRATION_RECOMPUTE_INTERVAL
+
+
+# Nur Spalten, die compute_family_achievement_calibration liest; Status- und Strafzeitstempel
+# aendern sich bei jeder Pruefung und werden von der taeglichen Neuberechnung erfasst.
+CALIBRATION_INPUT_ATTRIBUTES = {
+    Task: ("points", "is_active", "recurrence_type", "active_weekdays", "assignee_id", "special_template_id"),
+    Reward: ("is_active",),
+    SpecialTaskTemplate: ("points", "is_active", "interval_type", "active_weekdays", "max_claims_per_interval"),
+}
+
+
+@event.listens_for(Task, "after_insert")
+@event.listens_for(Task, "after_delete")
+@event.listens_for(Reward, "after_insert")
+@event.listens_for(Reward, "after_delete")
+@event.listens_for(SpecialTaskTemplate, "after_insert")
+@event.listens_for(SpecialTaskTemplate, "after_delete")
+def _invalidate_calibration_on_change(_mapper, connection, target) -> None:
+    _mark_calibration_dirty(connection, target)
+
+
+@event.listens_for(Task, "after_update")
+@event.listens_for(Reward, "after_update")
+@event.listens_for(SpecialTaskTemplate, "after_update")
+def _invalidate_calibration_on_input_change(_mapper, connection, target) -> None:
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in CALIBRATION_INPUT_ATTRIBUTES[type(target)]):
+        _mark_calibration_dirty(connection, target)
+
+
+def _mark_calibration_dirty(connection, target) -> None:
+    session = object_session(target)
+    family_id = getattr(target, "family_id", None)
+    if session is None or family_id is None:
+        return
+    dirty = session.info.setdefault(CALIBRATION_DIRTY_FAMILIES_KEY, set())
+    if int(family_id) in dirty:
+        return
+    dirty.add(int(family_id))
+    # Einmal pro Familie und Transaktion; der Marker in der DB gilt auch fuer andere Sessions.
+    # Angewendete Kalibrierungen werden nicht mehr neu berechnet und bleiben unberuehrt.
+    connection.execute(
+        update(AchievementFamilyCalibration)
+        .where(
+            AchievementFamilyCalibration.family_id == int(family_id),
+            AchievementFamilyCalibration.status != "applied",
+            AchievementFamilyCalibration.computed_at.is_not(None),
+        )
+        .values(computed_at=None)
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_calibration_marks_after_commit(session: Session) -> None:
+    session.info.pop(CALIBRATION_DIRTY_FAMILIES_KEY, None)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_calibration_marks_after_rollback(session: Session, previous_transaction) -> None:
+    if previous_transaction.nested:
+        return
+    session.info.pop(CALIBRATION_DIRTY_FAMILIES_KEY, None)
+
+
 def _get_or_create_calibration(db: Session, family_id: int, now: datetime) -> AchievementFamilyCalibration:
     calibration = (
         db.query(AchievementFamilyCalibration)
@@ -467,14 +543,8 @@ def _computation_payload(computation: CalibrationComputation) -> dict:
 
 
 def _build_scaled_achievement_preview(db: Session, *, current_scale: int, preview_scale: int) -> list[dict]:
-    rows = (
-        db.query(AchievementDefinition)
-        .filter(AchievementDefinition.is_active == True)  # noqa: E712
-        .order_by(AchievementDefinition.sort_order.asc(), AchievementDefinition.id.asc())
-        .all()
-    )
     changes: list[dict] = []
-    for definition in rows:
+    for definition in active_achievement_definitions(db):
         metric = str((definition.rule_config or {}).get("metric") or "")
         if not is_point_scaled_metric(metric):
             continue
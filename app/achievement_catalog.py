@@ -1,6 +1,12 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from threading import Lock
+from types import MappingProxyType
+from typing import Any, Mapping
+from weakref import WeakKeyDictionary
 
 from sqlalchemy.orm import Session
 
@@ -9,6 +15,7 @@ from .models import (
     AchievementDifficultyEnum,
     AchievementRewardKindEnum,
     AchievementRuleKindEnum,
+    SystemState,
 )
 
 
@@ -37,6 +44,37 @@ class AchievementSeed:
     sort_order: int
 
 
+@dataclass(frozen=True)
+class AchievementDefinitionView:
+    id: int
+    key: str
+    name: str
+    description: str
+    category: str
+    icon_key: str
+    sort_order: int
+    difficulty: AchievementDifficultyEnum
+    rule_kind: AchievementRuleKindEnum
+    rule_config: Mapping[str, Any]
+    reward_kind: AchievementRewardKindEnum
+    reward_config: Mapping[str, Any]
+    teaser: str | None
+    is_active: bool
+
+
+@dataclass(frozen=True)
+class _DefinitionCache:
+    by_id: Mapping[int, AchievementDefinitionView]
+    active: tuple[AchievementDefinitionView, ...]
+    active_by_metric: Mapping[str, tuple[AchievementDefinitionView, ...]]
+
+
+CATALOG_HASH_STATE_KEY = "achievement_catalog_hash"
+_definition_cache_guard = Lock()
+# Pro Engine, damit Tests mit eigener Datenbank nicht fremde IDs sehen.
+_definition_caches: WeakKeyDictionary = WeakKeyDictionary()
+
+
 def _reward_config(difficulty: AchievementDifficultyEnum) -> dict:
     points = DEFAULT_REWARD_POINTS_BY_DIFFICULTY[difficulty]
     return {
@@ -517,6 +555,11 @@ ACHIEVEMENT_CATALOG: list[AchievementSeed] = [
 ]
 
 
+def catalog_content_hash() -> str:
+    payload = json.dumps([asdict(seed) for seed in ACHIEVEMENT_CATALOG], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
 def sync_achievement_catalog(db: Session) -> None:
     existing = {
         row.key: row
@@ -530,26 +573,127 @@ def sync_achievement_catalog(db: Session) -> None:
             row = AchievementDefinition(key=seed.key)
             db.add(row)
 
-        row.name = seed.name
-        row.description = seed.description
-        row.category = seed.category
-        row.icon_key = seed.icon_key
-        row.sort_order = seed.sort_order
-        row.difficulty = seed.difficulty
-        row.rule_kind = seed.rule_kind
-        row.rule_config = dict(seed.rule_config)
-        row.reward_kind = seed.reward_kind
-        row.reward_config = dict(seed.reward_config)
-        row.teaser = seed.teaser
-        row.is_active = True
+        # Nur geaenderte Felder setzen, sonst markiert SQLAlchemy jede JSON-Spalte als dirty.
+        values = {
+            "name": seed.name,
+            "description": seed.description,
+            "category": seed.category,
+            "icon_key": seed.icon_key,
+            "sort_order": seed.sort_order,
+            "difficulty": seed.difficulty,
+            "rule_kind": seed.rule_kind,
+            "rule_config": dict(seed.rule_config),
+            "reward_kind": seed.reward_kind,
+            "reward_config": dict(seed.reward_config),
+            "teaser": seed.teaser,
+            "is_active": True,
+        }
+        for field, value in values.items():
+            if getattr(row, field) != value:
+                setattr(row, field, value)
 
     for key, row in existing.items():
-        if _is_obsolete_managed_milestone_key(key, active_catalog_keys):
+        if _is_obsolete_managed_milestone_key(key, active_catalog_keys) and row.is_active:
             row.is_active = False
 
     db.flush()
 
 
+def sync_achievement_catalog_if_changed(db: Session) -> bool:
+    catalog_hash = catalog_content_hash()
+    state = db.query(SystemState).filter(SystemState.key == CATALOG_HASH_STATE_KEY).first()
+    active_count = int(
+        db.query(AchievementDefinition.id).filter(AchievementDefinition.is_active == True).count()  # noqa: E712
+    )
+    if state is not None and state.value == catalog_hash and active_count == len(ACHIEVEMENT_CATALOG):
+        return False
+
+    sync_achievement_catalog(db)
+    if state is None:
+        db.add(SystemState(key=CATALOG_HASH_STATE_KEY, value=catalog_hash))
+    else:
+        state.value = catalog_hash
+    db.flush()
+    return True
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _load_definition_cache(db: Session) -> _DefinitionCache:
+    views = [
+        AchievementDefinitionView(
+            id=int(row.id),
+            key=row.key,
+            name=row.name,
+            description=row.description,
+            category=row.category,
+            icon_key=row.icon_key,
+            sort_order=int(row.sort_order),
+            difficulty=row.difficulty,
+            rule_kind=row.rule_kind,
+            rule_config=_freeze(dict(row.rule_config or {})),
+            reward_kind=row.reward_kind,
+            reward_config=_freeze(dict(row.reward_config or {})),
+            teaser=row.teaser,
+            is_active=bool(row.is_active),
+        )
+        for row in db.query(AchievementDefinition)
+        .order_by(AchievementDefinition.sort_order.asc(), AchievementDefinition.id.asc())
+        .all()
+    ]
+    active = tuple(view for view in views if view.is_active)
+    by_metric: dict[str, list[AchievementDefinitionView]] = {}
+    for view in active:
+        by_metric.setdefault(str(view.rule_config.get("metric") or ""), []).append(view)
+    return _DefinitionCache(
+        by_id=MappingProxyType({view.id: view for view in views}),
+        active=active,
+        active_by_metric=MappingProxyType({metric: tuple(entries) for metric, entries in by_metric.items()}),
+    )
+
+
+def _definition_cache(db: Session) -> _DefinitionCache:
+    bind = db.get_bind()
+    with _definition_cache_guard:
+        cached = _definition_caches.get(bind)
+    if cached is not None:
+        return cached
+    loaded = _load_definition_cache(db)
+    with _definition_cache_guard:
+        return _definition_caches.setdefault(bind, loaded)
+
+
+def active_achievement_definitions(db: Session) -> tuple[AchievementDefinitionView, ...]:
+    return _definition_cache(db).active
+
+
+def active_achievement_definitions_for_metrics(
+    db: Session,
+    metrics: frozenset[str] | None,
+) -> tuple[AchievementDefinitionView, ...]:
+    cache = _definition_cache(db)
+    if metrics is None:
+        return cache.active
+    selected = [view for metric in metrics for view in cache.active_by_metric.get(metric, ())]
+    # Katalogreihenfolge beibehalten, damit Freischaltungen wie bei der Vollauswertung ablaufen.
+    return tuple(sorted(selected, key=lambda view: (view.sort_order, view.id)))
+
+
+def achievement_definition_by_id(db: Session, achievement_id: int) -> AchievementDefinitionView | None:
+    return _definition_cache(db).by_id.get(int(achievement_id))
+
+
+def invalidate_achievement_definition_cache(db: Session) -> None:
+    with _definition_cache_guard:
+        _definition_caches.pop(db.get_bind(), None)
+
+
 def _is_obsolete_managed_milestone_key(key: str, active_catalog_keys: set[str]) -> bool:
     if key in active_catalog_keys:
         return False
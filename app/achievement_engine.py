@@ -1,9 +1,13 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import hashlib
+import json
+from collections.abc import Iterable
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
+from typing import NamedTuple
 
-from sqlalchemy import func
+from sqlalchemy import case, event, func, insert, literal
 from sqlalchemy.orm import Session
 
 from .achievement_calibration import (
@@ -14,9 +18,16 @@ from .achievement_calibration import (
     scaled_achievement_reward,
     scaled_achievement_target,
 )
-from .achievement_catalog import sync_achievement_catalog
+from .achievement_catalog import (
+    AchievementDefinitionView,
+    achievement_definition_by_id,
+    active_achievement_definitions,
+    active_achievement_definitions_for_metrics,
+    invalidate_achievement_definition_cache,
+    sync_achievement_catalog_if_changed,
+)
 from .models import (
-    AchievementDefinition,
+    AchievementDifficultyEnum,
     AchievementFamilyCalibration,
     AchievementFreezeScopeEnum,
     AchievementFreezeWindow,
@@ -27,6 +38,10 @@ from .models import (
     AchievementTaskOutcomeEnum,
     AchievementTaskRecord,
     AchievementUnlockEvent,
+    AchievementUserCounter,
+    AchievementUserSummary,
+    FamilyMembership,
+    PointsBalance,
     PointsLedger,
     PointsSourceEnum,
     RedemptionStatusEnum,
@@ -36,12 +51,35 @@ from .models import (
     TaskStatusEnum,
     User,
 )
-from .services import emit_live_event
+from .services import dialect_insert, emit_live_event
 
 STREAK_FREEZE_SCOPE = AchievementFreezeScopeEnum.streaks
-EARNED_POINTS_SOURCES = {
-    PointsSourceEnum.task_approval,
-    PointsSourceEnum.manual_adjustment,
+
+POINT_METRICS = frozenset({"earned_points_total", "current_points_balance"})
+REDEMPTION_METRICS = frozenset({"approved_reward_redemptions_total"})
+TASK_COUNTER_METRICS = frozenset({"approved_tasks_total", "approved_special_tasks_total", "approved_weekly_tasks_total"})
+TASK_STREAK_METRICS = frozenset(
+    {"all_due_tasks_completed", "all_due_tasks_completed_early", "all_active_special_tasks_completed"}
+)
+TASK_METRICS = TASK_COUNTER_METRICS | TASK_STREAK_METRICS | POINT_METRICS
+CONTEXT_CACHE_KEY = "achievement_context_cache"
+PERIOD_SWEEP_STATE_KEY = "achievement_period_sweep"
+
+# Ausloeser -> betroffene Metriken. Unbekannte Ausloeser werten weiterhin den ganzen Katalog aus.
+TRIGGER_METRICS: dict[str, frozenset[str]] = {
+    "task_approved_manual": TASK_METRICS,
+    "task_approved_review": TASK_METRICS,
+    "task_approved_missed_review": TASK_METRICS,
+    "task_missed_review": TASK_METRICS,
+    "points_manual_adjustment": POINT_METRICS,
+    "task_penalty_applied": POINT_METRICS,
+    "reward_contribution_reserved": POINT_METRICS,
+    "reward_redemption_reserved": POINT_METRICS,
+    "reward_redemption_approved": POINT_METRICS | REDEMPTION_METRICS,
+    "reward_redemption_rejected": POINT_METRICS,
+    "achievement_reward_claimed": POINT_METRICS,
+    "freeze_updated": TASK_STREAK_METRICS,
+    "period_boundary": TASK_STREAK_METRICS,
 }
 
 
@@ -67,22 +105,65 @@ class PeriodResult:
     target_value: int
 
 
+class TaskRecordRow(NamedTuple):
+    task_id: int
+    special_template_id: int | None
+    recurrence_type: str
+    outcome: AchievementTaskOutcomeEnum
+    proxy_due: datetime
+    completed_at: datetime | None
+
+
+class CurrentTaskRow(NamedTuple):
+    id: int
+    recurrence_type: str
+    status: str
+    proxy_due: datetime
+    proxy_completed: datetime | None
+
+
+@dataclass
+class PeriodBucket:
+    records: list[TaskRecordRow] = field(default_factory=list)
+    tasks: list[CurrentTaskRow] = field(default_factory=list)
+
+
 @dataclass
 class EvaluationContext:
     family_id: int
     user: User
-    task_records: list[AchievementTaskRecord]
-    current_tasks: list[Task]
-    active_special_template_ids: list[int]
+    task_records: tuple[TaskRecordRow, ...]
+    current_tasks: tuple[CurrentTaskRow, ...]
+    active_special_template_ids: tuple[int, ...]
     freeze_windows: list[AchievementFreezeWindow]
     earned_points_total: int
     current_points_balance: int
     approved_reward_redemptions_total: int
+    approved_tasks_total: int
+    approved_special_tasks_total: int
+    approved_weekly_tasks_total: int
     calibration: AchievementFamilyCalibration | None
+    # Periodenschluessel -> Aufgaben, einmal pro Auswertung und Periodenart gebildet.
+    period_buckets: dict[str, dict[datetime, PeriodBucket]] = field(default_factory=dict)
 
 
 def ensure_achievement_catalog(db: Session) -> None:
-    sync_achievement_catalog(db)
+    # Laeuft beim Start (und nach einem Restore); die Engine liest danach nur noch den Cache.
+    changed = sync_achievement_catalog_if_changed(db)
+    invalidate_achievement_definition_cache(db)
+    if changed:
+        # Neue oder deaktivierte Definitionen aendern die gezaehlten Freischaltungen.
+        rebuild_achievement_user_summaries(db)
+
+
+def affected_metrics(reasons: Iterable[str]) -> frozenset[str] | None:
+    metrics: set[str] = set()
+    for reason in reasons:
+        reason_metrics = TRIGGER_METRICS.get(reason)
+        if reason_metrics is None:
+            return None
+        metrics.update(reason_metrics)
+    return frozenset(metrics)
 
 
 def record_task_outcome(
@@ -95,7 +176,9 @@ def record_task_outcome(
     points_awarded: int,
     metadata: dict | None = None,
 ) -> AchievementTaskRecord:
+    invalidate_achievement_context_cache(db)
     record = db.query(AchievementTaskRecord).filter(AchievementTaskRecord.task_id == task.id).first()
+    previous_contribution = _task_counter_contribution(record)
     if record is None:
         record = AchievementTaskRecord(
             family_id=task.family_id,
@@ -118,9 +201,170 @@ def record_task_outcome(
     record.points_awarded = int(points_awarded)
     record.metadata_json = dict(metadata or {})
     db.flush()
+
+    contribution = _task_counter_contribution(record)
+    if contribution != previous_contribution:
+        if previous_contribution is not None:
+            _apply_task_counter_delta(db, previous_contribution, -1)
+        if contribution is not None:
+            _apply_task_counter_delta(db, contribution, 1)
     return record
 
 
+def _task_counter_contribution(record: AchievementTaskRecord | None) -> tuple[int, int, int, int] | None:
+    if record is None or record.outcome != AchievementTaskOutcomeEnum.approved:
+        return None
+    return (
+        int(record.family_id),
+        int(record.user_id),
+        1 if record.special_template_id is not None else 0,
+        1 if record.recurrence_type == "weekly" else 0,
+    )
+
+
+def _apply_task_counter_delta(db: Session, contribution: tuple[int, int, int, int], sign: int) -> None:
+    family_id, user_id, special, weekly = contribution
+    connection = db.connection()
+    table = AchievementUserCounter.__table__
+    statement = dialect_insert(connection)(table).values(
+        family_id=family_id,
+        user_id=user_id,
+        approved_tasks_total=sign,
+        approved_special_tasks_total=sign * special,
+        approved_weekly_tasks_total=sign * weekly,
+        updated_at=datetime.utcnow(),
+    )
+    connection.execute(
+        statement.on_conflict_do_update(
+            index_elements=[table.c.family_id, table.c.user_id],
+            set_={
+                "approved_tasks_total": table.c.approved_tasks_total + statement.excluded.approved_tasks_total,
+                "approved_special_tasks_total": (
+                    table.c.approved_special_tasks_total + statement.excluded.approved_special_tasks_total
+                ),
+                "approved_weekly_tasks_total": (
+                    table.c.approved_weekly_tasks_total + statement.excluded.approved_weekly_tasks_total
+                ),
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+    )
+
+
+def rebuild_achievement_user_counters(db: Session) -> None:
+    approved = AchievementTaskRecord.outcome == AchievementTaskOutcomeEnum.approved
+    aggregate = (
+        db.query(
+            AchievementTaskRecord.family_id,
+            AchievementTaskRecord.user_id,
+            func.count(AchievementTaskRecord.id),
+            func.sum(case((AchievementTaskRecord.special_template_id.is_not(None), 1), else_=0)),
+            func.sum(case((AchievementTaskRecord.recurrence_type == "weekly", 1), else_=0)),
+            literal(datetime.utcnow()),
+        )
+        .filter(approved)
+        .group_by(AchievementTaskRecord.family_id, AchievementTaskRecord.user_id)
+        .statement
+    )
+    db.query(AchievementUserCounter).delete(synchronize_session=False)
+    db.execute(
+        insert(AchievementUserCounter).from_select(
+            [
+                "family_id",
+                "user_id",
+                "approved_tasks_total",
+                "approved_special_tasks_total",
+                "approved_weekly_tasks_total",
+                "updated_at",
+            ],
+            aggregate,
+        )
+    )
+
+
+def refresh_achievement_user_summary(
+    db: Session,
+    family_id: int,
+    user_id: int,
+    *,
+    calibration: AchievementFamilyCalibration | None = None,
+) -> None:
+    if calibration is None:
+        calibration = (
+            db.query(AchievementFamilyCalibration)
+            .filter(AchievementFamilyCalibration.family_id == family_id)
+            .first()
+        )
+    definitions = {definition.id: definition for definition in active_achievement_definitions(db)}
+    values = {
+        "unlocked_count": 0,
+        **{f"{difficulty.value}_unlocked_count": 0 for difficulty in AchievementDifficultyEnum},
+        "profile_claimable_count": 0,
+        "reward_claimable_count": 0,
+        "last_unlocked_at": None,
+    }
+    unlocked_rows = db.query(
+        AchievementProgress.achievement_id,
+        AchievementProgress.unlocked_at,
+        AchievementProgress.profile_claimed_at,
+        AchievementProgress.reward_granted_at,
+    ).filter(
+        AchievementProgress.family_id == family_id,
+        AchievementProgress.user_id == user_id,
+        AchievementProgress.unlocked_at.is_not(None),
+    )
+    for row in unlocked_rows:
+        definition = definitions.get(row.achievement_id)
+        if definition is None:
+            continue
+        values["unlocked_count"] += 1
+        values[f"{definition.difficulty.value}_unlocked_count"] += 1
+        if row.profile_claimed_at is None:
+            values["profile_claimable_count"] += 1
+        elif row.reward_granted_at is None and _reward_points(definition, calibration) > 0:
+            values["reward_claimable_count"] += 1
+        if values["last_unlocked_at"] is None or row.unlocked_at > values["last_unlocked_at"]:
+            values["last_unlocked_at"] = row.unlocked_at
+
+    connection = db.connection()
+    table = AchievementUserSummary.__table__
+    statement = dialect_insert(connection)(table).values(
+        family_id=family_id,
+        user_id=user_id,
+        updated_at=datetime.utcnow(),
+        **values,
+    )
+    connection.execute(
+        statement.on_conflict_do_update(
+            index_elements=[table.c.family_id, table.c.user_id],
+            set_={column: statement.excluded[column] for column in (*values, "updated_at")},
+        )
+    )
+
+
+def refresh_family_achievement_summaries(
+    db: Session,
+    family_id: int,
+    *,
+    calibration: AchievementFamilyCalibration | None = None,
+) -> None:
+    user_ids = (
+        db.query(AchievementProgress.user_id)
+        .filter(AchievementProgress.family_id == family_id)
+        .distinct()
+        .all()
+    )
+    for (user_id,) in user_ids:
+        refresh_achievement_user_summary(db, family_id, int(user_id), calibration=calibration)
+
+
+def rebuild_achievement_user_summaries(db: Session) -> None:
+    db.query(AchievementUserSummary).delete(synchronize_session=False)
+    pairs = db.query(AchievementProgress.family_id, AchievementProgress.user_id).distinct().all()
+    for family_id, user_id in pairs:
+        refresh_achievement_user_summary(db, int(family_id), int(user_id))
+
+
 def list_freeze_windows(db: Session, family_id: int, user_id: int) -> list[AchievementFreezeWindow]:
     return (
         db.query(AchievementFreezeWindow)
@@ -141,118 +385,178 @@ def evaluate_achievements_for_user(
     triggered_by_id: int | None = None,
     reason: str = "system",
     emit_events: bool = True,
+    coalesced_reasons: tuple[str, ...] = (),
 ) -> list[AchievementUnlockEvent]:
-    ensure_achievement_catalog(db)
-    definitions = (
-        db.query(AchievementDefinition)
-        .filter(AchievementDefinition.is_active == True)  # noqa: E712
-        .order_by(AchievementDefinition.sort_order.asc(), AchievementDefinition.id.asc())
-        .all()
-    )
+    # Bekannte Ausloeser werten nur die Erfolge aus, deren Metrik sich dadurch aendern kann.
+    metrics = affected_metrics((reason, *coalesced_reasons))
+    definitions = active_achievement_definitions_for_metrics(db, metrics)
     if not definitions:
         return []
 
-    unlock_events: list[AchievementUnlockEvent] = []
     now = datetime.utcnow()
     calibration = ensure_family_achievement_calibration(db, family_id, now=now)
+    context = _load_context(db, family_id, user_id, calibration=calibration, metrics=metrics)
 
-    for _ in range(4):
-        context = _load_context(db, family_id, user_id, calibration=calibration)
-        progress_rows = {
-            row.achievement_id: row
-            for row in (
-                db.query(AchievementProgress)
-                .filter(
-                    AchievementProgress.family_id == family_id,
-                    AchievementProgress.user_id == user_id,
-                )
-                .all()
-            )
+    # Offene ORM-Aenderungen zuerst schreiben; die geladenen Zeilen werden nach dem Upsert verworfen.
+    db.flush()
+    progress_query = db.query(AchievementProgress).filter(
+        AchievementProgress.family_id == family_id,
+        AchievementProgress.user_id == user_id,
+    )
+    if metrics is not None:
+        progress_query = progress_query.filter(
+            AchievementProgress.achievement_id.in_([definition.id for definition in definitions])
+        )
+    progress_rows = {row.achievement_id: row for row in progress_query.all()}
+
+    changed_rows: list[dict] = []
+    unchanged_ids: list[int] = []
+    unlocked_definitions: list[AchievementDefinitionView] = []
+    for definition in definitions:
+        progress = progress_rows.get(definition.id)
+        computation = _compute_progress(definition, context, now)
+        unlocked_at = progress.unlocked_at if progress is not None else None
+        if computation.status == AchievementProgressStatusEnum.unlocked and unlocked_at is None:
+            unlocked_at = now
+            unlocked_definitions.append(definition)
+        values = {
+            "status": AchievementProgressStatusEnum.unlocked if unlocked_at is not None else computation.status,
+            "current_value": computation.current_value,
+            "target_value": computation.target_value,
+            "progress_percent": computation.progress_percent,
+            "current_streak": computation.current_streak,
+            "best_streak": max(progress.best_streak if progress is not None else 0, computation.best_streak),
+            "frozen_periods_used": computation.frozen_periods_used,
+            "progress_payload": computation.progress_payload,
+            "unlocked_at": unlocked_at,
         }
-        iteration_unlocked: list[AchievementUnlockEvent] = []
-
-        for definition in definitions:
-            progress = progress_rows.get(definition.id)
-            if progress is None:
-                progress = AchievementProgress(
-                    family_id=family_id,
-                    achievement_id=definition.id,
-                    user_id=user_id,
-                )
-                db.add(progress)
-                db.flush()
-
-            computation = _compute_progress(definition, context, now)
-            progress.current_value = computation.current_value
-            progress.target_value = computation.target_value
-            progress.progress_percent = computation.progress_percent
-            progress.current_streak = computation.current_streak
-            progress.best_streak = max(progress.best_streak, computation.best_streak)
-            progress.frozen_periods_used = computation.frozen_periods_used
-            progress.progress_payload = computation.progress_payload
-            progress.last_evaluated_at = now
-            if progress.unlocked_at is None:
-                progress.status = computation.status
-            else:
-                progress.status = AchievementProgressStatusEnum.unlocked
-
-            if computation.status != AchievementProgressStatusEnum.unlocked or progress.unlocked_at is not None:
-                continue
+        if progress is not None and _progress_fingerprint(values) == _progress_fingerprint(
+            {column: getattr(progress, column) for column in values}
+        ):
+            unchanged_ids.append(definition.id)
+            continue
+        changed_rows.append(
+            {
+                "family_id": family_id,
+                "achievement_id": definition.id,
+                "user_id": user_id,
+                **values,
+                "last_evaluated_at": now,
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+
+    stored_rows: dict[int, tuple[int, datetime | None]] = {}
+    if changed_rows:
+        stored_rows = _upsert_progress_rows(db, changed_rows)
+    if unchanged_ids:
+        # Nur der Auswertungszeitpunkt, damit die Uebersicht weiss, dass der Stand aktuell ist.
+        db.query(AchievementProgress).filter(
+            AchievementProgress.user_id == user_id,
+            AchievementProgress.achievement_id.in_(unchanged_ids),
+        ).update({AchievementProgress.last_evaluated_at: now}, synchronize_session=False)
+    for progress in progress_rows.values():
+        db.expire(progress)
+    if changed_rows:
+        refresh_achievement_user_summary(db, family_id, user_id, calibration=calibration)
+    # Nur wer die Freischaltung tatsaechlich gesetzt hat, erzeugt das Ereignis; eine parallele
+    # Auswertung mit demselben veralteten Stand sieht den bereits gespeicherten Zeitpunkt.
+    unlocked_definitions = [
+        definition
+        for definition in unlocked_definitions
+        if definition.id in stored_rows and stored_rows[definition.id][1] == now
+    ]
+    if not unlocked_definitions:
+        return []
 
-            progress.status = AchievementProgressStatusEnum.unlocked
-            progress.unlocked_at = now
+    progress_ids = {definition.id: stored_rows[definition.id][0] for definition in unlocked_definitions}
+    unlock_events = [
+        AchievementUnlockEvent(
+            family_id=family_id,
+            achievement_id=definition.id,
+            progress_id=progress_ids[definition.id],
+            user_id=user_id,
+            difficulty=definition.difficulty,
+            reward_kind=definition.reward_kind,
+            reward_points=_reward_points(definition, context.calibration),
+            presentation_payload=_build_unlock_presentation(definition),
+            emitted_at=now,
+        )
+        for definition in unlocked_definitions
+    ]
+    db.add_all(unlock_events)
+    db.flush()
 
-            reward_points = _reward_points(definition, context)
-            presentation = _build_unlock_presentation(definition)
-            unlock_event = AchievementUnlockEvent(
+    if emit_events:
+        for definition, unlock_event in zip(unlocked_definitions, unlock_events):
+            emit_live_event(
+                db,
                 family_id=family_id,
-                achievement_id=definition.id,
-                progress_id=progress.id,
-                user_id=user_id,
-                difficulty=definition.difficulty,
-                reward_kind=definition.reward_kind,
-                reward_points=reward_points,
-                presentation_payload=presentation,
-                emitted_at=now,
-            )
-            db.add(unlock_event)
-            db.flush()
-
-            if emit_events:
-                emit_live_event(
-                    db,
-                    family_id=family_id,
-                    event_type="achievement.unlocked",
-                    payload={
-                        "unlock_event_id": unlock_event.id,
-                        "achievement_id": definition.id,
-                        "achievement_key": definition.key,
-                        "user_id": user_id,
-                        "user_display_name": context.user.display_name,
-                        "name": definition.name,
-                        "description": definition.description,
-                        "difficulty": definition.difficulty.value,
-                        "icon_key": definition.icon_key,
-                        "reward": {
-                            "kind": definition.reward_kind.value,
-                            "points": reward_points,
-                            "config": definition.reward_config or {},
-                        },
-                        "presentation": presentation,
-                        "reason": reason,
+                event_type="achievement.unlocked",
+                payload={
+                    "unlock_event_id": unlock_event.id,
+                    "achievement_id": definition.id,
+                    "achievement_key": definition.key,
+                    "user_id": user_id,
+                    "user_display_name": context.user.display_name,
+                    "name": definition.name,
+                    "description": definition.description,
+                    "difficulty": definition.difficulty.value,
+                    "icon_key": definition.icon_key,
+                    "reward": {
+                        "kind": definition.reward_kind.value,
+                        "points": unlock_event.reward_points,
+                        "config": dict(definition.reward_config),
                     },
-                )
-
-            iteration_unlocked.append(unlock_event)
-
-        db.flush()
-        unlock_events.extend(iteration_unlocked)
+                    "presentation": unlock_event.presentation_payload,
+                    "reason": reason,
+                },
+            )
+    return unlock_events
 
-        if not iteration_unlocked:
-            break
-        break
 
-    return unlock_events
+def _progress_fingerprint(values: dict) -> tuple:
+    payload_digest = hashlib.sha1(
+        json.dumps(values["progress_payload"] or {}, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    return tuple(values[column] for column in values if column != "progress_payload") + (payload_digest,)
+
+
+def _upsert_progress_rows(db: Session, rows: list[dict]) -> dict[int, tuple[int, datetime | None]]:
+    connection = db.connection()
+    table = AchievementProgress.__table__
+    statement = dialect_insert(connection)(table).values(rows)
+    excluded = statement.excluded
+    result = connection.execute(
+        statement.on_conflict_do_update(
+            index_elements=[table.c.achievement_id, table.c.user_id],
+            set_={
+                # Eine parallel gesetzte Freischaltung bleibt bestehen, die beste Serie sinkt nie.
+                "status": case(
+                    (
+                        table.c.unlocked_at.is_not(None),
+                        literal(AchievementProgressStatusEnum.unlocked, table.c.status.type),
+                    ),
+                    else_=excluded.status,
+                ),
+                "current_value": excluded.current_value,
+                "target_value": excluded.target_value,
+                "progress_percent": excluded.progress_percent,
+                "current_streak": excluded.current_streak,
+                "best_streak": case(
+                    (table.c.best_streak > excluded.best_streak, table.c.best_streak),
+                    else_=excluded.best_streak,
+                ),
+                "frozen_periods_used": excluded.frozen_periods_used,
+                "progress_payload": excluded.progress_payload,
+                "unlocked_at": func.coalesce(table.c.unlocked_at, excluded.unlocked_at),
+                "last_evaluated_at": excluded.last_evaluated_at,
+                "updated_at": excluded.updated_at,
+            },
+        ).returning(table.c.achievement_id, table.c.id, table.c.unlocked_at)
+    )
+    return {int(row.achievement_id): (int(row.id), row.unlocked_at) for row in result}
 
 
 def claim_achievement_profile(
@@ -265,10 +569,10 @@ def claim_achievement_profile(
 ) -> AchievementProgress:
     definition, progress = _load_unlocked_progress(db, family_id, user_id, achievement_id)
     calibration = ensure_family_achievement_calibration(db, family_id)
-    context = _load_context(db, family_id, user_id, calibration=calibration)
     if progress.profile_claimed_at is None:
         progress.profile_claimed_at = datetime.utcnow()
         db.flush()
+        refresh_achievement_user_summary(db, family_id, user_id, calibration=calibration)
         emit_live_event(
             db,
             family_id=family_id,
@@ -280,7 +584,7 @@ def claim_achievement_profile(
                 "name": definition.name,
                 "icon_key": definition.icon_key,
                 "difficulty": definition.difficulty.value,
-                "reward_points": _reward_points(definition, context, progress=progress),
+                "reward_points": _reward_points(definition, calibration),
                 "triggered_by_id": triggered_by_id,
             },
         )
@@ -297,11 +601,10 @@ def claim_achievement_reward(
 ) -> tuple[AchievementProgress, int]:
     definition, progress = _load_unlocked_progress(db, family_id, user_id, achievement_id)
     calibration = ensure_family_achievement_calibration(db, family_id)
-    context = _load_context(db, family_id, user_id, calibration=calibration)
     if progress.profile_claimed_at is None:
         raise ValueError("Erfolg muss zuerst ins Profil übernommen werden")
 
-    reward_points = _reward_points(definition, context, progress=progress)
+    reward_points = _reward_points(definition, calibration)
     if reward_points <= 0 or definition.reward_kind != AchievementRewardKindEnum.points_grant:
         raise ValueError("Dieser Erfolg hat kein Punkte-Geschenk")
     if progress.reward_granted_at is not None:
@@ -310,6 +613,7 @@ def claim_achievement_reward(
     now = datetime.utcnow()
     progress.reward_granted_at = now
     db.flush()
+    refresh_achievement_user_summary(db, family_id, user_id, calibration=calibration)
     db.add(
         PointsLedger(
             family_id=family_id,
@@ -350,26 +654,8 @@ def claim_achievement_reward(
     return progress, reward_points
 
 
-def build_achievement_overview(db: Session, family_id: int, user_id: int) -> dict:
-    ensure_achievement_catalog(db)
-    calibration = ensure_family_achievement_calibration(db, family_id)
-    evaluate_achievements_for_user(
-        db,
-        family_id=family_id,
-        user_id=user_id,
-        emit_events=True,
-        reason="overview_refresh",
-    )
-    db.flush()
-
-    user = db.query(User).filter(User.id == user_id).first()
-    definitions = (
-        db.query(AchievementDefinition)
-        .filter(AchievementDefinition.is_active == True)  # noqa: E712
-        .order_by(AchievementDefinition.sort_order.asc(), AchievementDefinition.id.asc())
-        .all()
-    )
-    progress_rows = {
+def _progress_rows_for_user(db: Session, family_id: int, user_id: int) -> dict[int, AchievementProgress]:
+    return {
         row.achievement_id: row
         for row in (
             db.query(AchievementProgress)
@@ -380,6 +666,102 @@ def build_achievement_overview(db: Session, family_id: int, user_id: int) -> dic
             .all()
         )
     }
+
+
+def _streak_periods(definitions: Iterable[AchievementDefinitionView]) -> set[str]:
+    return {
+        str(definition.rule_config.get("period") or "week")
+        for definition in definitions
+        if definition.rule_kind == AchievementRuleKindEnum.streak
+    }
+
+
+def streak_period_window(db: Session, now: datetime) -> tuple[datetime, datetime] | None:
+    # Letzte Periodengrenze aller Serien und Beginn der aeltesten gerade abgeschlossenen Periode.
+    periods = _streak_periods(active_achievement_definitions(db))
+    if not periods:
+        return None
+    boundary = max(_period_bounds(now, period, 0)[0] for period in periods)
+    active_since = min(_period_bounds(now, period, 1)[0] for period in periods)
+    return boundary, active_since
+
+
+def period_sweep_user_keys(db: Session, active_since: datetime) -> list[tuple[int, int]]:
+    # Wochenaufgaben ohne festen Termin (due_at=None) zaehlen ueber ihren Erstell- bzw. Abschlusszeitpunkt.
+    keys = {
+        (int(family_id), int(user_id))
+        for family_id, user_id in (
+            db.query(Task.family_id, Task.assignee_id)
+            .filter(func.coalesce(Task.due_at, Task.created_at) >= active_since)
+            .distinct()
+            .all()
+        )
+    }
+    keys.update(
+        (int(family_id), int(user_id))
+        for family_id, user_id in (
+            db.query(AchievementTaskRecord.family_id, AchievementTaskRecord.user_id)
+            .filter(
+                func.coalesce(
+                    AchievementTaskRecord.due_at,
+                    AchievementTaskRecord.reviewed_at,
+                    AchievementTaskRecord.completed_at,
+                    AchievementTaskRecord.created_at,
+                )
+                >= active_since
+            )
+            .distinct()
+            .all()
+        )
+    )
+    return sorted(keys)
+
+
+def _overview_refresh_reason(
+    definitions: tuple[AchievementDefinitionView, ...],
+    progress_rows: dict[int, AchievementProgress],
+    now: datetime,
+) -> str | None:
+    # Neue Nutzer/Definitionen werten alles aus; sonst nur Serien, die seit einer Periodengrenze
+    # weder vom Sweep noch von einem Ereignis erfasst wurden.
+    if any(progress_rows.get(definition.id) is None for definition in definitions):
+        return "overview_refresh"
+    periods = _streak_periods(definitions)
+    if not periods:
+        return None
+    boundary = max(_period_bounds(now, period, 0)[0] for period in periods)
+    for definition in definitions:
+        if definition.rule_kind != AchievementRuleKindEnum.streak:
+            continue
+        last_evaluated_at = progress_rows[definition.id].last_evaluated_at
+        if last_evaluated_at is None or last_evaluated_at < boundary:
+            return "period_boundary"
+    return None
+
+
+def build_achievement_overview(db: Session, family_id: int, user_id: int) -> dict:
+    # Ausgewertet wird bei Ereignissen, die Fortschritt aendern koennen. Die Uebersicht wertet nur
+    # noch selbst aus (und schreibt), wenn Fortschrittszeilen fehlen oder eine Periodengrenze seit
+    # der letzten Auswertung vergangen ist.
+    definitions = active_achievement_definitions(db)
+    progress_rows = _progress_rows_for_user(db, family_id, user_id)
+    refresh_reason = _overview_refresh_reason(definitions, progress_rows, datetime.utcnow())
+    if refresh_reason is not None:
+        evaluate_achievements_for_user(
+            db,
+            family_id=family_id,
+            user_id=user_id,
+            emit_events=True,
+            reason=refresh_reason,
+        )
+        progress_rows = _progress_rows_for_user(db, family_id, user_id)
+
+    user = db.query(User).filter(User.id == user_id).first()
+    calibration = (
+        db.query(AchievementFamilyCalibration)
+        .filter(AchievementFamilyCalibration.family_id == family_id)
+        .first()
+    )
     recent_unlocks = (
         db.query(AchievementUnlockEvent)
         .filter(
@@ -391,28 +773,19 @@ def build_achievement_overview(db: Session, family_id: int, user_id: int) -> dic
         .all()
     )
     freezes = list_freeze_windows(db, family_id, user_id)
-    context = _load_context(db, family_id, user_id, calibration=calibration)
-    now = datetime.utcnow()
 
     items: list[dict] = []
     unlocked_count = 0
     for definition in definitions:
         progress = progress_rows.get(definition.id)
-        reward_points = _reward_points(definition, context, progress=progress)
+        reward_points = _reward_points(definition, calibration)
         status = progress.status if progress else AchievementProgressStatusEnum.locked
-        display_computation: AchievementComputation | None = None
-        if progress is None:
-            display_computation = _compute_progress(definition, context, now)
-            if display_computation.status == AchievementProgressStatusEnum.unlocked:
-                status = AchievementProgressStatusEnum.in_progress
         if status == AchievementProgressStatusEnum.unlocked:
             unlocked_count += 1
         payload = progress.progress_payload if progress else {}
-        current_value = progress.current_value if progress else (display_computation.current_value if display_computation else 0)
-        target_value = progress.target_value if progress else (
-            display_computation.target_value if display_computation else int(definition.rule_config.get("target", 0) or 0)
-        )
-        progress_percent = progress.progress_percent if progress else (display_computation.progress_percent if display_computation else 0)
+        current_value = progress.current_value if progress else 0
+        target_value = progress.target_value if progress else int(definition.rule_config.get("target", 0) or 0)
+        progress_percent = progress.progress_percent if progress else 0
         items.append(
             {
                 "achievement_id": definition.id,
@@ -476,10 +849,10 @@ def build_achievement_overview(db: Session, family_id: int, user_id: int) -> dic
                 and progress.unlocked_at is not None
                 and progress.profile_claimed_at is not None
                 and progress.reward_granted_at is None
-                and _reward_points(definition, context, progress=progress) > 0
+                and _reward_points(definition, calibration) > 0
             )
         ),
-        "calibration": calibration_overview_payload(context.calibration),
+        "calibration": calibration_overview_payload(calibration),
         "items": items,
         "recent_unlocks": [
             {
@@ -500,6 +873,56 @@ def build_achievement_overview(db: Session, family_id: int, user_id: int) -> dic
     }
 
 
+def build_achievement_family_summary(db: Session, family_id: int) -> dict:
+    # Liest nur die vom Auswerter gepflegte Zusammenfassung, ohne Mitglieder neu auszuwerten.
+    def load_rows():
+        return (
+            db.query(FamilyMembership.user_id, FamilyMembership.role, User.display_name, AchievementUserSummary)
+            .join(User, User.id == FamilyMembership.user_id)
+            .outerjoin(
+                AchievementUserSummary,
+                (AchievementUserSummary.family_id == FamilyMembership.family_id)
+                & (AchievementUserSummary.user_id == FamilyMembership.user_id),
+            )
+            .filter(FamilyMembership.family_id == family_id)
+            .all()
+        )
+
+    rows = load_rows()
+    missing_user_ids = [int(row.user_id) for row in rows if row.AchievementUserSummary is None]
+    if missing_user_ids:
+        # Einmalig fuer Mitglieder ohne Zeile, etwa direkt nach der Migration.
+        for user_id in missing_user_ids:
+            refresh_achievement_user_summary(db, family_id, user_id)
+        rows = load_rows()
+
+    members = []
+    for row in rows:
+        summary = row.AchievementUserSummary
+        members.append(
+            {
+                "user_id": int(row.user_id),
+                "display_name": row.display_name,
+                "role": row.role,
+                "unlocked_count": summary.unlocked_count,
+                "unlocked_by_difficulty": {
+                    difficulty: getattr(summary, f"{difficulty.value}_unlocked_count")
+                    for difficulty in AchievementDifficultyEnum
+                },
+                "profile_claimable_count": summary.profile_claimable_count,
+                "reward_claimable_count": summary.reward_claimable_count,
+                "last_unlocked_at": summary.last_unlocked_at,
+                "updated_at": summary.updated_at,
+            }
+        )
+    members.sort(key=lambda member: (-member["unlocked_count"], member["display_name"].casefold(), member["user_id"]))
+    return {
+        "family_id": family_id,
+        "total_count": len(active_achievement_definitions(db)),
+        "members": members,
+    }
+
+
 def _normalized_presentation_payload(payload: dict) -> dict:
     normalized = dict(payload or {})
     if normalized.get("title") == "Auszeichnung freigeschaltet":
@@ -512,68 +935,104 @@ def _load_unlocked_progress(
     family_id: int,
     user_id: int,
     achievement_id: int,
-) -> tuple[AchievementDefinition, AchievementProgress]:
-    row = (
-        db.query(AchievementDefinition, AchievementProgress)
-        .join(AchievementProgress, AchievementProgress.achievement_id == AchievementDefinition.id)
+) -> tuple[AchievementDefinitionView, AchievementProgress]:
+    definition = achievement_definition_by_id(db, achievement_id)
+    progress = (
+        db.query(AchievementProgress)
         .filter(
-            AchievementDefinition.id == achievement_id,
+            AchievementProgress.achievement_id == achievement_id,
             AchievementProgress.family_id == family_id,
             AchievementProgress.user_id == user_id,
         )
         .first()
     )
-    if row is None:
+    if definition is None or progress is None:
         raise ValueError("Erfolg nicht gefunden")
-    definition, progress = row
     if progress.unlocked_at is None:
         raise ValueError("Erfolg ist noch nicht freigeschaltet")
     return definition, progress
 
 
+def invalidate_achievement_context_cache(db: Session) -> None:
+    db.info.pop(CONTEXT_CACHE_KEY, None)
+
+
+_CONTEXT_SOURCE_MODELS = (
+    AchievementTaskRecord,
+    AchievementFreezeWindow,
+    RewardRedemption,
+    SpecialTaskTemplate,
+    Task,
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_context_after_flush(session: Session, _flush_context) -> None:
+    if CONTEXT_CACHE_KEY not in session.info:
+        return
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, _CONTEXT_SOURCE_MODELS):
+            session.info.pop(CONTEXT_CACHE_KEY, None)
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_context_cache_after_commit(session: Session) -> None:
+    session.info.pop(CONTEXT_CACHE_KEY, None)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_context_cache_after_rollback(session: Session, _previous_transaction) -> None:
+    session.info.pop(CONTEXT_CACHE_KEY, None)
+
+
+def _cached_context_part(db: Session, family_id: int, user_id: int, part: str, loader):
+    # Lebt nur bis zum Ende der Transaktion; Schreibzugriffe auf die Quellen verwerfen ihn vorher.
+    cache = db.info.setdefault(CONTEXT_CACHE_KEY, {}).setdefault((family_id, user_id), {})
+    if part not in cache:
+        cache[part] = loader(db, family_id, user_id)
+    return cache[part]
+
+
 def _load_context(
     db: Session,
     family_id: int,
     user_id: int,
     *,
     calibration: AchievementFamilyCalibration | None = None,
+    metrics: frozenset[str] | None = None,
 ) -> EvaluationContext:
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     if user is None:
         raise ValueError("Nutzer nicht gefunden")
 
-    task_records = (
-        db.query(AchievementTaskRecord)
-        .filter(
-            AchievementTaskRecord.family_id == family_id,
-            AchievementTaskRecord.user_id == user_id,
-        )
-        .order_by(AchievementTaskRecord.reviewed_at.desc(), AchievementTaskRecord.id.desc())
-        .all()
-    )
-    current_tasks = (
-        db.query(Task)
-        .filter(
-            Task.family_id == family_id,
-            Task.assignee_id == user_id,
+    def needs(group: frozenset[str]) -> bool:
+        return metrics is None or not group.isdisjoint(metrics)
+
+    task_records: tuple[TaskRecordRow, ...] = ()
+    current_tasks: tuple[CurrentTaskRow, ...] = ()
+    active_special_template_ids: tuple[int, ...] = ()
+    freeze_windows: list[AchievementFreezeWindow] = []
+    # Nur Serien brauchen die einzelnen Aufgaben; Summen kommen aus den Zaehlern.
+    if needs(TASK_STREAK_METRICS):
+        task_records, current_tasks, active_special_template_ids, freeze_windows = _cached_context_part(
+            db, family_id, user_id, "tasks", _load_task_history
         )
-        .all()
-    )
-    active_special_template_ids = [
-        int(entry[0])
-        for entry in (
-            db.query(SpecialTaskTemplate.id)
-            .filter(
-                SpecialTaskTemplate.family_id == family_id,
-                SpecialTaskTemplate.is_active == True,  # noqa: E712
-            )
-            .all()
+
+    earned_points_total = 0
+    current_points_balance = 0
+    if needs(POINT_METRICS):
+        # Bulk-Buchungen schreiben am ORM vorbei; der Saldo wird daher immer frisch gelesen.
+        earned_points_total, current_points_balance = _points_totals(db, family_id, user_id)
+    approved_reward_redemptions_total = 0
+    if needs(REDEMPTION_METRICS):
+        approved_reward_redemptions_total = _cached_context_part(
+            db, family_id, user_id, "redemptions", _approved_reward_redemptions_total
         )
-    ]
-    freeze_windows = list_freeze_windows(db, family_id, user_id)
-    earned_points_total = _earned_points_total(db, family_id, user_id)
-    current_points_balance = _current_points_balance(db, family_id, user_id)
-    approved_reward_redemptions_total = _approved_reward_redemptions_total(db, user_id)
+    task_counters = (0, 0, 0)
+    if needs(TASK_COUNTER_METRICS):
+        task_counters = _cached_context_part(db, family_id, user_id, "counters", _task_counters)
+
     return EvaluationContext(
         family_id=family_id,
         user=user,
@@ -584,37 +1043,105 @@ def _load_context(
         earned_points_total=earned_points_total,
         current_points_balance=current_points_balance,
         approved_reward_redemptions_total=approved_reward_redemptions_total,
+        approved_tasks_total=task_counters[0],
+        approved_special_tasks_total=task_counters[1],
+        approved_weekly_tasks_total=task_counters[2],
         calibration=calibration,
     )
 
 
-def _earned_points_total(db: Session, family_id: int, user_id: int) -> int:
-    result = (
-        db.query(func.coalesce(func.sum(PointsLedger.points_delta), 0))
-        .filter(
-            PointsLedger.family_id == family_id,
-            PointsLedger.user_id == user_id,
-            PointsLedger.source_type.in_(list(EARNED_POINTS_SOURCES)),
-            PointsLedger.points_delta > 0,
+def _load_task_history(
+    db: Session,
+    family_id: int,
+    user_id: int,
+) -> tuple[tuple[TaskRecordRow, ...], tuple[CurrentTaskRow, ...], tuple[int, ...], list[AchievementFreezeWindow]]:
+    # Nur die Spalten, die die Serienauswertung liest, statt vollstaendiger ORM-Objekte.
+    task_records = tuple(
+        TaskRecordRow(
+            task_id=int(row.task_id),
+            special_template_id=row.special_template_id,
+            recurrence_type=row.recurrence_type,
+            outcome=row.outcome,
+            proxy_due=row.due_at or row.reviewed_at or row.completed_at or row.created_at,
+            completed_at=row.completed_at,
+        )
+        for row in (
+            db.query(
+                AchievementTaskRecord.task_id,
+                AchievementTaskRecord.special_template_id,
+                AchievementTaskRecord.recurrence_type,
+                AchievementTaskRecord.outcome,
+                AchievementTaskRecord.due_at,
+                AchievementTaskRecord.reviewed_at,
+                AchievementTaskRecord.completed_at,
+                AchievementTaskRecord.created_at,
+            )
+            .filter(
+                AchievementTaskRecord.family_id == family_id,
+                AchievementTaskRecord.user_id == user_id,
+            )
+            .order_by(AchievementTaskRecord.reviewed_at.desc(), AchievementTaskRecord.id.desc())
+            .all()
         )
-        .scalar()
     )
-    return int(result or 0)
+    current_tasks = tuple(
+        CurrentTaskRow(
+            id=int(row.id),
+            recurrence_type=row.recurrence_type,
+            status=_task_status_value(row.status),
+            proxy_due=row.due_at or row.created_at,
+            proxy_completed=row.updated_at or row.created_at,
+        )
+        for row in (
+            db.query(Task.id, Task.recurrence_type, Task.status, Task.due_at, Task.created_at, Task.updated_at)
+            .filter(
+                Task.family_id == family_id,
+                Task.assignee_id == user_id,
+            )
+            .all()
+        )
+    )
+    active_special_template_ids = tuple(
+        int(entry[0])
+        for entry in (
+            db.query(SpecialTaskTemplate.id)
+            .filter(
+                SpecialTaskTemplate.family_id == family_id,
+                SpecialTaskTemplate.is_active == True,  # noqa: E712
+            )
+            .all()
+        )
+    )
+    return task_records, current_tasks, active_special_template_ids, list_freeze_windows(db, family_id, user_id)
 
 
-def _current_points_balance(db: Session, family_id: int, user_id: int) -> int:
-    result = (
-        db.query(func.coalesce(func.sum(PointsLedger.points_delta), 0))
-        .filter(
-            PointsLedger.family_id == family_id,
-            PointsLedger.user_id == user_id,
+def _points_totals(db: Session, family_id: int, user_id: int) -> tuple[int, int]:
+    row = (
+        db.query(PointsBalance.earned_total, PointsBalance.balance)
+        .filter(PointsBalance.family_id == family_id, PointsBalance.user_id == user_id)
+        .first()
+    )
+    if row is None:
+        return 0, 0
+    return int(row[0] or 0), int(row[1] or 0)
+
+
+def _task_counters(db: Session, family_id: int, user_id: int) -> tuple[int, int, int]:
+    row = (
+        db.query(
+            AchievementUserCounter.approved_tasks_total,
+            AchievementUserCounter.approved_special_tasks_total,
+            AchievementUserCounter.approved_weekly_tasks_total,
         )
-        .scalar()
+        .filter(AchievementUserCounter.family_id == family_id, AchievementUserCounter.user_id == user_id)
+        .first()
     )
-    return int(result or 0)
+    if row is None:
+        return 0, 0, 0
+    return int(row[0]), int(row[1]), int(row[2])
 
 
-def _approved_reward_redemptions_total(db: Session, user_id: int) -> int:
+def _approved_reward_redemptions_total(db: Session, family_id: int, user_id: int) -> int:
     result = (
         db.query(func.count(RewardRedemption.id))
         .filter(
@@ -626,7 +1153,7 @@ def _approved_reward_redemptions_total(db: Session, user_id: int) -> int:
     return int(result or 0)
 
 
-def _compute_progress(definition: AchievementDefinition, context: EvaluationContext, now: datetime) -> AchievementComputation:
+def _compute_progress(definition: AchievementDefinitionView, context: EvaluationContext, now: datetime) -> AchievementComputation:
     if definition.rule_kind == AchievementRuleKindEnum.aggregate_count:
         return _compute_aggregate_progress(definition, context)
     if definition.rule_kind == AchievementRuleKindEnum.streak:
@@ -643,11 +1170,10 @@ def _compute_progress(definition: AchievementDefinition, context: EvaluationCont
     )
 
 
-def _compute_aggregate_progress(definition: AchievementDefinition, context: EvaluationContext) -> AchievementComputation:
+def _compute_aggregate_progress(definition: AchievementDefinitionView, context: EvaluationContext) -> AchievementComputation:
     metric = str((definition.rule_config or {}).get("metric") or "").strip()
     base_target = max(int((definition.rule_config or {}).get("target") or 0), 1)
     target = max(scaled_achievement_target(base_target, context.calibration, metric), 1)
-    approved_records = [record for record in context.task_records if record.outcome == AchievementTaskOutcomeEnum.approved]
 
     if metric == "earned_points_total":
         current = context.earned_points_total
@@ -656,11 +1182,11 @@ def _compute_aggregate_progress(definition: AchievementDefinition, context: Eval
     elif metric == "approved_reward_redemptions_total":
         current = context.approved_reward_redemptions_total
     elif metric == "approved_tasks_total":
-        current = len(approved_records)
+        current = context.approved_tasks_total
     elif metric == "approved_special_tasks_total":
-        current = len([record for record in approved_records if record.special_template_id is not None])
+        current = context.approved_special_tasks_total
     elif metric == "approved_weekly_tasks_total":
-        current = len([record for record in approved_records if record.recurrence_type == "weekly"])
+        current = context.approved_weekly_tasks_total
     else:
         current = 0
 
@@ -708,14 +1234,17 @@ def _compute_aggregate_progress(definition: AchievementDefinition, context: Eval
     )
 
 
-def _compute_streak_progress(definition: AchievementDefinition, context: EvaluationContext, now: datetime) -> AchievementComputation:
+def _compute_streak_progress(definition: AchievementDefinitionView, context: EvaluationContext, now: datetime) -> AchievementComputation:
     config = definition.rule_config or {}
     target = max(int(config.get("target") or 0), 1)
     period = str(config.get("period") or "week")
     scan_limit = max(target * 6, 24)
+    bounds = [_period_bounds(now, period, offset) for offset in range(scan_limit)]
+    frozen_flags = _frozen_period_flags(bounds, context.freeze_windows)
+    buckets = _period_buckets(context, period)
     period_results = [
-        _evaluate_period(definition, context, now, offset)
-        for offset in range(scan_limit)
+        _evaluate_period(definition, context, period_start, period_end, label, frozen, buckets.get(period_start))
+        for (period_start, period_end, label), frozen in zip(bounds, frozen_flags)
     ]
 
     current_streak = 0
@@ -776,25 +1305,41 @@ def _compute_streak_progress(definition: AchievementDefinition, context: Evaluat
     )
 
 
-def _evaluate_period(definition: AchievementDefinition, context: EvaluationContext, now: datetime, offset: int) -> PeriodResult:
-    config = definition.rule_config or {}
-    period = str(config.get("period") or "week")
-    period_start, period_end, label = _period_bounds(now, period, offset)
-    frozen = _period_is_frozen(period_start, period_end, context.freeze_windows)
+def _evaluate_period(
+    definition: AchievementDefinitionView,
+    context: EvaluationContext,
+    period_start: datetime,
+    period_end: datetime,
+    label: str,
+    frozen: bool,
+    bucket: PeriodBucket | None,
+) -> PeriodResult:
     if frozen:
         return PeriodResult(label=label, success=False, frozen=True, countable=False, current_value=0, target_value=0)
 
-    metric = str(config.get("metric") or "")
+    bucket = bucket or PeriodBucket()
+    metric = str((definition.rule_config or {}).get("metric") or "")
     if metric == "all_active_special_tasks_completed":
-        return _evaluate_special_coverage_period(definition, context, period_start, period_end, label)
-    return _evaluate_task_period(definition, context, period_start, period_end, label)
+        return _evaluate_special_coverage_period(definition, context, bucket, label)
+    return _evaluate_task_period(definition, bucket, period_start, period_end, label)
+
+
+def _period_buckets(context: EvaluationContext, period: str) -> dict[datetime, PeriodBucket]:
+    buckets = context.period_buckets.get(period)
+    if buckets is None:
+        buckets = {}
+        for record in context.task_records:
+            buckets.setdefault(_period_start(record.proxy_due, period), PeriodBucket()).records.append(record)
+        for task in context.current_tasks:
+            buckets.setdefault(_period_start(task.proxy_due, period), PeriodBucket()).tasks.append(task)
+        context.period_buckets[period] = buckets
+    return buckets
 
 
 def _evaluate_special_coverage_period(
-    definition: AchievementDefinition,
+    definition: AchievementDefinitionView,
     context: EvaluationContext,
-    period_start: datetime,
-    period_end: datetime,
+    bucket: PeriodBucket,
     label: str,
 ) -> PeriodResult:
     required_template_ids = set(context.active_special_template_ids)
@@ -805,13 +1350,8 @@ def _evaluate_special_coverage_period(
     # statt des aktuellen Template-Sets verwendet werden.
     completed_template_ids = {
         int(record.special_template_id)
-        for record in context.task_records
-        if (
-            record.outcome == AchievementTaskOutcomeEnum.approved
-            and record.special_template_id is not None
-            and _task_proxy_due(record) >= period_start
-            and _task_proxy_due(record) < period_end
-        )
+        for record in bucket.records
+        if record.outcome == AchievementTaskOutcomeEnum.approved and record.special_template_id is not None
     }
     current = len(completed_template_ids & required_template_ids)
     target = len(required_template_ids)
@@ -827,8 +1367,8 @@ def _evaluate_special_coverage_period(
 
 
 def _evaluate_task_period(
-    definition: AchievementDefinition,
-    context: EvaluationContext,
+    definition: AchievementDefinitionView,
+    bucket: PeriodBucket,
     period_start: datetime,
     period_end: datetime,
     label: str,
@@ -844,10 +1384,7 @@ def _evaluate_task_period(
     approved = 0
     missed = 0
 
-    for record in context.task_records:
-        proxy_due = _task_proxy_due(record)
-        if proxy_due < period_start or proxy_due >= period_end:
-            continue
+    for record in bucket.records:
         if recurrence_types and record.recurrence_type not in recurrence_types:
             continue
         task_ids_with_records.add(record.task_id)
@@ -861,23 +1398,20 @@ def _evaluate_task_period(
             continue
         approved += 1
 
-    for task in context.current_tasks:
+    for task in bucket.tasks:
         if task.id in task_ids_with_records:
             continue
-        proxy_due = _task_proxy_due(task)
-        if proxy_due < period_start or proxy_due >= period_end:
-            continue
         if recurrence_types and task.recurrence_type not in recurrence_types:
             continue
         total += 1
-        if _task_status_value(task.status) == TaskStatusEnum.approved.value:
-            if require_early and cutoff_dt and _task_proxy_completed(task) and _task_proxy_completed(task) > cutoff_dt:
+        if task.status == TaskStatusEnum.approved.value:
+            if require_early and cutoff_dt and task.proxy_completed and task.proxy_completed > cutoff_dt:
                 continue
-            if require_early and _task_proxy_completed(task) is None:
+            if require_early and task.proxy_completed is None:
                 continue
             approved += 1
             continue
-        if _task_status_value(task.status) == TaskStatusEnum.missed_submitted.value and period_end <= datetime.utcnow():
+        if task.status == TaskStatusEnum.missed_submitted.value and period_end <= datetime.utcnow():
             missed += 1
 
     if total < minimum_tasks or total == 0:
@@ -894,15 +1428,26 @@ def _evaluate_task_period(
     )
 
 
+def _period_start(value: datetime, period: str) -> datetime:
+    day_start = value.replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == "month":
+        return day_start.replace(day=1)
+    if period == "day":
+        return day_start
+    return day_start - timedelta(days=day_start.weekday())
+
+
 def _period_bounds(now: datetime, period: str, offset: int) -> tuple[datetime, datetime, str]:
     if period == "month":
-        anchor = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        start = _shift_month(anchor, -offset)
+        start = _shift_month(_period_start(now, period), -offset)
         end = _shift_month(start, 1)
         return start, end, start.strftime("%m/%Y")
 
-    week_start = now.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=now.weekday())
-    start = week_start - timedelta(weeks=offset)
+    if period == "day":
+        start = _period_start(now, period) - timedelta(days=offset)
+        return start, start + timedelta(days=1), start.strftime("%d.%m.%Y")
+
+    start = _period_start(now, period) - timedelta(weeks=offset)
     end = start + timedelta(days=7)
     iso_year, iso_week, _ = start.isocalendar()
     return start, end, f"KW {iso_week}/{iso_year}"
@@ -915,15 +1460,32 @@ def _shift_month(value: datetime, months: int) -> datetime:
     return value.replace(year=year, month=month, day=1)
 
 
-def _period_is_frozen(start: datetime, end: datetime, freeze_windows: list[AchievementFreezeWindow]) -> bool:
-    for window in freeze_windows:
-        if window.scope != STREAK_FREEZE_SCOPE:
-            continue
-        starts_at = _to_utc_naive(window.starts_at)
-        ends_at = _to_utc_naive(window.ends_at)
-        if starts_at < end and ends_at >= start:
-            return True
-    return False
+def _frozen_period_flags(
+    bounds: list[tuple[datetime, datetime, str]],
+    freeze_windows: list[AchievementFreezeWindow],
+) -> list[bool]:
+    # Perioden laufen rueckwaerts; Fenster nach Ende absteigend in einem gemeinsamen Durchlauf.
+    # Ein einmal erreichtes Fenster (Ende >= Periodenstart) bleibt fuer alle aelteren Perioden erreicht,
+    # daher genuegt der frueheste Beginn aller erreichten Fenster.
+    windows = sorted(
+        (
+            (_to_utc_naive(window.starts_at), _to_utc_naive(window.ends_at))
+            for window in freeze_windows
+            if window.scope == STREAK_FREEZE_SCOPE
+        ),
+        key=lambda entry: entry[1],
+        reverse=True,
+    )
+    flags: list[bool] = []
+    index = 0
+    earliest_start: datetime | None = None
+    for start, end, _ in bounds:
+        while index < len(windows) and windows[index][1] >= start:
+            if earliest_start is None or windows[index][0] < earliest_start:
+                earliest_start = windows[index][0]
+            index += 1
+        flags.append(earliest_start is not None and earliest_start < end)
+    return flags
 
 
 def _to_utc_naive(value: datetime) -> datetime:
@@ -947,26 +1509,23 @@ def _percent(current: int, target: int) -> int:
 
 
 def _reward_points(
-    definition: AchievementDefinition,
-    context: EvaluationContext | None = None,
-    *,
-    progress: AchievementProgress | None = None,
+    definition: AchievementDefinitionView,
+    calibration: AchievementFamilyCalibration | None = None,
 ) -> int:
     reward_config = definition.reward_config or {}
     base_points = max(int(reward_config.get("points") or 0), 0)
     metric = str((definition.rule_config or {}).get("metric") or "")
-    calibration = context.calibration if context else None
     return scaled_achievement_reward(base_points, calibration, metric)
 
 
-def _effective_reward_config(definition: AchievementDefinition, reward_points: int) -> dict:
+def _effective_reward_config(definition: AchievementDefinitionView, reward_points: int) -> dict:
     config = dict(definition.reward_config or {})
     config["points"] = reward_points
     config["label"] = f"{reward_points} Bonuspunkte" if reward_points > 0 else config.get("label", "Keine Punkte")
     return config
 
 
-def _effective_rule_config(definition: AchievementDefinition, target_value: int) -> dict:
+def _effective_rule_config(definition: AchievementDefinitionView, target_value: int) -> dict:
     config = dict(definition.rule_config or {})
     metric = str(config.get("metric") or "")
     if is_point_scaled_metric(metric):
@@ -985,7 +1544,7 @@ def _progress_calibration_payload(calibration: AchievementFamilyCalibration | No
     }
 
 
-def _build_unlock_presentation(definition: AchievementDefinition) -> dict:
+def _build_unlock_presentation(definition: AchievementDefinitionView) -> dict:
     accent_map = {
         "bronze": "#b47d49",
         "silver": "#a9b7c9",
@@ -1005,18 +1564,6 @@ def _build_unlock_presentation(definition: AchievementDefinition) -> dict:
     }
 
 
-def _task_proxy_due(record_or_task: AchievementTaskRecord | Task) -> datetime:
-    if isinstance(record_or_task, AchievementTaskRecord):
-        return record_or_task.due_at or record_or_task.reviewed_at or record_or_task.completed_at or record_or_task.created_at
-    return record_or_task.due_at or record_or_task.created_at
-
-
-def _task_proxy_completed(task: Task) -> datetime | None:
-    if task.updated_at:
-        return task.updated_at
-    return task.created_at
-
-
 def _task_status_value(value) -> str:
     if hasattr(value, "value"):
         return str(value.value)
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import logging
+from threading import Condition, Lock, Thread
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .achievement_engine import evaluate_achievements_for_user
+from .config import settings
+from .database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+PENDING_EVALUATIONS_KEY = "achievement_pending_evaluations"
+
+
+@dataclass
+class PendingEvaluation:
+    due_at: float
+    first_requested_at: float
+    reasons: list[str] = field(default_factory=list)
+    triggered_by_id: int | None = None
+
+
+_condition = Condition()
+_pending: dict[tuple[int, int], PendingEvaluation] = {}
+_in_flight = 0
+_stopping = False
+_worker_lock = Lock()
+_worker_thread: Thread | None = None
+
+
+def start_achievement_queue() -> None:
+    global _worker_thread, _stopping
+    with _worker_lock:
+        if _worker_thread is not None and _worker_thread.is_alive():
+            return
+        with _condition:
+            _stopping = False
+        _worker_thread = Thread(target=_worker_loop, name="homequests-achievement-queue", daemon=True)
+        _worker_thread.start()
+
+
+def stop_achievement_queue(timeout_seconds: float = 10.0) -> None:
+    global _worker_thread, _stopping
+    with _worker_lock:
+        thread = _worker_thread
+        _worker_thread = None
+    if thread is None:
+        return
+    # Wartende Auswertungen werden vor dem Beenden noch abgearbeitet.
+    with _condition:
+        _stopping = True
+        _condition.notify_all()
+    thread.join(timeout=timeout_seconds)
+
+
+def is_achievement_queue_running() -> bool:
+    thread = _worker_thread
+    return thread is not None and thread.is_alive()
+
+
+def request_achievement_evaluation(
+    db: Session,
+    family_id: int,
+    user_id: int,
+    *,
+    triggered_by_id: int | None = None,
+    reason: str,
+) -> None:
+    if not is_achievement_queue_running():
+        evaluate_achievements_for_user(
+            db,
+            family_id=family_id,
+            user_id=user_id,
+            triggered_by_id=triggered_by_id,
+            reason=reason,
+            emit_events=True,
+        )
+        return
+    # Erst nach dem Commit einreihen, damit der Worker den festgeschriebenen Stand liest.
+    db.info.setdefault(PENDING_EVALUATIONS_KEY, []).append((int(family_id), int(user_id), triggered_by_id, reason))
+
+
+def wait_for_achievement_queue(timeout_seconds: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout_seconds
+    with _condition:
+        while _pending or _in_flight:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            _condition.wait(timeout=remaining)
+    return True
+
+
+@event.listens_for(Session, "after_commit")
+def _enqueue_after_commit(session: Session) -> None:
+    requests = session.info.pop(PENDING_EVALUATIONS_KEY, None)
+    if not requests:
+        return
+    now = time.monotonic()
+    due_at = now + settings.achievement_evaluation_debounce_seconds
+    max_wait = max(settings.achievement_evaluation_max_wait_seconds, settings.achievement_evaluation_debounce_seconds)
+    with _condition:
+        for family_id, user_id, triggered_by_id, reason in requests:
+            pending = _pending.get((family_id, user_id))
+            if pending is None:
+                pending = _pending[(family_id, user_id)] = PendingEvaluation(due_at=due_at, first_requested_at=now)
+            # Jede weitere Anfrage im Fenster verschiebt die Auswertung und sammelt die Ausloeser,
+            # aber nie ueber die Hoechstwartezeit seit der ersten Anfrage hinaus.
+            pending.due_at = min(pending.first_requested_at + max_wait, due_at)
+            if reason not in pending.reasons:
+                pending.reasons.append(reason)
+            pending.triggered_by_id = triggered_by_id
+        _condition.notify_all()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(session: Session, previous_transaction) -> None:
+    if previous_transaction.nested:
+        return
+    session.info.pop(PENDING_EVALUATIONS_KEY, None)
+
+
+def _take_due_evaluations() -> list[tuple[tuple[int, int], PendingEvaluation]] | None:
+    global _in_flight
+    with _condition:
+        while True:
+            if not _pending:
+                if _stopping:
+                    return None
+                _condition.wait(timeout=1.0)
+                continue
+            now = time.monotonic()
+            due = [key for key, pending in _pending.items() if _stopping or pending.due_at <= now]
+            if due:
+                _in_flight += len(due)
+                return [(key, _pending.pop(key)) for key in sorted(due)]
+            _condition.wait(timeout=max(min(pending.due_at for pending in _pending.values()) - now, 0.01))
+
+
+def _worker_loop() -> None:
+    global _in_flight
+    while True:
+        batch = _take_due_evaluations()
+        if batch is None:
+            return
+        for key, pending in batch:
+            try:
+                _run_evaluation(key, pending)
+            except Exception:
+                logger.exception("Achievement-Auswertung fehlgeschlagen (family_id=%s, user_id=%s)", *key)
+            finally:
+                with _condition:
+                    _in_flight -= 1
+                    _condition.notify_all()
+
+
+def _run_evaluation(key: tuple[int, int], pending: PendingEvaluation) -> None:
+    family_id, user_id = key
+    *earlier_reasons, reason = pending.reasons
+    with SessionLocal() as db:
+        try:
+            evaluate_achievements_for_user(
+                db,
+                family_id=family_id,
+                user_id=user_id,
+                triggered_by_id=pending.triggered_by_id,
+                reason=reason,
+                emit_events=True,
+                coalesced_reasons=tuple(earlier_reasons),
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
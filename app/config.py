@@ -10,6 +10,8 @@ class Settings(BaseSettings):
     app_build_ref: str | None = None
     secret_key: str = "change-me-in-production"
     access_token_expire_minutes: int = 60 * 24 * 30
+    principal_cache_ttl_seconds: float = 30
+    access_token_cache_size: int = 4096
     algorithm: str = "HS256"
     database_url: str = "postgresql+psycopg2://homequests:homequests@db:5432/homequests"
     cors_allow_origins: list[str] = ["http://localhost:8000", "http://127.0.0.1:8000"]
@@ -26,6 +28,17 @@ class Settings(BaseSettings):
     secret_encryption_key: str | None = None
     push_worker_enabled: bool = True
     push_worker_interval_seconds: int = 60
+    points_balance_reconcile_enabled: bool = True
+    points_balance_reconcile_interval_seconds: int = 6 * 60 * 60
+    points_ledger_compaction_enabled: bool = False
+    points_ledger_compaction_horizon_days: int = 730
+    points_ledger_compaction_interval_seconds: int = 24 * 60 * 60
+    achievement_queue_enabled: bool = True
+    achievement_evaluation_debounce_seconds: float = 1.5
+    achievement_evaluation_max_wait_seconds: float = 10
+    achievement_period_sweep_enabled: bool = True
+    achievement_period_sweep_interval_seconds: int = 5 * 60
+    achievement_period_sweep_batch_size: int = 100
     db_backup_allowed_dirs: list[str] = ["/tmp/homequests-backups"]
     db_backup_default_dir: str | None = "/tmp/homequests-backups"
     db_backup_timeout_seconds: int = 180
@@ -80,6 +93,69 @@ class Settings(BaseSettings):
             raise ValueError("PUSH_WORKER_INTERVAL_SECONDS muss mindestens 15 Sekunden sein")
         return value
 
+    @field_validator("points_balance_reconcile_interval_seconds")
+    @classmethod
+    def validate_points_balance_reconcile_interval_seconds(cls, value: int) -> int:
+        if value < 60:
+            raise ValueError("POINTS_BALANCE_RECONCILE_INTERVAL_SECONDS muss mindestens 60 Sekunden sein")
+        return value
+
+    @field_validator("access_token_cache_size")
+    @classmethod
+    def validate_access_token_cache_size(cls, value: int) -> int:
+        if value < 0:
+            raise ValueError("ACCESS_TOKEN_CACHE_SIZE darf nicht negativ sein")
+        return value
+
+    @field_validator("principal_cache_ttl_seconds")
+    @classmethod
+    def validate_principal_cache_ttl_seconds(cls, value: float) -> float:
+        if value < 0 or value > 300:
+            raise ValueError("PRINCIPAL_CACHE_TTL_SECONDS muss zwischen 0 und 300 liegen")
+        return value
+
+    @field_validator("points_ledger_compaction_horizon_days")
+    @classmethod
+    def validate_points_ledger_compaction_horizon_days(cls, value: int) -> int:
+        if value < 90:
+            raise ValueError("POINTS_LEDGER_COMPACTION_HORIZON_DAYS muss mindestens 90 Tage sein")
+        return value
+
+    @field_validator("points_ledger_compaction_interval_seconds")
+    @classmethod
+    def validate_points_ledger_compaction_interval_seconds(cls, value: int) -> int:
+        if value < 3600:
+            raise ValueError("POINTS_LEDGER_COMPACTION_INTERVAL_SECONDS muss mindestens 3600 Sekunden sein")
+        return value
+
+    @field_validator("achievement_evaluation_debounce_seconds")
+    @classmethod
+    def validate_achievement_evaluation_debounce_seconds(cls, value: float) -> float:
+        if value < 0 or value > 60:
+            raise ValueError("ACHIEVEMENT_EVALUATION_DEBOUNCE_SECONDS muss zwischen 0 und 60 liegen")
+        return value
+
+    @field_validator("achievement_evaluation_max_wait_seconds")
+    @classmethod
+    def validate_achievement_evaluation_max_wait_seconds(cls, value: float) -> float:
+        if value < 0 or value > 300:
+            raise ValueError("ACHIEVEMENT_EVALUATION_MAX_WAIT_SECONDS muss zwischen 0 und 300 liegen")
+        return value
+
+    @field_validator("achievement_period_sweep_interval_seconds")
+    @classmethod
+    def validate_achievement_period_sweep_interval_seconds(cls, value: int) -> int:
+        if value < 60:
+            raise ValueError("ACHIEVEMENT_PERIOD_SWEEP_INTERVAL_SECONDS muss mindestens 60 Sekunden sein")
+        return value
+
+    @field_validator("achievement_period_sweep_batch_size")
+    @classmethod
+    def validate_achievement_period_sweep_batch_size(cls, value: int) -> int:
+        if value < 1:
+            raise ValueError("ACHIEVEMENT_PERIOD_SWEEP_BATCH_SIZE muss mindestens 1 sein")
+        return value
+
     @field_validator("db_backup_allowed_dirs", mode="before")
     @classmethod
     def parse_db_backup_allowed_dirs(cls, value):
@@ -1,12 +1,57 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+from threading import Lock
+import time
+
 from fastapi import Depends, HTTPException, Request, status
-from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
 
+from .config import settings
 from .database import get_db
-from .models import User
+from .models import FamilyMembership, User
+from .rbac import remember_membership
 from .security import decode_access_token
 
+PRINCIPAL_DIRTY_USERS_KEY = "principal_dirty_users"
+
+
+@dataclass(frozen=True)
+class _CachedPrincipal:
+    expires_at: float
+    user: User
+    membership: FamilyMembership | None
+
+
+_principal_guard = Lock()
+_principal_generation = 0
+_principal_cache: dict[tuple[int, int | None], _CachedPrincipal] = {}
+
+
+def clear_principal_cache() -> None:
+    global _principal_generation
+    with _principal_guard:
+        _principal_generation += 1
+        _principal_cache.clear()
+
+
+def _invalidate_principals(user_ids: set[int]) -> None:
+    global _principal_generation
+    with _principal_guard:
+        _principal_generation += 1
+        for key in [key for key in _principal_cache if key[0] in user_ids]:
+            del _principal_cache[key]
+
+
+def _detached_snapshot(instance):
+    # Nur Spaltenwerte; die Kopie wird per merge(load=False) ohne SELECT in die Request-Session uebernommen.
+    mapper = inspect(instance).mapper
+    snapshot = mapper.class_(**{attr.key: getattr(instance, attr.key) for attr in mapper.column_attrs})
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+
 def _unauthorized(detail: str) -> HTTPException:
     return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -15,7 +60,7 @@ def _unauthorized(detail: str) -> HTTPException:
     )
 
 
-def get_current_user_from_token_value(token: str, db: Session) -> User:
+def get_current_user_from_token_value(token: str, db: Session, *, family_id: int | None = None) -> User:
     try:
         payload = decode_access_token(token)
     except ValueError as exc:
@@ -30,9 +75,51 @@ def get_current_user_from_token_value(token: str, db: Session) -> User:
     except (TypeError, ValueError) as exc:
         raise _unauthorized("Token ohne gültige Benutzer-ID") from exc
 
-    user = db.query(User).filter(User.id == numeric_user_id).first()
+    return _resolve_principal(db, numeric_user_id, family_id)
+
+
+def _resolve_principal(db: Session, user_id: int, family_id: int | None) -> User:
+    key = (user_id, family_id)
+    ttl = settings.principal_cache_ttl_seconds
+    if ttl > 0:
+        with _principal_guard:
+            cached = _principal_cache.get(key)
+            generation = _principal_generation
+        if cached is not None and cached.expires_at > time.monotonic():
+            user = db.merge(cached.user, load=False)
+            if family_id is not None:
+                remember_membership(db, family_id, user_id, db.merge(cached.membership, load=False))
+            return user
+
+    # Benutzer und Mitgliedschaft der Familie aus dem Pfad in einer Abfrage.
+    if family_id is None:
+        user, membership = db.query(User).filter(User.id == user_id).first(), None
+    else:
+        row = (
+            db.query(User, FamilyMembership)
+            .outerjoin(
+                FamilyMembership,
+                (FamilyMembership.user_id == User.id) & (FamilyMembership.family_id == family_id),
+            )
+            .filter(User.id == user_id)
+            .first()
+        )
+        user, membership = row if row is not None else (None, None)
     if not user or not user.is_active:
         raise _unauthorized("Benutzer nicht gefunden oder deaktiviert")
+    if family_id is not None:
+        remember_membership(db, family_id, user_id, membership)
+
+    # Fehlende Mitgliedschaften werden nicht gemerkt, damit neue Mitglieder sofort Zugriff haben.
+    if ttl > 0 and (family_id is None or membership is not None):
+        entry = _CachedPrincipal(
+            expires_at=time.monotonic() + ttl,
+            user=_detached_snapshot(user),
+            membership=_detached_snapshot(membership) if membership is not None else None,
+        )
+        with _principal_guard:
+            if generation == _principal_generation:
+                _principal_cache[key] = entry
     return user
 
 
@@ -50,6 +137,41 @@ def _extract_token_from_request(request: Request) -> str:
     raise _unauthorized("Token fehlt")
 
 
+def _path_family_id(request: Request) -> int | None:
+    try:
+        return int(request.path_params["family_id"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
 def get_current_user(request: Request, db: Session = Depends(get_db)) -> User:
     token = _extract_token_from_request(request)
-    return get_current_user_from_token_value(token, db)
+    return get_current_user_from_token_value(token, db, family_id=_path_family_id(request))
+
+
+@event.listens_for(FamilyMembership, "after_insert")
+@event.listens_for(FamilyMembership, "after_update")
+@event.listens_for(FamilyMembership, "after_delete")
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _principal_changed(_mapper, _connection, target) -> None:
+    user_id = int(target.user_id if isinstance(target, FamilyMembership) else target.id)
+    _invalidate_principals({user_id})
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(PRINCIPAL_DIRTY_USERS_KEY, set()).add(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_principals_after_commit(session: Session) -> None:
+    # Nochmals nach dem Commit, falls ein paralleler Request zwischenzeitlich den alten Stand gemerkt hat.
+    user_ids = session.info.pop(PRINCIPAL_DIRTY_USERS_KEY, None)
+    if user_ids:
+        _invalidate_principals(user_ids)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_principal_marks(session: Session, previous_transaction) -> None:
+    if previous_transaction.nested:
+        return
+    session.info.pop(PRINCIPAL_DIRTY_USERS_KEY, None)
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, delete, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from .models import (
+    PointsBalance,
+    PointsLedger,
+    PointsLedgerArchive,
+    PointsSourceEnum,
+    RedemptionStatusEnum,
+    RewardRedemption,
+)
+from .services import expected_points_balances, mark_family_ledger_dirty
+
+logger = logging.getLogger(__name__)
+
+
+class LedgerCompactionError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class LedgerCompactionResult:
+    family_id: int
+    cutoff: datetime
+    archived_rows: int
+    opening_rows: int
+
+
+def compaction_cutoff(horizon_days: int, now: datetime | None = None) -> datetime:
+    now = now or datetime.utcnow()
+    return (now - timedelta(days=horizon_days)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def compactable_family_ids(db: Session, cutoff: datetime) -> list[int]:
+    return [
+        int(row[0])
+        for row in (
+            db.query(PointsLedger.family_id)
+            .filter(
+                _compactable_condition(cutoff),
+                PointsLedger.source_type != PointsSourceEnum.opening_balance,
+            )
+            .distinct()
+            .order_by(PointsLedger.family_id.asc())
+            .all()
+        )
+    ]
+
+
+def _compactable_condition(cutoff: datetime, family_id: int | None = None):
+    # Offene Einloesungen bleiben aktiv: Ablehnungen erstatten anhand ihrer Ledger-Zeilen.
+    open_redemption_ids = select(RewardRedemption.id).where(RewardRedemption.status == RedemptionStatusEnum.pending)
+    condition = and_(
+        PointsLedger.created_at < cutoff,
+        ~and_(
+            PointsLedger.source_type == PointsSourceEnum.reward_redemption,
+            PointsLedger.source_id.in_(open_redemption_ids),
+        ),
+    )
+    if family_id is not None:
+        condition = and_(PointsLedger.family_id == family_id, condition)
+    return condition
+
+
+def _verification_snapshot(db: Session, family_id: int) -> dict:
+    db.flush()
+    # Nullsummen erzeugen keinen Uebertrag und zaehlen daher nicht mit.
+    hot_sums = {
+        int(row[0]): int(row[1])
+        for row in (
+            db.query(PointsLedger.user_id, func.sum(PointsLedger.points_delta))
+            .filter(PointsLedger.family_id == family_id)
+            .group_by(PointsLedger.user_id)
+            .all()
+        )
+        if int(row[1] or 0) != 0
+    }
+    stored = {
+        int(row.user_id): (int(row.balance), int(row.earned_total), int(row.spent_total))
+        for row in db.query(PointsBalance).filter(PointsBalance.family_id == family_id).all()
+    }
+    detail = {user_id: totals for (_, user_id), totals in expected_points_balances(db, family_id).items()}
+    return {"hot": hot_sums, "stored": stored, "detail": detail}
+
+
+def compact_family_ledger(db: Session, family_id: int, cutoff: datetime) -> LedgerCompactionResult:
+    before = _verification_snapshot(db, family_id)
+    condition = _compactable_condition(cutoff, family_id)
+
+    # Nur Nutzer mit neuen Einzelbuchungen; ein vorhandener Uebertrag allein wird nicht neu geschrieben.
+    target_user_ids = [
+        int(row[0])
+        for row in (
+            db.query(PointsLedger.user_id)
+            .filter(condition, PointsLedger.source_type != PointsSourceEnum.opening_balance)
+            .distinct()
+            .all()
+        )
+    ]
+    if not target_user_ids:
+        return LedgerCompactionResult(family_id=family_id, cutoff=cutoff, archived_rows=0, opening_rows=0)
+    condition = and_(condition, PointsLedger.user_id.in_(target_user_ids))
+
+    carry_forwards = (
+        db.query(
+            PointsLedger.user_id,
+            func.sum(PointsLedger.points_delta),
+            func.max(PointsLedger.id),
+            func.max(PointsLedger.created_at),
+        )
+        .filter(condition)
+        .group_by(PointsLedger.user_id)
+        .all()
+    )
+    detail_condition = and_(condition, PointsLedger.source_type != PointsSourceEnum.opening_balance)
+    expected_archived = int(db.query(func.count(PointsLedger.id)).filter(detail_condition).scalar() or 0)
+
+    archived_at = datetime.utcnow()
+    archive_columns = [
+        "id",
+        "family_id",
+        "user_id",
+        "source_type",
+        "source_id",
+        "points_delta",
+        "description",
+        "created_by_id",
+        "created_at",
+        "archived_at",
+    ]
+    db.execute(
+        insert(PointsLedgerArchive.__table__).from_select(
+            archive_columns,
+            select(
+                PointsLedger.id,
+                PointsLedger.family_id,
+                PointsLedger.user_id,
+                PointsLedger.source_type,
+                PointsLedger.source_id,
+                PointsLedger.points_delta,
+                PointsLedger.description,
+                PointsLedger.created_by_id,
+                PointsLedger.created_at,
+                literal(archived_at),
+            ).where(detail_condition),
+        )
+    )
+    # Alte Uebertraege werden nicht archiviert: ihre Summe steckt bereits in den archivierten Einzelzeilen.
+    db.execute(delete(PointsLedger.__table__).where(condition))
+    # Geloeschte IDs werden unten wiederverwendet; veraltete Objekte nicht aus der Identity Map lesen.
+    db.expire_all()
+
+    # Der Uebertrag uebernimmt die hoechste verdichtete ID, damit die Reihenfolge im Verlauf stimmt.
+    # Core-INSERT ohne Mapper-Events: Salden und Rollups bleiben unveraendert.
+    opening_rows = [
+        {
+            "id": int(max_id),
+            "family_id": family_id,
+            "user_id": int(user_id),
+            "source_type": PointsSourceEnum.opening_balance,
+            "source_id": 0,
+            "points_delta": int(points_sum or 0),
+            "description": f"Übertrag bis {cutoff:%d.%m.%Y}",
+            "created_by_id": None,
+            "created_at": last_created_at,
+        }
+        for user_id, points_sum, max_id, last_created_at in carry_forwards
+        if int(points_sum or 0) != 0
+    ]
+    if opening_rows:
+        db.execute(insert(PointsLedger.__table__), opening_rows)
+
+    archived_rows = int(
+        db.query(func.count(PointsLedgerArchive.id))
+        .filter(PointsLedgerArchive.family_id == family_id, PointsLedgerArchive.archived_at == archived_at)
+        .scalar()
+        or 0
+    )
+    after = _verification_snapshot(db, family_id)
+    if archived_rows != expected_archived or after != before:
+        raise LedgerCompactionError(
+            f"Verdichtung fuer Familie {family_id} abgebrochen: Salden vor und nach der Verdichtung weichen ab"
+        )
+
+    mark_family_ledger_dirty(db, family_id)
+    logger.info(
+        "Punkte-Ledger verdichtet (family_id=%s, cutoff=%s, archiviert=%s, uebertraege=%s)",
+        family_id,
+        cutoff.isoformat(),
+        archived_rows,
+        len(opening_rows),
+    )
+    return LedgerCompactionResult(
+        family_id=family_id,
+        cutoff=cutoff,
+        archived_rows=archived_rows,
+        opening_rows=len(opening_rows),
+    )
@@ -14,9 +14,16 @@ from sqlalchemy.exc import OperationalError
 from starlette.requests import Request
 
 from .achievement_engine import ensure_achievement_catalog
+from .achievement_queue import start_achievement_queue, stop_achievement_queue
 from .config import settings
 from .database import Base, SessionLocal, engine
-from .maintenance import penalty_worker, push_worker
+from .maintenance import (
+    achievement_period_sweep_worker,
+    penalty_worker,
+    points_balance_worker,
+    points_ledger_compaction_worker,
+    push_worker,
+)
 from .migrations import run_migrations
 from .notification_dispatcher import start_remote_dispatcher, stop_remote_dispatcher
 from .routers import achievements, auth, events, families, live, points, push, rewards, system, tasks
@@ -39,6 +46,7 @@ def initialize_database() -> None:
         run_migrations(engine)
         with SessionLocal() as db:
             ensure_achievement_catalog(db)
+            tasks._rebuild_task_reminder_schedules(db)
             db.commit()
     except OperationalError as exc:
         raise RuntimeError(
@@ -53,15 +61,33 @@ async def lifespan(_: FastAPI):
     initialize_database()
     _warn_about_insecure_defaults()
     start_remote_dispatcher()
+    if settings.achievement_queue_enabled:
+        start_achievement_queue()
     penalty_task = None
     push_task = None
+    balance_task = None
+    compaction_task = None
+    period_sweep_task = None
     if settings.penalty_worker_enabled:
         penalty_task = asyncio.create_task(penalty_worker(), name="homequests-penalty-worker")
     if settings.push_worker_enabled:
         push_task = asyncio.create_task(push_worker(), name="homequests-push-worker")
+    if settings.points_balance_reconcile_enabled:
+        balance_task = asyncio.create_task(points_balance_worker(), name="homequests-points-balance-worker")
+    if settings.points_ledger_compaction_enabled:
+        compaction_task = asyncio.create_task(
+            points_ledger_compaction_worker(),
+            name="homequests-points-ledger-compaction-worker",
+        )
+    if settings.achievement_period_sweep_enabled:
+        period_sweep_task = asyncio.create_task(
+            achievement_period_sweep_worker(),
+            name="homequests-achievement-period-sweep-worker",
+        )
     try:
         yield
     finally:
+        stop_achievement_queue()
         stop_remote_dispatcher()
         if penalty_task is not None:
             penalty_task.cancel()
@@ -71,6 +97,18 @@ async def lifespan(_: FastAPI):
             push_task.cancel()
             with suppress(asyncio.CancelledError):
                 await push_task
+        if balance_task is not None:
+            balance_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await balance_task
+        if compaction_task is not None:
+            compaction_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await compaction_task
+        if period_sweep_task is not None:
+            period_sweep_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await period_sweep_task
 
 
 app = FastAPI(title=settings.app_name, version=settings.app_version, lifespan=lifespan)
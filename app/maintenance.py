@@ -8,11 +8,19 @@ from threading import Lock
 
 from sqlalchemy import text
 
+from .achievement_engine import (
+    PERIOD_SWEEP_STATE_KEY,
+    evaluate_achievements_for_user,
+    period_sweep_user_keys,
+    streak_period_window,
+)
 from .config import settings
 from .database import SessionLocal, engine
-from .models import RecurrenceTypeEnum, Task, TaskStatusEnum
+from .models import RecurrenceTypeEnum, SystemState, Task, TaskStatusEnum
 from .push_notifications import run_push_reminder_sweep_once
 from .routers.tasks import _run_family_task_maintenance
+from .ledger_compaction import compact_family_ledger, compactable_family_ids, compaction_cutoff
+from .services import reconcile_points_balances
 
 logger = logging.getLogger(__name__)
 PENALTY_LOCK_KEY = 860031
@@ -33,83 +41,86 @@ def _release_penalty_lock(db) -> None:
         _fallback_penalty_lock.release()
 
 
+def _maintenance_family_ids(db, now: datetime) -> list[int]:
+    penalty_family_ids = [
+        int(row[0])
+        for row in (
+            db.query(Task.family_id)
+            .filter(
+                Task.is_active == True,  # noqa: E712
+                Task.recurrence_type.in_([RecurrenceTypeEnum.daily.value, RecurrenceTypeEnum.weekly.value]),
+                Task.penalty_enabled == True,  # noqa: E712
+                Task.penalty_points > 0,
+                Task.due_at.is_not(None),
+                Task.due_at < now,
+                Task.status.in_([TaskStatusEnum.open, TaskStatusEnum.rejected]),
+            )
+            .distinct()
+            .all()
+        )
+    ]
+    daily_realign_family_ids = [
+        int(row[0])
+        for row in (
+            db.query(Task.family_id)
+            .filter(
+                Task.is_active == True,  # noqa: E712
+                Task.recurrence_type == RecurrenceTypeEnum.daily.value,
+                Task.due_at.is_not(None),
+                Task.status.in_([TaskStatusEnum.open, TaskStatusEnum.rejected]),
+            )
+            .distinct()
+            .all()
+        )
+    ]
+    rollover_family_ids = [
+        int(row[0])
+        for row in (
+            db.query(Task.family_id)
+            .filter(
+                Task.is_active == True,  # noqa: E712
+                Task.recurrence_type.in_(
+                    [
+                        RecurrenceTypeEnum.none.value,
+                        RecurrenceTypeEnum.daily.value,
+                        RecurrenceTypeEnum.weekly.value,
+                        RecurrenceTypeEnum.monthly.value,
+                    ]
+                ),
+                Task.due_at.is_not(None),
+                Task.due_at < now,
+                Task.status.in_([TaskStatusEnum.open, TaskStatusEnum.rejected]),
+            )
+            .distinct()
+            .all()
+        )
+    ]
+    weekly_flexible_family_ids = [
+        int(row[0])
+        for row in (
+            db.query(Task.family_id)
+            .filter(
+                Task.is_active == True,  # noqa: E712
+                Task.recurrence_type == RecurrenceTypeEnum.weekly.value,
+                Task.due_at.is_(None),
+                Task.status.in_([TaskStatusEnum.open, TaskStatusEnum.rejected, TaskStatusEnum.approved]),
+            )
+            .distinct()
+            .all()
+        )
+    ]
+    return sorted(
+        set(daily_realign_family_ids + rollover_family_ids + penalty_family_ids + weekly_flexible_family_ids)
+    )
+
+
 def run_penalty_sweep_once() -> bool:
     with SessionLocal() as db:
         if not _acquire_penalty_lock(db):
             return False
 
         try:
-            now = datetime.utcnow()
-            penalty_family_ids = [
-                int(row[0])
-                for row in (
-                    db.query(Task.family_id)
-                    .filter(
-                        Task.is_active == True,  # noqa: E712
-                        Task.recurrence_type.in_([RecurrenceTypeEnum.daily.value, RecurrenceTypeEnum.weekly.value]),
-                        Task.penalty_enabled == True,  # noqa: E712
-                        Task.penalty_points > 0,
-                        Task.due_at.is_not(None),
-                        Task.due_at < now,
-                        Task.status.in_([TaskStatusEnum.open, TaskStatusEnum.rejected]),
-                    )
-                    .distinct()
-                    .all()
-                )
-            ]
-            daily_realign_family_ids = [
-                int(row[0])
-                for row in (
-                    db.query(Task.family_id)
-                    .filter(
-                        Task.is_active == True,  # noqa: E712
-                        Task.recurrence_type == RecurrenceTypeEnum.daily.value,
-                        Task.due_at.is_not(None),
-                        Task.status.in_([TaskStatusEnum.open, TaskStatusEnum.rejected]),
-                    )
-                    .distinct()
-                    .all()
-                )
-            ]
-            rollover_family_ids = [
-                int(row[0])
-                for row in (
-                    db.query(Task.family_id)
-                    .filter(
-                        Task.is_active == True,  # noqa: E712
-                        Task.recurrence_type.in_(
-                            [
-                                RecurrenceTypeEnum.none.value,
-                                RecurrenceTypeEnum.daily.value,
-                                RecurrenceTypeEnum.weekly.value,
-                                RecurrenceTypeEnum.monthly.value,
-                            ]
-                        ),
-                        Task.due_at.is_not(None),
-                        Task.due_at < now,
-                        Task.status.in_([TaskStatusEnum.open, TaskStatusEnum.rejected]),
-                    )
-                    .distinct()
-                    .all()
-                )
-            ]
-            weekly_flexible_family_ids = [
-                int(row[0])
-                for row in (
-                    db.query(Task.family_id)
-                    .filter(
-                        Task.is_active == True,  # noqa: E712
-                        Task.recurrence_type == RecurrenceTypeEnum.weekly.value,
-                        Task.due_at.is_(None),
-                        Task.status.in_([TaskStatusEnum.open, TaskStatusEnum.rejected, TaskStatusEnum.approved]),
-                    )
-                    .distinct()
-                    .all()
-                )
-            ]
-            family_ids = sorted(
-                set(daily_realign_family_ids + rollover_family_ids + penalty_family_ids + weekly_flexible_family_ids)
-            )
+            family_ids = _maintenance_family_ids(db, datetime.utcnow())
 
             changed = False
             for family_id in family_ids:
@@ -148,3 +159,111 @@ async def push_worker() -> None:
         except Exception:
             logger.exception("Push-Worker fehlgeschlagen")
         await asyncio.sleep(settings.push_worker_interval_seconds)
+
+
+def run_points_balance_reconciliation_once() -> int:
+    with SessionLocal() as db:
+        try:
+            corrected = reconcile_points_balances(db)
+            db.commit()
+            return corrected
+        except Exception:
+            db.rollback()
+            raise
+
+
+async def points_balance_worker() -> None:
+    while True:
+        try:
+            await asyncio.to_thread(run_points_balance_reconciliation_once)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Punktesaldo-Abgleich fehlgeschlagen")
+        await asyncio.sleep(settings.points_balance_reconcile_interval_seconds)
+
+
+def run_points_ledger_compaction_once(now: datetime | None = None) -> int:
+    cutoff = compaction_cutoff(settings.points_ledger_compaction_horizon_days, now)
+    with SessionLocal() as db:
+        family_ids = compactable_family_ids(db, cutoff)
+        db.rollback()
+        archived = 0
+        # Jede Familie in eigener Transaktion; eine fehlgeschlagene Pruefung rollt nur diese zurueck.
+        for family_id in family_ids:
+            try:
+                result = compact_family_ledger(db, family_id, cutoff)
+                db.commit()
+                archived += result.archived_rows
+            except Exception:
+                db.rollback()
+                logger.exception("Ledger-Verdichtung fuer Familie %s fehlgeschlagen", family_id)
+        return archived
+
+
+async def points_ledger_compaction_worker() -> None:
+    while True:
+        try:
+            await asyncio.to_thread(run_points_ledger_compaction_once)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Ledger-Verdichtung fehlgeschlagen")
+        await asyncio.sleep(settings.points_ledger_compaction_interval_seconds)
+
+
+def run_achievement_period_sweep_once(now: datetime | None = None) -> int:
+    now = now or datetime.utcnow()
+    with SessionLocal() as db:
+        window = streak_period_window(db, now)
+        if window is None:
+            return 0
+        boundary, active_since = window
+        state = db.get(SystemState, PERIOD_SWEEP_STATE_KEY)
+        if state is not None and datetime.fromisoformat(state.value) >= boundary:
+            return 0
+        user_keys = period_sweep_user_keys(db, active_since)
+        db.rollback()
+
+        evaluated = 0
+        failed = False
+        batch_size = settings.achievement_period_sweep_batch_size
+        # Feste Stapel ueber Familien hinweg; ein Fehler rollt nur den eigenen Stapel zurueck.
+        for offset in range(0, len(user_keys), batch_size):
+            batch = user_keys[offset : offset + batch_size]
+            try:
+                for family_id, user_id in batch:
+                    evaluate_achievements_for_user(
+                        db,
+                        family_id=family_id,
+                        user_id=user_id,
+                        reason="period_boundary",
+                        emit_events=True,
+                    )
+                db.commit()
+                evaluated += len(batch)
+            except Exception:
+                db.rollback()
+                failed = True
+                logger.exception("Achievement-Periodenlauf fuer %s Nutzer fehlgeschlagen", len(batch))
+
+        # Bei Fehlern bleibt die Marke stehen, der naechste Lauf versucht die Grenze erneut.
+        if not failed:
+            state = db.get(SystemState, PERIOD_SWEEP_STATE_KEY)
+            if state is None:
+                db.add(SystemState(key=PERIOD_SWEEP_STATE_KEY, value=boundary.isoformat()))
+            else:
+                state.value = boundary.isoformat()
+            db.commit()
+        return evaluated
+
+
+async def achievement_period_sweep_worker() -> None:
+    while True:
+        try:
+            await asyncio.to_thread(run_achievement_period_sweep_once)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Achievement-Periodenlauf fehlgeschlagen")
+        await asyncio.sleep(settings.achievement_period_sweep_interval_seconds)
@@ -496,6 +496,461 @@ def _create_achievement_family_calibrations_table(engine: Engine) -> None:
             )
 
 
+def _create_weekly_flexible_series_states_table(engine: Engine) -> None:
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            conn.execute(
+                text(
+                    "CREATE TABLE IF NOT EXISTS weekly_flexible_series_states ("
+                    "id SERIAL PRIMARY KEY, "
+                    "family_id INTEGER NOT NULL REFERENCES families(id) ON DELETE CASCADE, "
+                    "key_hash VARCHAR(64) NOT NULL, "
+                    "assignee_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE, "
+                    "title_key VARCHAR(200) NOT NULL, "
+                    "special_template_id INTEGER NOT NULL DEFAULT 0, "
+                    "latest_task_id INTEGER NULL REFERENCES tasks(id) ON DELETE SET NULL, "
+                    "cycle_start TIMESTAMP NOT NULL, "
+                    "latest_approved BOOLEAN NOT NULL DEFAULT FALSE, "
+                    "updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+                )
+            )
+        else:
+            conn.execute(
+                text(
+                    "CREATE TABLE IF NOT EXISTS weekly_flexible_series_states ("
+                    "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                    "family_id INTEGER NOT NULL, "
+                    "key_hash VARCHAR(64) NOT NULL, "
+                    "assignee_id INTEGER NOT NULL, "
+                    "title_key VARCHAR(200) NOT NULL, "
+                    "special_template_id INTEGER NOT NULL DEFAULT 0, "
+                    "latest_task_id INTEGER NULL, "
+                    "cycle_start TIMESTAMP NOT NULL, "
+                    "latest_approved BOOLEAN NOT NULL DEFAULT 0, "
+                    "updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+                )
+            )
+        conn.execute(
+            text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS uq_weekly_flexible_state_family_key "
+                "ON weekly_flexible_series_states (family_id, key_hash)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_weekly_flexible_states_family_cycle "
+                "ON weekly_flexible_series_states (family_id, cycle_start)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_tasks_weekly_flexible_family_updated "
+                "ON tasks (family_id, updated_at) "
+                "WHERE recurrence_type = 'weekly' AND due_at IS NULL"
+            )
+        )
+
+
+def _add_task_maintenance_indexes(engine: Engine) -> None:
+    true_literal = "TRUE" if engine.dialect.name == "postgresql" else "1"
+    statements = [
+        # Tages-Realign, Rollover, Strafen und Familien-Suche des Workers.
+        "CREATE INDEX IF NOT EXISTS ix_tasks_family_open_like_due "
+        "ON tasks (family_id, due_at) "
+        f"WHERE is_active = {true_literal} AND status IN ('open', 'rejected')",
+        # Flexible Wochenaufgaben je Kind.
+        "CREATE INDEX IF NOT EXISTS ix_tasks_family_weekly_flexible "
+        "ON tasks (family_id, assignee_id, created_at) "
+        f"WHERE is_active = {true_literal} AND recurrence_type = 'weekly' AND due_at IS NULL",
+        # Erinnerungs-Sweep ueber alle Familien.
+        "CREATE INDEX IF NOT EXISTS ix_tasks_open_due "
+        "ON tasks (due_at) "
+        f"WHERE is_active = {true_literal} AND status = 'open' AND due_at IS NOT NULL",
+        # Aufgabenliste (Eltern bzw. Kind).
+        "CREATE INDEX IF NOT EXISTS ix_tasks_family_created ON tasks (family_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_tasks_family_assignee_created ON tasks (family_id, assignee_id, created_at)",
+    ]
+    with engine.begin() as conn:
+        for statement in statements:
+            conn.execute(text(statement))
+
+
+def _create_task_reminder_occurrences_table(engine: Engine) -> None:
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            conn.execute(
+                text(
+                    "CREATE TABLE IF NOT EXISTS task_reminder_occurrences ("
+                    "id SERIAL PRIMARY KEY, "
+                    "family_id INTEGER NOT NULL REFERENCES families(id) ON DELETE CASCADE, "
+                    "task_id INTEGER NOT NULL REFERENCES tasks(id) ON DELETE CASCADE, "
+                    "assignee_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE, "
+                    "title VARCHAR(180) NOT NULL, "
+                    "due_at TIMESTAMP NOT NULL, "
+                    "reminder_offset_minutes INTEGER NOT NULL, "
+                    "notify_at TIMESTAMP NOT NULL, "
+                    "created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+                )
+            )
+        else:
+            conn.execute(
+                text(
+                    "CREATE TABLE IF NOT EXISTS task_reminder_occurrences ("
+                    "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                    "family_id INTEGER NOT NULL, "
+                    "task_id INTEGER NOT NULL, "
+                    "assignee_id INTEGER NOT NULL, "
+                    "title VARCHAR(180) NOT NULL, "
+                    "due_at TIMESTAMP NOT NULL, "
+                    "reminder_offset_minutes INTEGER NOT NULL, "
+                    "notify_at TIMESTAMP NOT NULL, "
+                    "created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+                )
+            )
+        conn.execute(
+            text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS uq_task_reminder_occurrence_task_offset "
+                "ON task_reminder_occurrences (task_id, reminder_offset_minutes)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_task_reminder_occurrences_family_notify "
+                "ON task_reminder_occurrences (family_id, notify_at, id)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_task_reminder_occurrences_family_assignee_notify "
+                "ON task_reminder_occurrences (family_id, assignee_id, notify_at, id)"
+            )
+        )
+
+
+def _create_points_balances_table(engine: Engine) -> None:
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            conn.execute(
+                text(
+                    "CREATE TABLE IF NOT EXISTS points_balances ("
+                    "id SERIAL PRIMARY KEY, "
+                    "family_id INTEGER NOT NULL REFERENCES families(id) ON DELETE CASCADE, "
+                    "user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE, "
+                    "balance INTEGER NOT NULL DEFAULT 0, "
+                    "earned_total INTEGER NOT NULL DEFAULT 0, "
+                    "spent_total INTEGER NOT NULL DEFAULT 0, "
+                    "version INTEGER NOT NULL DEFAULT 0, "
+                    "updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+                )
+            )
+        else:
+            conn.execute(
+                text(
+                    "CREATE TABLE IF NOT EXISTS points_balances ("
+                    "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                    "family_id INTEGER NOT NULL, "
+                    "user_id INTEGER NOT NULL, "
+                    "balance INTEGER NOT NULL DEFAULT 0, "
+                    "earned_total INTEGER NOT NULL DEFAULT 0, "
+                    "spent_total INTEGER NOT NULL DEFAULT 0, "
+                    "version INTEGER NOT NULL DEFAULT 0, "
+                    "updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+                )
+            )
+        conn.execute(
+            text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS uq_points_balance_family_user "
+                "ON points_balances (family_id, user_id)"
+            )
+        )
+        # Bestehende Historie einmalig verdichten.
+        conn.execute(
+            text(
+                "INSERT INTO points_balances "
+                "(family_id, user_id, balance, earned_total, spent_total, version, updated_at) "
+                "SELECT family_id, user_id, "
+                "SUM(points_delta), "
+                "SUM(CASE WHEN source_type IN ('task_approval', 'manual_adjustment') AND points_delta > 0 "
+                "THEN points_delta ELSE 0 END), "
+                "SUM(CASE WHEN source_type IN ('reward_redemption', 'reward_contribution') AND points_delta < 0 "
+                "THEN -points_delta ELSE 0 END), "
+                "1, CURRENT_TIMESTAMP "
+                "FROM points_ledger GROUP BY family_id, user_id "
+                "ON CONFLICT (family_id, user_id) DO NOTHING"
+            )
+        )
+
+
+def _create_points_daily_rollups_table(engine: Engine) -> None:
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            conn.execute(
+                text(
+                    "CREATE TABLE IF NOT EXISTS points_daily_rollups ("
+                    "id SERIAL PRIMARY KEY, "
+                    "family_id INTEGER NOT NULL REFERENCES families(id) ON DELETE CASCADE, "
+                    "user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE, "
+                    "day DATE NOT NULL, "
+                    "earned INTEGER NOT NULL DEFAULT 0, "
+                    "spent INTEGER NOT NULL DEFAULT 0, "
+                    "net INTEGER NOT NULL DEFAULT 0, "
+                    "task_approvals INTEGER NOT NULL DEFAULT 0, "
+                    "updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+                )
+            )
+        else:
+            conn.execute(
+                text(
+                    "CREATE TABLE IF NOT EXISTS points_daily_rollups ("
+                    "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                    "family_id INTEGER NOT NULL, "
+                    "user_id INTEGER NOT NULL, "
+                    "day DATE NOT NULL, "
+                    "earned INTEGER NOT NULL DEFAULT 0, "
+                    "spent INTEGER NOT NULL DEFAULT 0, "
+                    "net INTEGER NOT NULL DEFAULT 0, "
+                    "task_approvals INTEGER NOT NULL DEFAULT 0, "
+                    "updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+                )
+            )
+        conn.execute(
+            text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS uq_points_daily_rollup_family_user_day "
+                "ON points_daily_rollups (family_id, user_id, day)"
+            )
+        )
+        conn.execute(
+            text(
+                "INSERT INTO points_daily_rollups "
+                "(family_id, user_id, day, earned, spent, net, task_approvals, updated_at) "
+                "SELECT family_id, user_id, DATE(created_at), "
+                "SUM(CASE WHEN source_type IN ('task_approval', 'manual_adjustment', 'achievement_unlock') "
+                "AND points_delta > 0 THEN points_delta ELSE 0 END), "
+                "SUM(CASE WHEN source_type IN ('reward_redemption', 'reward_contribution') AND points_delta < 0 "
+                "THEN -points_delta ELSE 0 END), "
+                "SUM(points_delta), "
+                "SUM(CASE WHEN source_type = 'task_approval' AND points_delta > 0 THEN 1 ELSE 0 END), "
+                "CURRENT_TIMESTAMP "
+                "FROM points_ledger GROUP BY family_id, user_id, DATE(created_at) "
+                "ON CONFLICT (family_id, user_id, day) DO NOTHING"
+            )
+        )
+
+
+def _add_points_ledger_keyset_indexes(engine: Engine) -> None:
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_points_ledger_family_user_id "
+                "ON points_ledger (family_id, user_id, id DESC)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_points_ledger_family_id_desc "
+                "ON points_ledger (family_id, id DESC)"
+            )
+        )
+
+
+def _add_points_ledger_source_index(engine: Engine) -> None:
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_points_ledger_source "
+                "ON points_ledger (source_type, source_id)"
+            )
+        )
+
+
+def _create_points_ledger_archive(engine: Engine) -> None:
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            conn.execute(
+                text(
+                    """
+                    DO $$
+                    BEGIN
+                        IF EXISTS (SELECT 1 FROM pg_type WHERE typname = 'pointssourceenum') THEN
+                            IF NOT EXISTS (
+                                SELECT 1
+                                FROM pg_enum e
+                                JOIN pg_type t ON t.oid = e.enumtypid
+                                WHERE t.typname = 'pointssourceenum' AND e.enumlabel = 'opening_balance'
+                            ) THEN
+                                ALTER TYPE pointssourceenum ADD VALUE 'opening_balance';
+                            END IF;
+                        END IF;
+                    END $$;
+                    """
+                )
+            )
+            conn.execute(
+                text(
+                    "CREATE TABLE IF NOT EXISTS points_ledger_archive ("
+                    "id INTEGER PRIMARY KEY, "
+                    "family_id INTEGER NOT NULL REFERENCES families(id) ON DELETE CASCADE, "
+                    "user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE, "
+                    "source_type pointssourceenum NOT NULL, "
+                    "source_id INTEGER NOT NULL, "
+                    "points_delta INTEGER NOT NULL, "
+                    "description VARCHAR(255) NOT NULL, "
+                    "created_by_id INTEGER REFERENCES users(id) ON DELETE SET NULL, "
+                    "created_at TIMESTAMP NOT NULL, "
+                    "archived_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+                )
+            )
+        else:
+            conn.execute(
+                text(
+                    "CREATE TABLE IF NOT EXISTS points_ledger_archive ("
+                    "id INTEGER PRIMARY KEY, "
+                    "family_id INTEGER NOT NULL, "
+                    "user_id INTEGER NOT NULL, "
+                    "source_type VARCHAR(19) NOT NULL, "
+                    "source_id INTEGER NOT NULL, "
+                    "points_delta INTEGER NOT NULL, "
+                    "description VARCHAR(255) NOT NULL, "
+                    "created_by_id INTEGER, "
+                    "created_at TIMESTAMP NOT NULL, "
+                    "archived_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+                )
+            )
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_points_ledger_archive_family_user_id "
+                "ON points_ledger_archive (family_id, user_id, id)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_points_ledger_archive_source "
+                "ON points_ledger_archive (source_type, source_id)"
+            )
+        )
+
+
+def _create_system_state_table(engine: Engine) -> None:
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE IF NOT EXISTS system_state ("
+                "key VARCHAR(120) PRIMARY KEY, "
+                "value TEXT NOT NULL, "
+                "updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+            )
+        )
+
+
+def _create_achievement_user_counters_table(engine: Engine) -> None:
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            conn.execute(
+                text(
+                    "CREATE TABLE IF NOT EXISTS achievement_user_counters ("
+                    "id SERIAL PRIMARY KEY, "
+                    "family_id INTEGER NOT NULL REFERENCES families(id) ON DELETE CASCADE, "
+                    "user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE, "
+                    "approved_tasks_total INTEGER NOT NULL DEFAULT 0, "
+                    "approved_special_tasks_total INTEGER NOT NULL DEFAULT 0, "
+                    "approved_weekly_tasks_total INTEGER NOT NULL DEFAULT 0, "
+                    "updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+                )
+            )
+        else:
+            conn.execute(
+                text(
+                    "CREATE TABLE IF NOT EXISTS achievement_user_counters ("
+                    "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                    "family_id INTEGER NOT NULL, "
+                    "user_id INTEGER NOT NULL, "
+                    "approved_tasks_total INTEGER NOT NULL DEFAULT 0, "
+                    "approved_special_tasks_total INTEGER NOT NULL DEFAULT 0, "
+                    "approved_weekly_tasks_total INTEGER NOT NULL DEFAULT 0, "
+                    "updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+                )
+            )
+        conn.execute(
+            text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS uq_achievement_user_counter_family_user "
+                "ON achievement_user_counters (family_id, user_id)"
+            )
+        )
+        # Zaehler einmalig aus den vorhandenen Aufgabenprotokollen fuellen.
+        conn.execute(
+            text(
+                "INSERT INTO achievement_user_counters "
+                "(family_id, user_id, approved_tasks_total, approved_special_tasks_total, "
+                "approved_weekly_tasks_total, updated_at) "
+                "SELECT family_id, user_id, COUNT(id), "
+                "SUM(CASE WHEN special_template_id IS NOT NULL THEN 1 ELSE 0 END), "
+                "SUM(CASE WHEN recurrence_type = 'weekly' THEN 1 ELSE 0 END), "
+                "CURRENT_TIMESTAMP "
+                "FROM achievement_task_records WHERE outcome = 'approved' GROUP BY family_id, user_id "
+                "ON CONFLICT (family_id, user_id) DO NOTHING"
+            )
+        )
+
+
+def _add_achievement_calibration_computed_at(engine: Engine) -> None:
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "ALTER TABLE achievement_family_calibrations "
+                "ADD COLUMN IF NOT EXISTS computed_at TIMESTAMP NULL"
+            )
+        )
+
+
+def _create_achievement_user_summaries_table(engine: Engine) -> None:
+    # Wird nicht vorbefuellt: fehlende Zeilen legt der Auswerter bzw. die Uebersicht beim ersten Abruf an.
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            conn.execute(
+                text(
+                    "CREATE TABLE IF NOT EXISTS achievement_user_summaries ("
+                    "id SERIAL PRIMARY KEY, "
+                    "family_id INTEGER NOT NULL REFERENCES families(id) ON DELETE CASCADE, "
+                    "user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE, "
+                    "unlocked_count INTEGER NOT NULL DEFAULT 0, "
+                    "bronze_unlocked_count INTEGER NOT NULL DEFAULT 0, "
+                    "silver_unlocked_count INTEGER NOT NULL DEFAULT 0, "
+                    "gold_unlocked_count INTEGER NOT NULL DEFAULT 0, "
+                    "platinum_unlocked_count INTEGER NOT NULL DEFAULT 0, "
+                    "diamond_unlocked_count INTEGER NOT NULL DEFAULT 0, "
+                    "profile_claimable_count INTEGER NOT NULL DEFAULT 0, "
+                    "reward_claimable_count INTEGER NOT NULL DEFAULT 0, "
+                    "last_unlocked_at TIMESTAMP NULL, "
+                    "updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+                )
+            )
+        else:
+            conn.execute(
+                text(
+                    "CREATE TABLE IF NOT EXISTS achievement_user_summaries ("
+                    "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                    "family_id INTEGER NOT NULL, "
+                    "user_id INTEGER NOT NULL, "
+                    "unlocked_count INTEGER NOT NULL DEFAULT 0, "
+                    "bronze_unlocked_count INTEGER NOT NULL DEFAULT 0, "
+                    "silver_unlocked_count INTEGER NOT NULL DEFAULT 0, "
+                    "gold_unlocked_count INTEGER NOT NULL DEFAULT 0, "
+                    "platinum_unlocked_count INTEGER NOT NULL DEFAULT 0, "
+                    "diamond_unlocked_count INTEGER NOT NULL DEFAULT 0, "
+                    "profile_claimable_count INTEGER NOT NULL DEFAULT 0, "
+                    "reward_claimable_count INTEGER NOT NULL DEFAULT 0, "
+                    "last_unlocked_at TIMESTAMP NULL, "
+                    "updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+                )
+            )
+        conn.execute(
+            text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS uq_achievement_user_summary_family_user "
+                "ON achievement_user_summaries (family_id, user_id)"
+            )
+        )
+
+
 MIGRATIONS: list[tuple[str, MigrationFn]] = [
     ("20260306_legacy_schema_bootstrap", _run_legacy_schema_bootstrap),
     ("20260306_task_always_submittable", _add_task_always_submittable_column),
@@ -509,6 +964,18 @@ MIGRATIONS: list[tuple[str, MigrationFn]] = [
     ("20260423_achievement_claim_columns", _add_achievement_claim_columns),
     ("20260424_achievement_diamond_difficulty", _add_achievement_diamond_difficulty),
     ("20260428_achievement_family_calibrations", _create_achievement_family_calibrations_table),
+    ("20261019_weekly_flexible_series_states", _create_weekly_flexible_series_states_table),
+    ("20261019_task_maintenance_indexes", _add_task_maintenance_indexes),
+    ("20261019_task_reminder_occurrences", _create_task_reminder_occurrences_table),
+    ("20261019_points_balances", _create_points_balances_table),
+    ("20261019_points_daily_rollups", _create_points_daily_rollups_table),
+    ("20261019_points_ledger_keyset_indexes", _add_points_ledger_keyset_indexes),
+    ("20261019_points_ledger_source_index", _add_points_ledger_source_index),
+    ("20261019_points_ledger_archive", _create_points_ledger_archive),
+    ("20261019_system_state", _create_system_state_table),
+    ("20261019_achievement_user_counters", _create_achievement_user_counters_table),
+    ("20261019_achievement_calibration_computed_at", _add_achievement_calibration_computed_at),
+    ("20261019_achievement_user_summaries", _create_achievement_user_summaries_table),
 ]
 
 
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
 from enum import Enum
 from typing import Optional
 
 from sqlalchemy import (
     Boolean,
+    Date,
     DateTime,
     Enum as SqlEnum,
     ForeignKey,
@@ -65,6 +66,7 @@ class PointsSourceEnum(str, Enum):
     task_penalty = "task_penalty"
     manual_adjustment = "manual_adjustment"
     achievement_unlock = "achievement_unlock"
+    opening_balance = "opening_balance"
 
 
 class RewardContributionStatusEnum(str, Enum):
@@ -192,6 +194,39 @@ class TaskGenerationBlock(Base):
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
 
+class WeeklyFlexibleSeriesState(Base):
+    __tablename__ = "weekly_flexible_series_states"
+    __table_args__ = (UniqueConstraint("family_id", "key_hash", name="uq_weekly_flexible_state_family_key"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    family_id: Mapped[int] = mapped_column(ForeignKey("families.id", ondelete="CASCADE"), index=True)
+    key_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    assignee_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    title_key: Mapped[str] = mapped_column(String(200), nullable=False)
+    special_template_id: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    latest_task_id: Mapped[Optional[int]] = mapped_column(ForeignKey("tasks.id", ondelete="SET NULL"))
+    cycle_start: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    latest_approved: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
+class TaskReminderOccurrence(Base):
+    __tablename__ = "task_reminder_occurrences"
+    __table_args__ = (
+        UniqueConstraint("task_id", "reminder_offset_minutes", name="uq_task_reminder_occurrence_task_offset"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    family_id: Mapped[int] = mapped_column(ForeignKey("families.id", ondelete="CASCADE"), index=True)
+    task_id: Mapped[int] = mapped_column(ForeignKey("tasks.id", ondelete="CASCADE"), index=True)
+    assignee_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    title: Mapped[str] = mapped_column(String(180), nullable=False)
+    due_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    reminder_offset_minutes: Mapped[int] = mapped_column(Integer, nullable=False)
+    notify_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+
 class TaskSubmission(Base):
     __tablename__ = "task_submissions"
 
@@ -286,6 +321,50 @@ class PointsLedger(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
 
 
+class PointsLedgerArchive(Base):
+    __tablename__ = "points_ledger_archive"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    family_id: Mapped[int] = mapped_column(ForeignKey("families.id", ondelete="CASCADE"), index=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    source_type: Mapped[PointsSourceEnum] = mapped_column(SqlEnum(PointsSourceEnum), nullable=False)
+    source_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    points_delta: Mapped[int] = mapped_column(Integer, nullable=False)
+    description: Mapped[str] = mapped_column(String(255), nullable=False)
+    created_by_id: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"))
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class PointsBalance(Base):
+    __tablename__ = "points_balances"
+    __table_args__ = (UniqueConstraint("family_id", "user_id", name="uq_points_balance_family_user"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    family_id: Mapped[int] = mapped_column(ForeignKey("families.id", ondelete="CASCADE"), index=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    balance: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    earned_total: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    spent_total: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    version: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
+class PointsDailyRollup(Base):
+    __tablename__ = "points_daily_rollups"
+    __table_args__ = (UniqueConstraint("family_id", "user_id", "day", name="uq_points_daily_rollup_family_user_day"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    family_id: Mapped[int] = mapped_column(ForeignKey("families.id", ondelete="CASCADE"), index=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    earned: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    spent: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    net: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    task_approvals: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
 class SpecialTaskTemplate(Base):
     __tablename__ = "special_task_templates"
 
@@ -469,6 +548,7 @@ class AchievementFamilyCalibration(Base):
     min_tasks_required: Mapped[int] = mapped_column(Integer, default=10, nullable=False)
     min_rewards_required: Mapped[int] = mapped_column(Integer, default=5, nullable=False)
     preview_payload: Mapped[dict] = mapped_column(JSON, default=dict, nullable=False)
+    computed_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
 
@@ -509,3 +589,43 @@ class AchievementTaskRecord(Base):
     metadata_json: Mapped[dict] = mapped_column(JSON, default=dict, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
+class AchievementUserCounter(Base):
+    __tablename__ = "achievement_user_counters"
+    __table_args__ = (UniqueConstraint("family_id", "user_id", name="uq_achievement_user_counter_family_user"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    family_id: Mapped[int] = mapped_column(ForeignKey("families.id", ondelete="CASCADE"), index=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    approved_tasks_total: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    approved_special_tasks_total: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    approved_weekly_tasks_total: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
+class AchievementUserSummary(Base):
+    __tablename__ = "achievement_user_summaries"
+    __table_args__ = (UniqueConstraint("family_id", "user_id", name="uq_achievement_user_summary_family_user"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    family_id: Mapped[int] = mapped_column(ForeignKey("families.id", ondelete="CASCADE"), index=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    unlocked_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    bronze_unlocked_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    silver_unlocked_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    gold_unlocked_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    platinum_unlocked_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    diamond_unlocked_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    profile_claimable_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    reward_claimable_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_unlocked_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
+class SystemState(Base):
+    __tablename__ = "system_state"
+
+    key: Mapped[str] = mapped_column(String(120), primary_key=True)
+    value: Mapped[str] = mapped_column(Text, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
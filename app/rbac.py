@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
 
 from .models import FamilyMembership, RoleEnum
 
+REQUEST_MEMBERSHIPS_KEY = "request_memberships"
+
 
 class MembershipContext:
     def __init__(self, membership: FamilyMembership):
@@ -12,12 +15,25 @@ class MembershipContext:
         self.role = membership.role
 
 
+def remember_membership(db: Session, family_id: int, user_id: int, membership: FamilyMembership | None) -> None:
+    db.info.setdefault(REQUEST_MEMBERSHIPS_KEY, {})[(int(family_id), int(user_id))] = membership
+
+
+def find_membership(db: Session, family_id: int, user_id: int) -> FamilyMembership | None:
+    # Pro Transaktion gemerkt, damit Handler dieselbe Mitgliedschaft nicht mehrfach abfragen.
+    memberships = db.info.setdefault(REQUEST_MEMBERSHIPS_KEY, {})
+    key = (int(family_id), int(user_id))
+    if key not in memberships:
+        memberships[key] = (
+            db.query(FamilyMembership)
+            .filter(FamilyMembership.family_id == family_id, FamilyMembership.user_id == user_id)
+            .first()
+        )
+    return memberships[key]
+
+
 def get_membership_or_403(db: Session, family_id: int, user_id: int) -> MembershipContext:
-    membership = (
-        db.query(FamilyMembership)
-        .filter(FamilyMembership.family_id == family_id, FamilyMembership.user_id == user_id)
-        .first()
-    )
+    membership = find_membership(db, family_id, user_id)
     if not membership:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Kein Zugriff auf diese Familie")
     return MembershipContext(membership)
@@ -30,3 +46,24 @@ def require_roles(context: MembershipContext, allowed: set[RoleEnum]) -> None:
             status_code=status.HTTP_403_FORBIDDEN,
             detail=f"Rolle nicht erlaubt. Benötigt: {allowed_roles}",
         )
+
+
+@event.listens_for(FamilyMembership, "after_insert")
+@event.listens_for(FamilyMembership, "after_update")
+@event.listens_for(FamilyMembership, "after_delete")
+def _forget_changed_membership(_mapper, _connection, target: FamilyMembership) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.get(REQUEST_MEMBERSHIPS_KEY, {}).pop((int(target.family_id), int(target.user_id)), None)
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_memberships_after_commit(session: Session) -> None:
+    session.info.pop(REQUEST_MEMBERSHIPS_KEY, None)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_memberships_after_rollback(session: Session, previous_transaction) -> None:
+    if previous_transaction.nested:
+        return
+    session.info.pop(REQUEST_MEMBERSHIPS_KEY, None)
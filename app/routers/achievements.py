@@ -7,17 +7,25 @@ from sqlalchemy.orm import Session
 
 from ..achievement_calibration import apply_family_achievement_recalibration, preview_family_achievement_calibration
 from ..achievement_engine import (
+    build_achievement_family_summary,
     build_achievement_overview,
     claim_achievement_profile,
     claim_achievement_reward,
     evaluate_achievements_for_user,
     list_freeze_windows,
+    refresh_family_achievement_summaries,
 )
 from ..database import get_db
 from ..deps import get_current_user
 from ..models import AchievementFreezeWindow, FamilyMembership, RoleEnum, User
 from ..rbac import get_membership_or_403, require_roles
-from ..schemas import AchievementClaimOut, AchievementFreezeWindowCreate, AchievementFreezeWindowOut, AchievementOverviewOut
+from ..schemas import (
+    AchievementClaimOut,
+    AchievementFamilySummaryOut,
+    AchievementFreezeWindowCreate,
+    AchievementFreezeWindowOut,
+    AchievementOverviewOut,
+)
 
 router = APIRouter(tags=["achievements"])
 
@@ -59,6 +67,19 @@ def get_my_achievements(
     return payload
 
 
+@router.get("/families/{family_id}/achievements/summary", response_model=AchievementFamilySummaryOut)
+def get_family_achievement_summary(
+    family_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    context = get_membership_or_403(db, family_id, current_user.id)
+    require_roles(context, {RoleEnum.admin, RoleEnum.parent})
+    payload = build_achievement_family_summary(db, family_id)
+    db.commit()
+    return payload
+
+
 @router.get("/families/{family_id}/achievements/users/{user_id}", response_model=AchievementOverviewOut)
 def get_user_achievements(
     family_id: int,
@@ -118,7 +139,22 @@ def recalculate_achievement_calibration(
 ):
     context = get_membership_or_403(db, family_id, current_user.id)
     require_roles(context, {RoleEnum.admin, RoleEnum.parent})
-    apply_family_achievement_recalibration(db, family_id)
+    calibration = apply_family_achievement_recalibration(db, family_id)
+    # Der neue Faktor skaliert Ziele und Belohnungen aller Mitglieder.
+    refresh_family_achievement_summaries(db, family_id, calibration=calibration)
+    member_ids = [
+        int(row[0])
+        for row in db.query(FamilyMembership.user_id).filter(FamilyMembership.family_id == family_id).all()
+    ]
+    for member_id in member_ids:
+        evaluate_achievements_for_user(
+            db,
+            family_id=family_id,
+            user_id=member_id,
+            triggered_by_id=current_user.id,
+            reason="calibration_applied",
+            emit_events=True,
+        )
     target_membership = (
         db.query(FamilyMembership)
         .filter(
@@ -183,6 +219,15 @@ def claim_my_achievement_reward(
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
+    if points_delta:
+        evaluate_achievements_for_user(
+            db,
+            family_id=family_id,
+            user_id=current_user.id,
+            triggered_by_id=current_user.id,
+            reason="achievement_reward_claimed",
+            emit_events=True,
+        )
     overview = build_achievement_overview(db, family_id, current_user.id)
     db.commit()
     return AchievementClaimOut(
@@ -8,6 +8,11 @@ from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, Resp
 from sqlalchemy import func, text
 from sqlalchemy.orm import Session
 
+from ..achievement_engine import (
+    ensure_achievement_catalog,
+    rebuild_achievement_user_counters,
+    rebuild_achievement_user_summaries,
+)
 from ..config import settings
 from ..database import SessionLocal, engine, get_db
 from ..db_tools import (
@@ -19,7 +24,7 @@ from ..db_tools import (
     restore_backup,
     store_uploaded_backup,
 )
-from ..deps import get_current_user
+from ..deps import clear_principal_cache, get_current_user
 from ..models import Family, FamilyMembership, RoleEnum, User
 from ..schemas import (
     BootstrapBackupFileOut,
@@ -34,6 +39,8 @@ from ..schemas import (
     UserOut,
 )
 from ..security import create_access_token, hash_password, verify_password
+from ..services import rebuild_points_daily_rollups, reconcile_points_balances
+from .tasks import _rebuild_task_reminder_schedules
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 COOKIE_NAME = "fp_token"
@@ -180,10 +187,22 @@ def bootstrap_restore(payload: BootstrapRestoreRequest, db: Session = Depends(ge
     except DbToolsError as exc:
         detail = str(exc) or "Restore fehlgeschlagen"
         raise HTTPException(status_code=_bootstrap_restore_error_status(detail), detail=detail) from exc
+    # Der Restore ersetzt Nutzer und Mitgliedschaften ohne ORM-Ereignisse.
+    clear_principal_cache()
 
     verify_db = SessionLocal()
     try:
         user_count = int(verify_db.query(func.count(User.id)).scalar() or 0)
+        # Aeltere Backups enthalten noch keine Saldo- und Rollup-Tabellen.
+        reconcile_points_balances(verify_db)
+        rebuild_points_daily_rollups(verify_db)
+        rebuild_achievement_user_counters(verify_db)
+        # Aeltere Backups enthalten noch keine Erinnerungstermine.
+        _rebuild_task_reminder_schedules(verify_db)
+        # Definitions-IDs koennen sich mit dem Backup geaendert haben.
+        ensure_achievement_catalog(verify_db)
+        rebuild_achievement_user_summaries(verify_db)
+        verify_db.commit()
     finally:
         verify_db.close()
 
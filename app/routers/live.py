@@ -96,7 +96,7 @@ async def stream_family_updates(
             headers={"WWW-Authenticate": "Bearer"},
         )
     with SessionLocal() as auth_db:
-        current_user: User = get_current_user_from_token_value(token, auth_db)
+        current_user: User = get_current_user_from_token_value(token, auth_db, family_id=family_id)
         get_membership_or_403(auth_db, family_id, current_user.id)
     cursor = max(since_id, _parse_last_event_id(last_event_id))
     active_channel = _active_notification_channel(family_id)
@@ -1,18 +1,26 @@
 from __future__ import annotations
 
+import csv
+import io
+import json
 from collections import defaultdict
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
+from threading import Lock
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Integer, String, and_, cast, func, literal, null, select, union_all
 from sqlalchemy.orm import Session
 
-from ..achievement_engine import evaluate_achievements_for_user
-from ..database import get_db
+from ..achievement_queue import request_achievement_evaluation
+from ..database import SessionLocal, get_db
 from ..deps import get_current_user
 from ..models import (
     FamilyMembership,
+    PointsBalance,
+    PointsDailyRollup,
     PointsLedger,
+    PointsLedgerArchive,
     PointsSourceEnum,
     RedemptionStatusEnum,
     Reward,
@@ -21,27 +29,24 @@ from ..models import (
     RoleEnum,
     User,
 )
-from ..rbac import get_membership_or_403, require_roles
+from ..rbac import find_membership, get_membership_or_403, require_roles
 from ..schemas import (
     BalanceItemOut,
     BalanceOut,
     ChildPointsStatsOut,
     LedgerEntryOut,
     PointsAdjustRequest,
+    PointsBulkAdjustRequest,
     PointsRewardRequestStatOut,
     PointsRewardSpendStatOut,
     PointsTrendBucketOut,
 )
-from ..services import emit_live_event, get_points_balance
+from ..services import add_points_ledger_entries, emit_live_event, family_ledger_version, get_points_balance
 
 router = APIRouter(tags=["points"])
-
-TREND_EARNED_SOURCES = {
-    PointsSourceEnum.task_approval,
-    PointsSourceEnum.manual_adjustment,
-    PointsSourceEnum.achievement_unlock,
-}
-TREND_SPENT_SOURCES = {PointsSourceEnum.reward_redemption, PointsSourceEnum.reward_contribution}
+LEDGER_EXPORT_BATCH_SIZE = 500
+_balance_snapshot_guard = Lock()
+_balance_snapshots: dict[int, tuple[str, list[BalanceItemOut]]] = {}
 
 
 def _family_user_name_map(db: Session, family_id: int) -> dict[int, str]:
@@ -89,28 +94,18 @@ def _safe_average(value: int, divisor: float) -> float:
     return round(float(value) / float(divisor), 2)
 
 
-def _is_earned_points_delta(delta: int, source_type: PointsSourceEnum) -> bool:
-    return delta > 0 and source_type in TREND_EARNED_SOURCES
-
-
-def _is_spent_points_delta(delta: int, source_type: PointsSourceEnum) -> bool:
-    return delta < 0 and source_type in TREND_SPENT_SOURCES
-
-
 def _build_day_trend(
-    rows: list[tuple[date, int, PointsSourceEnum]],
+    rows: list[tuple[date, int, int, int]],
     today: date,
     *,
     days: int = 14,
 ) -> list[PointsTrendBucketOut]:
     day_map: dict[date, dict[str, int]] = defaultdict(lambda: {"earned": 0, "spent": 0, "net": 0})
-    for day_value, delta, source_type in rows:
+    for day_value, earned, spent, net in rows:
         bucket = day_map[day_value]
-        bucket["net"] += int(delta)
-        if _is_earned_points_delta(delta, source_type):
-            bucket["earned"] += int(delta)
-        elif _is_spent_points_delta(delta, source_type):
-            bucket["spent"] += int(abs(delta))
+        bucket["earned"] += int(earned)
+        bucket["spent"] += int(spent)
+        bucket["net"] += int(net)
 
     start_day = today - timedelta(days=days - 1)
     result: list[PointsTrendBucketOut] = []
@@ -130,20 +125,17 @@ def _build_day_trend(
 
 
 def _build_week_trend(
-    rows: list[tuple[date, int, PointsSourceEnum]],
+    rows: list[tuple[date, int, int, int]],
     today: date,
     *,
     weeks: int = 12,
 ) -> list[PointsTrendBucketOut]:
     week_map: dict[date, dict[str, int]] = defaultdict(lambda: {"earned": 0, "spent": 0, "net": 0})
-    for day_value, delta, source_type in rows:
-        start = _week_start(day_value)
-        bucket = week_map[start]
-        bucket["net"] += int(delta)
-        if _is_earned_points_delta(delta, source_type):
-            bucket["earned"] += int(delta)
-        elif _is_spent_points_delta(delta, source_type):
-            bucket["spent"] += int(abs(delta))
+    for day_value, earned, spent, net in rows:
+        bucket = week_map[_week_start(day_value)]
+        bucket["earned"] += int(earned)
+        bucket["spent"] += int(spent)
+        bucket["net"] += int(net)
 
     current_week = _week_start(today)
     start_week = current_week - timedelta(weeks=weeks - 1)
@@ -165,20 +157,17 @@ def _build_week_trend(
 
 
 def _build_month_trend(
-    rows: list[tuple[date, int, PointsSourceEnum]],
+    rows: list[tuple[date, int, int, int]],
     today: date,
     *,
     months: int = 12,
 ) -> list[PointsTrendBucketOut]:
     month_map: dict[date, dict[str, int]] = defaultdict(lambda: {"earned": 0, "spent": 0, "net": 0})
-    for day_value, delta, source_type in rows:
-        start = _month_start(day_value)
-        bucket = month_map[start]
-        bucket["net"] += int(delta)
-        if _is_earned_points_delta(delta, source_type):
-            bucket["earned"] += int(delta)
-        elif _is_spent_points_delta(delta, source_type):
-            bucket["spent"] += int(abs(delta))
+    for day_value, earned, spent, net in rows:
+        bucket = month_map[_month_start(day_value)]
+        bucket["earned"] += int(earned)
+        bucket["spent"] += int(spent)
+        bucket["net"] += int(net)
 
     current_month = _month_start(today)
     start_month = _shift_month(current_month, -(months - 1))
@@ -212,30 +201,237 @@ def get_balance(
     return BalanceOut(family_id=family_id, user_id=user_id, balance=get_points_balance(db, family_id, user_id))
 
 
+def _to_utc_naive(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _ledger_period(
+    created_from: datetime | None,
+    created_to: datetime | None,
+) -> tuple[datetime | None, datetime | None]:
+    # created_at ist naive UTC; Angaben mit Offset werden vor Vergleich und Filter umgerechnet.
+    if created_from is not None:
+        created_from = _to_utc_naive(created_from)
+    if created_to is not None:
+        created_to = _to_utc_naive(created_to)
+    if created_from is not None and created_to is not None and created_from > created_to:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Ungültiger Zeitraum")
+    return created_from, created_to
+
+
+def _filter_ledger_query(
+    query,
+    *,
+    source_type: PointsSourceEnum | None,
+    created_from: datetime | None,
+    created_to: datetime | None,
+    model=PointsLedger,
+):
+    created_from, created_to = _ledger_period(created_from, created_to)
+    if source_type is not None:
+        query = query.filter(model.source_type == source_type)
+    if created_from is not None:
+        query = query.filter(model.created_at >= created_from)
+    if created_to is not None:
+        query = query.filter(model.created_at < created_to)
+    return query
+
+
+def _ledger_page(
+    query,
+    response: Response,
+    *,
+    before_id: int | None,
+    limit: int,
+    source_type: PointsSourceEnum | None,
+    created_from: datetime | None,
+    created_to: datetime | None,
+) -> list[PointsLedger]:
+    query = _filter_ledger_query(query, source_type=source_type, created_from=created_from, created_to=created_to)
+    if before_id is not None:
+        query = query.filter(PointsLedger.id < before_id)
+    entries = query.order_by(PointsLedger.id.desc()).limit(limit + 1).all()
+    if len(entries) > limit:
+        entries = entries[:limit]
+        response.headers["X-Next-Cursor"] = str(entries[-1].id)
+    return entries
+
+
 @router.get("/families/{family_id}/points/ledger", response_model=list[LedgerEntryOut])
 def list_ledger(
     family_id: int,
+    response: Response,
+    before_id: int | None = Query(default=None, ge=1),
+    limit: int = Query(default=200, ge=1, le=500),
+    source_type: PointsSourceEnum | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     context = get_membership_or_403(db, family_id, current_user.id)
     require_roles(context, {RoleEnum.admin, RoleEnum.parent})
 
-    entries = (
-        db.query(PointsLedger)
-        .filter(PointsLedger.family_id == family_id)
-        .order_by(PointsLedger.created_at.desc())
-        .limit(200)
-        .all()
+    entries = _ledger_page(
+        db.query(PointsLedger).filter(PointsLedger.family_id == family_id),
+        response,
+        before_id=before_id,
+        limit=limit,
+        source_type=source_type,
+        created_from=created_from,
+        created_to=created_to,
     )
     user_names = _family_user_name_map(db, family_id)
     return [_to_ledger_out(entry, user_names) for entry in entries]
 
 
+def _csv_cell(value: str) -> str:
+    # Formel-Injection in Tabellenkalkulationen verhindern.
+    if value and value[0] in "=+-@\t\r":
+        return "'" + value
+    return value
+
+
+def _iter_ledger_export(
+    family_id: int,
+    user_id: int | None,
+    export_format: str,
+    user_names: dict[int, str],
+    source_type: PointsSourceEnum | None,
+    created_from: datetime | None,
+    created_to: datetime | None,
+    include_archive: bool = False,
+):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if export_format == "csv" else None
+    if writer is not None:
+        writer.writerow(
+            ["id", "created_at", "user_id", "user_display_name", "source_type", "source_id", "points_delta", "description"]
+        )
+
+    def rows_query(export_db: Session, model):
+        query = export_db.query(
+            model.id.label("id"),
+            model.created_at.label("created_at"),
+            model.user_id.label("user_id"),
+            model.source_type.label("source_type"),
+            model.source_id.label("source_id"),
+            model.points_delta.label("points_delta"),
+            model.description.label("description"),
+        ).filter(model.family_id == family_id)
+        if user_id is not None:
+            query = query.filter(model.user_id == user_id)
+        return _filter_ledger_query(
+            query,
+            source_type=source_type,
+            created_from=created_from,
+            created_to=created_to,
+            model=model,
+        )
+
+    with SessionLocal() as export_db:
+        query = rows_query(export_db, PointsLedger)
+        if include_archive:
+            # Mit Archiv die Einzelbuchungen statt der Uebertraege liefern, sonst zaehlt alles doppelt.
+            query = query.filter(PointsLedger.source_type != PointsSourceEnum.opening_balance).union_all(
+                rows_query(export_db, PointsLedgerArchive)
+            )
+        # yield_per nutzt serverseitige Cursor, damit lange Historien nicht komplett im Speicher landen.
+        for index, row in enumerate(query.order_by(PointsLedger.id.asc()).yield_per(LEDGER_EXPORT_BATCH_SIZE), start=1):
+            source_type_value = row.source_type.value if hasattr(row.source_type, "value") else str(row.source_type)
+            display_name = user_names.get(int(row.user_id))
+            if writer is not None:
+                writer.writerow(
+                    [
+                        row.id,
+                        row.created_at.isoformat(),
+                        row.user_id,
+                        _csv_cell(display_name or ""),
+                        source_type_value,
+                        row.source_id,
+                        row.points_delta,
+                        _csv_cell(row.description),
+                    ]
+                )
+            else:
+                buffer.write(
+                    json.dumps(
+                        {
+                            "id": row.id,
+                            "created_at": row.created_at.isoformat(),
+                            "user_id": row.user_id,
+                            "user_display_name": display_name,
+                            "source_type": source_type_value,
+                            "source_id": row.source_id,
+                            "points_delta": row.points_delta,
+                            "description": row.description,
+                        },
+                        ensure_ascii=False,
+                    )
+                )
+                buffer.write("\n")
+            if index % LEDGER_EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+    chunk = buffer.getvalue()
+    if chunk:
+        yield chunk
+
+
+@router.get("/families/{family_id}/points/ledger/export")
+def export_ledger(
+    family_id: int,
+    export_format: str = Query(default="csv", alias="format", pattern="^(csv|ndjson)$"),
+    user_id: int | None = None,
+    source_type: PointsSourceEnum | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    include_archive: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    context = get_membership_or_403(db, family_id, current_user.id)
+    if context.role == RoleEnum.child:
+        if user_id is not None and user_id != current_user.id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Keine Berechtigung")
+        user_id = current_user.id
+    created_from, created_to = _ledger_period(created_from, created_to)
+
+    user_names = _family_user_name_map(db, family_id)
+    if user_id is not None and user_id not in user_names:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Nutzer nicht in der Familie")
+
+    media_type = "text/csv; charset=utf-8" if export_format == "csv" else "application/x-ndjson"
+    filename = f"homequests-punkte-{family_id}{f'-{user_id}' if user_id is not None else ''}.{export_format}"
+    return StreamingResponse(
+        _iter_ledger_export(
+            family_id,
+            user_id,
+            export_format,
+            user_names,
+            source_type,
+            created_from,
+            created_to,
+            include_archive,
+        ),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.get("/families/{family_id}/points/ledger/{user_id}", response_model=list[LedgerEntryOut])
 def list_user_ledger(
     family_id: int,
     user_id: int,
+    response: Response,
+    before_id: int | None = Query(default=None, ge=1),
+    limit: int = Query(default=200, ge=1, le=500),
+    source_type: PointsSourceEnum | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -243,70 +439,132 @@ def list_user_ledger(
     if context.role == RoleEnum.child and current_user.id != user_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Keine Berechtigung")
 
-    membership = (
-        db.query(FamilyMembership)
-        .filter(FamilyMembership.family_id == family_id, FamilyMembership.user_id == user_id)
-        .first()
-    )
-    if not membership:
+    if not find_membership(db, family_id, user_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Nutzer nicht in der Familie")
 
-    entries = (
-        db.query(PointsLedger)
-        .filter(PointsLedger.family_id == family_id, PointsLedger.user_id == user_id)
-        .order_by(PointsLedger.created_at.desc())
-        .limit(200)
-        .all()
+    entries = _ledger_page(
+        db.query(PointsLedger).filter(PointsLedger.family_id == family_id, PointsLedger.user_id == user_id),
+        response,
+        before_id=before_id,
+        limit=limit,
+        source_type=source_type,
+        created_from=created_from,
+        created_to=created_to,
     )
     user_names = _family_user_name_map(db, family_id)
     return [_to_ledger_out(entry, user_names) for entry in entries]
 
 
+def _family_balance_snapshot(db: Session, family_id: int) -> list[BalanceItemOut]:
+    version = family_ledger_version(family_id)
+    with _balance_snapshot_guard:
+        cached = _balance_snapshots.get(family_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    rows = (
+        db.query(FamilyMembership.role, User.id, User.display_name, PointsBalance.balance)
+        .join(User, User.id == FamilyMembership.user_id)
+        .outerjoin(
+            PointsBalance,
+            (PointsBalance.family_id == FamilyMembership.family_id) & (PointsBalance.user_id == User.id),
+        )
+        .filter(FamilyMembership.family_id == family_id)
+        .order_by(User.display_name.asc())
+        .all()
+    )
+    snapshot = [
+        BalanceItemOut(
+            family_id=family_id,
+            user_id=user_id,
+            display_name=display_name,
+            role=role,
+            balance=int(balance or 0),
+        )
+        for role, user_id, display_name, balance in rows
+    ]
+    # Version vor der Abfrage gelesen: spaetere Buchungen erhoehen sie und verwerfen den Snapshot.
+    with _balance_snapshot_guard:
+        _balance_snapshots[family_id] = (version, snapshot)
+    return snapshot
+
+
 @router.get("/families/{family_id}/points/balances", response_model=list[BalanceItemOut])
 def list_balances(
     family_id: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     context = get_membership_or_403(db, family_id, current_user.id)
-    memberships_and_users = (
-        db.query(FamilyMembership, User)
-        .join(User, User.id == FamilyMembership.user_id)
-        .filter(FamilyMembership.family_id == family_id)
-        .order_by(User.display_name.asc())
-        .all()
-    )
+    scope = str(current_user.id) if context.role == RoleEnum.child else "all"
+    etag = f'"balances-{family_id}-{family_ledger_version(family_id)}-{scope}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
 
+    snapshot = _family_balance_snapshot(db, family_id)
+    response.headers["ETag"] = etag
     if context.role == RoleEnum.child:
-        memberships_and_users = [item for item in memberships_and_users if item[1].id == current_user.id]
-
-    user_ids = [user.id for _, user in memberships_and_users]
-    balances_by_user: dict[int, int] = {}
-    if user_ids:
-        rows = (
-            db.query(
-                PointsLedger.user_id,
-                func.coalesce(func.sum(PointsLedger.points_delta), 0),
+        return [item for item in snapshot if item.user_id == current_user.id]
+    return snapshot
+
+
+def _reward_stats_rows(db: Session, family_id: int, user_id: int) -> list[tuple]:
+    # Anfragen, Beitraege und Punktebewegungen je Belohnung in einer Abfrage statt fuenf Roundtrips.
+    requests = (
+        select(
+            literal("request").label("kind"),
+            RewardRedemption.reward_id.label("reward_id"),
+            cast(RewardRedemption.status, String).label("status"),
+            func.count(RewardRedemption.id).label("amount"),
+        )
+        .join(Reward, Reward.id == RewardRedemption.reward_id)
+        .where(Reward.family_id == family_id, RewardRedemption.requested_by_id == user_id)
+        .group_by(RewardRedemption.reward_id, RewardRedemption.status)
+    )
+    contribution_count = select(
+        literal("contribution_count"),
+        cast(null(), Integer),
+        cast(null(), String),
+        func.count(RewardContribution.id),
+    ).where(RewardContribution.family_id == family_id, RewardContribution.user_id == user_id)
+    def reward_deltas(ledger, source_model, source_type: PointsSourceEnum):
+        return (
+            select(
+                literal("points_delta"),
+                source_model.reward_id,
+                cast(null(), String),
+                func.coalesce(func.sum(ledger.points_delta), 0),
             )
-            .filter(
-                PointsLedger.family_id == family_id,
-                PointsLedger.user_id.in_(user_ids),
+            .select_from(ledger)
+            .join(
+                source_model,
+                and_(
+                    ledger.source_type == source_type,
+                    ledger.source_id == source_model.id,
+                ),
             )
-            .group_by(PointsLedger.user_id)
-            .all()
+            .where(ledger.family_id == family_id, ledger.user_id == user_id)
+            .group_by(source_model.reward_id)
         )
-        balances_by_user = {int(user_id): int(balance or 0) for user_id, balance in rows}
 
-    return [
-        BalanceItemOut(
-            family_id=family_id,
-            user_id=user.id,
-            display_name=user.display_name,
-            role=membership.role,
-            balance=balances_by_user.get(user.id, 0),
+    # Verdichtete Buchungen liegen im Archiv und zaehlen fuer die Aufschluesselung weiter mit.
+    deltas = [
+        reward_deltas(ledger, source_model, source_type)
+        for ledger in (PointsLedger, PointsLedgerArchive)
+        for source_model, source_type in (
+            (RewardRedemption, PointsSourceEnum.reward_redemption),
+            (RewardContribution, PointsSourceEnum.reward_contribution),
         )
-        for membership, user in memberships_and_users
     ]
+    parts = union_all(requests, contribution_count, *deltas).cte("reward_stat_parts")
+    return db.execute(
+        select(parts.c.kind, parts.c.reward_id, parts.c.status, parts.c.amount, Reward.title).outerjoin(
+            Reward,
+            and_(Reward.id == parts.c.reward_id, Reward.family_id == family_id),
+        )
+    ).all()
 
 
 @router.get("/families/{family_id}/points/stats/{user_id}", response_model=ChildPointsStatsOut)
@@ -320,47 +578,48 @@ def get_points_stats(
     if context.role == RoleEnum.child and current_user.id != user_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Keine Berechtigung")
 
-    membership = (
-        db.query(FamilyMembership)
-        .filter(FamilyMembership.family_id == family_id, FamilyMembership.user_id == user_id)
-        .first()
-    )
-    if not membership:
+    if not find_membership(db, family_id, user_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Nutzer nicht in der Familie")
 
-    ledger_rows = (
+    today = datetime.utcnow().date()
+    totals = (
         db.query(
-            PointsLedger.created_at,
-            PointsLedger.points_delta,
-            PointsLedger.source_type,
+            func.min(PointsDailyRollup.day),
+            func.coalesce(func.sum(PointsDailyRollup.earned), 0),
+            func.coalesce(func.sum(PointsDailyRollup.spent), 0),
+            func.coalesce(func.sum(PointsDailyRollup.task_approvals), 0),
         )
-        .filter(PointsLedger.family_id == family_id, PointsLedger.user_id == user_id)
-        .order_by(PointsLedger.created_at.asc())
-        .all()
+        .filter(PointsDailyRollup.family_id == family_id, PointsDailyRollup.user_id == user_id)
+        .one()
     )
-
-    today = datetime.utcnow().date()
-    activity_rows: list[tuple[date, int, PointsSourceEnum]] = []
-    lifetime_earned_points = 0
-    lifetime_spent_points = 0
-    approved_tasks_count = 0
-    first_activity_day: date | None = None
-
-    for created_at, points_delta, source_type in ledger_rows:
-        day_value = created_at.date()
-        if first_activity_day is None:
-            first_activity_day = day_value
-        delta = int(points_delta or 0)
-        activity_rows.append((day_value, delta, source_type))
-        if _is_earned_points_delta(delta, source_type):
-            lifetime_earned_points += delta
-            if source_type == PointsSourceEnum.task_approval:
-                approved_tasks_count += 1
-        if _is_spent_points_delta(delta, source_type):
-            lifetime_spent_points += abs(delta)
-
-    if first_activity_day is None:
-        first_activity_day = today
+    first_activity_day = totals[0] or today
+    lifetime_earned_points = int(totals[1] or 0)
+    lifetime_spent_points = int(totals[2] or 0)
+    approved_tasks_count = int(totals[3] or 0)
+
+    # Laengstes Trendfenster sind 12 Monate, also hoechstens ~370 Tageszeilen.
+    trend_start = min(
+        today - timedelta(days=13),
+        _week_start(today) - timedelta(weeks=11),
+        _shift_month(_month_start(today), -11),
+    )
+    activity_rows = [
+        (day_value, int(earned), int(spent), int(net))
+        for day_value, earned, spent, net in (
+            db.query(
+                PointsDailyRollup.day,
+                PointsDailyRollup.earned,
+                PointsDailyRollup.spent,
+                PointsDailyRollup.net,
+            )
+            .filter(
+                PointsDailyRollup.family_id == family_id,
+                PointsDailyRollup.user_id == user_id,
+                PointsDailyRollup.day >= trend_start,
+            )
+            .all()
+        )
+    ]
 
     active_days = max((today - first_activity_day).days + 1, 1)
     average_points_per_day = _safe_average(lifetime_earned_points, float(active_days))
@@ -371,20 +630,20 @@ def get_points_stats(
     trends_weekly = _build_week_trend(activity_rows, today, weeks=12)
     trends_monthly = _build_month_trend(activity_rows, today, months=12)
 
-    reward_request_rows = (
-        db.query(
-            RewardRedemption.reward_id,
-            Reward.title,
-            RewardRedemption.status,
-            func.count(RewardRedemption.id),
-        )
-        .join(Reward, Reward.id == RewardRedemption.reward_id)
-        .filter(Reward.family_id == family_id, RewardRedemption.requested_by_id == user_id)
-        .group_by(RewardRedemption.reward_id, Reward.title, RewardRedemption.status)
-        .all()
-    )
     request_map: dict[int, dict[str, int | str]] = {}
-    for reward_id, reward_title, redemption_status, count_value in reward_request_rows:
+    reward_contribution_count = 0
+    reward_delta_by_id: dict[int, int] = defaultdict(int)
+    reward_titles: dict[int, str] = {}
+    for kind, reward_id, redemption_status, amount, reward_title in _reward_stats_rows(db, family_id, user_id):
+        amount_int = int(amount or 0)
+        if kind == "contribution_count":
+            reward_contribution_count += amount_int
+            continue
+        if reward_title is not None:
+            reward_titles[int(reward_id)] = str(reward_title)
+        if kind == "points_delta":
+            reward_delta_by_id[int(reward_id)] += amount_int
+            continue
         entry = request_map.setdefault(
             int(reward_id),
             {
@@ -395,14 +654,13 @@ def get_points_stats(
                 "rejected_count": 0,
             },
         )
-        count_int = int(count_value or 0)
-        entry["request_count"] = int(entry["request_count"]) + count_int
-        if redemption_status == RedemptionStatusEnum.approved:
-            entry["approved_count"] = int(entry["approved_count"]) + count_int
-        elif redemption_status == RedemptionStatusEnum.pending:
-            entry["pending_count"] = int(entry["pending_count"]) + count_int
-        elif redemption_status == RedemptionStatusEnum.rejected:
-            entry["rejected_count"] = int(entry["rejected_count"]) + count_int
+        entry["request_count"] = int(entry["request_count"]) + amount_int
+        if redemption_status == RedemptionStatusEnum.approved.value:
+            entry["approved_count"] = int(entry["approved_count"]) + amount_int
+        elif redemption_status == RedemptionStatusEnum.pending.value:
+            entry["pending_count"] = int(entry["pending_count"]) + amount_int
+        elif redemption_status == RedemptionStatusEnum.rejected.value:
+            entry["rejected_count"] = int(entry["rejected_count"]) + amount_int
 
     reward_request_stats = sorted(
         [
@@ -420,52 +678,6 @@ def get_points_stats(
         reverse=True,
     )
 
-    reward_contribution_count = int(
-        db.query(func.count(RewardContribution.id))
-        .filter(RewardContribution.family_id == family_id, RewardContribution.user_id == user_id)
-        .scalar()
-        or 0
-    )
-
-    reward_delta_by_id: dict[int, int] = defaultdict(int)
-    redemption_delta_rows = (
-        db.query(RewardRedemption.reward_id, func.coalesce(func.sum(PointsLedger.points_delta), 0))
-        .join(
-            PointsLedger,
-            (PointsLedger.source_type == PointsSourceEnum.reward_redemption)
-            & (PointsLedger.source_id == RewardRedemption.id),
-        )
-        .filter(PointsLedger.family_id == family_id, PointsLedger.user_id == user_id)
-        .group_by(RewardRedemption.reward_id)
-        .all()
-    )
-    for reward_id, net_delta in redemption_delta_rows:
-        reward_delta_by_id[int(reward_id)] += int(net_delta or 0)
-
-    contribution_delta_rows = (
-        db.query(RewardContribution.reward_id, func.coalesce(func.sum(PointsLedger.points_delta), 0))
-        .join(
-            PointsLedger,
-            (PointsLedger.source_type == PointsSourceEnum.reward_contribution)
-            & (PointsLedger.source_id == RewardContribution.id),
-        )
-        .filter(PointsLedger.family_id == family_id, PointsLedger.user_id == user_id)
-        .group_by(RewardContribution.reward_id)
-        .all()
-    )
-    for reward_id, net_delta in contribution_delta_rows:
-        reward_delta_by_id[int(reward_id)] += int(net_delta or 0)
-
-    reward_ids = list(reward_delta_by_id.keys())
-    reward_titles: dict[int, str] = {}
-    if reward_ids:
-        title_rows = (
-            db.query(Reward.id, Reward.title)
-            .filter(Reward.family_id == family_id, Reward.id.in_(reward_ids))
-            .all()
-        )
-        reward_titles = {int(reward_id): str(title) for reward_id, title in title_rows}
-
     spent_rows: list[tuple[int, int, str]] = []
     total_spent_for_share = 0
     for reward_id, net_delta in reward_delta_by_id.items():
@@ -549,15 +761,71 @@ def adjust_points(
         event_type="points.adjusted",
         payload={"user_id": payload.user_id, "points_delta": payload.points_delta, "entry_id": entry.id},
     )
-    evaluate_achievements_for_user(
+    request_achievement_evaluation(
         db,
         family_id=family_id,
         user_id=payload.user_id,
         triggered_by_id=current_user.id,
         reason="points_manual_adjustment",
-        emit_events=True,
     )
     db.commit()
     db.refresh(entry)
     user_names = _family_user_name_map(db, family_id)
     return _to_ledger_out(entry, user_names)
+
+
+@router.post("/families/{family_id}/points/adjust/bulk", response_model=list[LedgerEntryOut])
+def adjust_points_bulk(
+    family_id: int,
+    payload: PointsBulkAdjustRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    context = get_membership_or_403(db, family_id, current_user.id)
+    require_roles(context, {RoleEnum.admin, RoleEnum.parent})
+
+    if any(item.points_delta == 0 for item in payload.entries):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Punkte-Differenz darf nicht 0 sein")
+
+    user_names = _family_user_name_map(db, family_id)
+    if any(item.user_id not in user_names for item in payload.entries):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Nutzer nicht in der Familie")
+
+    entries = add_points_ledger_entries(
+        db,
+        [
+            {
+                "family_id": family_id,
+                "user_id": item.user_id,
+                "source_type": PointsSourceEnum.manual_adjustment,
+                "source_id": item.user_id,
+                "points_delta": item.points_delta,
+                "description": item.description,
+                "created_by_id": current_user.id,
+            }
+            for item in payload.entries
+        ],
+    )
+    user_ids = sorted({int(entry.user_id) for entry in entries})
+    emit_live_event(
+        db,
+        family_id=family_id,
+        event_type="points.adjusted",
+        payload={
+            "reason": "manual_adjustment",
+            "user_ids": user_ids,
+            "entry_ids": [int(entry.id) for entry in entries],
+            "points_delta": sum(int(entry.points_delta) for entry in entries),
+        },
+    )
+    for user_id in user_ids:
+        request_achievement_evaluation(
+            db,
+            family_id=family_id,
+            user_id=user_id,
+            triggered_by_id=current_user.id,
+            reason="points_manual_adjustment",
+        )
+    result = [_to_ledger_out(entry, user_names) for entry in entries]
+    db.commit()
+    return result
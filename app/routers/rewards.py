@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import func, or_
 from sqlalchemy.orm import Session
 
-from ..achievement_engine import evaluate_achievements_for_user
+from ..achievement_queue import request_achievement_evaluation
 from ..database import get_db
 from ..deps import get_current_user
 from ..models import (
@@ -368,6 +368,13 @@ def contribute_reward(
         event_type="reward.contribution.updated",
         payload={"reward_id": reward.id, "user_id": current_user.id, "points": payload.points},
     )
+    request_achievement_evaluation(
+        db,
+        family_id=reward.family_id,
+        user_id=current_user.id,
+        triggered_by_id=current_user.id,
+        reason="reward_contribution_reserved",
+    )
     db.commit()
     return _build_contribution_progress(db, reward)
 
@@ -436,6 +443,13 @@ def redeem_reward(
         event_type="reward.redeem_requested",
         payload={"redemption_id": redemption.id, "reward_id": reward.id, "requested_by_id": current_user.id},
     )
+    request_achievement_evaluation(
+        db,
+        family_id=reward.family_id,
+        user_id=current_user.id,
+        triggered_by_id=current_user.id,
+        reason="reward_redemption_reserved",
+    )
     db.commit()
     db.refresh(redemption)
     return {
@@ -607,14 +621,17 @@ def review_redemption(
             event_type="reward.contribution.updated",
             payload={"reward_id": reward.id, "redemption_id": redemption.id, "status": redemption.status.value},
         )
-    if redemption.status == RedemptionStatusEnum.approved:
-        evaluate_achievements_for_user(
+    # Ablehnungen erstatten Punkte, auch an Sammelbeitragende.
+    affected_user_ids = {int(redemption.requested_by_id)}
+    if redemption.status == RedemptionStatusEnum.rejected:
+        affected_user_ids.update(int(entry.user_id) for entry in linked_contributions)
+    for affected_user_id in sorted(affected_user_ids):
+        request_achievement_evaluation(
             db,
             family_id=reward.family_id,
-            user_id=redemption.requested_by_id,
+            user_id=affected_user_id,
             triggered_by_id=current_user.id,
-            reason="reward_redemption_approved",
-            emit_events=True,
+            reason=f"reward_redemption_{redemption.status.value}",
         )
     db.commit()
     db.refresh(redemption)
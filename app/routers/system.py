@@ -54,8 +54,9 @@ from ..schemas import (
     SystemTestNotificationRequest,
 )
 from ..secret_store import encrypt_secret
+from ..security import access_token_cache_stats
 from ..services import emit_live_event
-from .tasks import _run_family_task_maintenance
+from .tasks import _refresh_task_reminder_schedule, _run_family_task_maintenance
 
 router = APIRouter(tags=["system"])
 RUNTIME_BUILD_REF = datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC")
@@ -279,6 +280,7 @@ def get_system_runtime(
         app_version=app_settings.app_version,
         app_build_ref=app_settings.app_build_ref or RUNTIME_BUILD_REF,
         server_time_utc=datetime.utcnow(),
+        access_token_cache=access_token_cache_stats(),
     )
 
 
@@ -1239,6 +1241,7 @@ def send_system_practical_test_notification(
             )
             task_ids.append(task.id)
 
+        _refresh_task_reminder_schedule(db, family_id)
         db.commit()
         return SystemPracticalTestOut(
             sent=True,
@@ -2,20 +2,23 @@ from __future__ import annotations
 
 import hashlib
 import json
+from collections.abc import Iterable
 from datetime import datetime, timedelta, timezone
 from threading import Lock
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import and_, or_, text
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import and_, event, func, or_, text
 from sqlalchemy.orm import Session
 
-from ..achievement_engine import evaluate_achievements_for_user, record_task_outcome
+from ..achievement_engine import record_task_outcome
+from ..achievement_queue import request_achievement_evaluation
 from ..database import engine, get_db
 from ..deps import get_current_user
 from ..models import (
     AchievementTaskOutcomeEnum,
     ApprovalDecisionEnum,
+    Family,
     FamilyMembership,
     PointsLedger,
     PointsSourceEnum,
@@ -26,9 +29,11 @@ from ..models import (
     Task,
     TaskApproval,
     TaskGenerationBlock,
+    TaskReminderOccurrence,
     TaskStatusEnum,
     TaskSubmission,
     User,
+    WeeklyFlexibleSeriesState,
 )
 from ..rbac import get_membership_or_403, require_roles
 from ..schemas import (
@@ -45,13 +50,22 @@ from ..schemas import (
     TaskSubmitRequest,
     TaskUpdate,
 )
-from ..services import emit_live_event
+from ..services import add_points_ledger_entries, dialect_insert, emit_live_event
 
 router = APIRouter(tags=["tasks"])
 FULL_WEEKDAYS = [0, 1, 2, 3, 4, 5, 6]
+DAILY_REMINDER_OFFSETS = {15, 30, 60, 120}
 TASK_MAINTENANCE_LOCK_BASE = 870100000
+TASK_REMINDER_LOCK_BASE = 870200000
 _fallback_maintenance_lock_guard = Lock()
 _fallback_maintenance_locks: dict[int, Lock] = {}
+WEEKLY_FLEXIBLE_WATERMARK_OVERLAP = timedelta(minutes=5)
+_weekly_flexible_watermark_guard = Lock()
+_weekly_flexible_watermarks: dict[int, datetime] = {}
+WEEKLY_FLEXIBLE_WATERMARKS_KEY = "weekly_flexible_pending_watermarks"
+SPECIAL_TASK_USAGE_CACHE_TTL = timedelta(seconds=15)
+_special_usage_cache_guard = Lock()
+_special_usage_cache: dict[int, tuple[datetime, tuple, dict[int, int]]] = {}
 
 
 def _as_utc_naive(value: datetime | None) -> datetime | None:
@@ -269,6 +283,52 @@ def _special_task_usage_count(
     )
 
 
+def _special_task_usage_counts(db: Session, templates: list[SpecialTaskTemplate]) -> dict[int, int]:
+    if not templates:
+        return {}
+    template_ids_by_interval: dict[SpecialTaskIntervalEnum, list[int]] = {}
+    for template in templates:
+        template_ids_by_interval.setdefault(template.interval_type, []).append(template.id)
+    interval_starts = {interval_type: _interval_start(interval_type) for interval_type in template_ids_by_interval}
+
+    family_id = templates[0].family_id
+    cache_key = tuple(sorted((interval_type.value, start) for interval_type, start in interval_starts.items()))
+    now = datetime.utcnow()
+    with _special_usage_cache_guard:
+        cached = _special_usage_cache.get(family_id)
+    if cached is not None:
+        expires_at, cached_key, cached_counts = cached
+        if expires_at > now and cached_key == cache_key and all(template.id in cached_counts for template in templates):
+            return dict(cached_counts)
+
+    rows = (
+        db.query(Task.special_template_id, func.count(Task.id))
+        .filter(
+            or_(
+                *[
+                    and_(
+                        Task.special_template_id.in_(template_ids),
+                        Task.created_at >= interval_starts[interval_type],
+                    )
+                    for interval_type, template_ids in template_ids_by_interval.items()
+                ]
+            )
+        )
+        .group_by(Task.special_template_id)
+        .all()
+    )
+    counts = {template.id: 0 for template in templates}
+    counts.update({int(template_id): int(count) for template_id, count in rows})
+    with _special_usage_cache_guard:
+        _special_usage_cache[family_id] = (now + SPECIAL_TASK_USAGE_CACHE_TTL, cache_key, dict(counts))
+    return counts
+
+
+def _invalidate_special_task_usage(family_id: int) -> None:
+    with _special_usage_cache_guard:
+        _special_usage_cache.pop(family_id, None)
+
+
 def _special_task_limit_reached_reason(interval_type: SpecialTaskIntervalEnum) -> str:
     if interval_type == SpecialTaskIntervalEnum.daily:
         return "Tageslimit für diese Sonderaufgabe erreicht"
@@ -285,59 +345,15 @@ def _lock_special_task_claim_window(db: Session, template_id: int) -> None:
     db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": lock_key})
 
 
-def _apply_penalty_for_task(db: Session, task: Task) -> bool:
-    if not task.is_active:
-        return False
-    if task.status not in {TaskStatusEnum.open, TaskStatusEnum.rejected}:
-        return False
-    if task.recurrence_type not in {RecurrenceTypeEnum.daily.value, RecurrenceTypeEnum.weekly.value}:
-        return False
-    if not task.penalty_enabled or task.penalty_points <= 0:
-        return False
-    if not task.due_at:
-        return False
-
+def _apply_penalties_for_family(db: Session, family_id: int) -> bool:
     now = datetime.utcnow()
-    current_due = _as_utc_naive(task.due_at)
-    if not current_due:
-        return False
-
-    if current_due > now:
-        return False
-
-    last_penalty_at = _as_utc_naive(task.penalty_last_applied_at)
-    if last_penalty_at and last_penalty_at >= current_due:
-        return False
-
-    db.add(
-        PointsLedger(
-            family_id=task.family_id,
-            user_id=task.assignee_id,
-            source_type=PointsSourceEnum.task_penalty,
-            source_id=task.id,
-            points_delta=-task.penalty_points,
-            description=f"Minuspunkte (nicht erledigt): {task.title}",
-            created_by_id=None,
+    due_tasks = (
+        db.query(
+            Task.id,
+            Task.assignee_id,
+            Task.title,
+            Task.penalty_points,
         )
-    )
-    task.penalty_last_applied_at = current_due
-    emit_live_event(
-        db,
-        family_id=task.family_id,
-        event_type="points.adjusted",
-        payload={
-            "user_id": task.assignee_id,
-            "points_delta": -task.penalty_points,
-            "task_id": task.id,
-            "reason": "task_penalty",
-        },
-    )
-    return True
-
-
-def _apply_penalties_for_family(db: Session, family_id: int) -> bool:
-    tasks = (
-        db.query(Task)
         .filter(
             Task.family_id == family_id,
             Task.is_active == True,  # noqa: E712
@@ -345,15 +361,54 @@ def _apply_penalties_for_family(db: Session, family_id: int) -> bool:
             Task.penalty_enabled == True,  # noqa: E712
             Task.penalty_points > 0,
             Task.due_at.is_not(None),
+            Task.due_at <= now,
+            or_(Task.penalty_last_applied_at.is_(None), Task.penalty_last_applied_at < Task.due_at),
             Task.status.in_([TaskStatusEnum.open, TaskStatusEnum.rejected]),
         )
+        .order_by(Task.id.asc())
         .all()
     )
+    if not due_tasks:
+        return False
 
-    changed = False
-    for task in tasks:
-        changed = _apply_penalty_for_task(db, task) or changed
-    return changed
+    add_points_ledger_entries(
+        db,
+        [
+            {
+                "family_id": family_id,
+                "user_id": row.assignee_id,
+                "source_type": PointsSourceEnum.task_penalty,
+                "source_id": row.id,
+                "points_delta": -row.penalty_points,
+                "description": f"Minuspunkte (nicht erledigt): {row.title}",
+                "created_by_id": None,
+            }
+            for row in due_tasks
+        ],
+    )
+    task_ids = [int(row.id) for row in due_tasks]
+    db.query(Task).filter(Task.id.in_(task_ids)).update(
+        {Task.penalty_last_applied_at: Task.due_at},
+        synchronize_session="fetch",
+    )
+    emit_live_event(
+        db,
+        family_id=family_id,
+        event_type="points.adjusted",
+        payload={
+            "reason": "task_penalty",
+            "user_ids": sorted({int(row.assignee_id) for row in due_tasks}),
+            "task_ids": task_ids,
+            "points_delta": -sum(int(row.penalty_points) for row in due_tasks),
+            "entries": [
+                {"user_id": row.assignee_id, "task_id": row.id, "points_delta": -row.penalty_points}
+                for row in due_tasks
+            ],
+        },
+    )
+    for user_id in sorted({int(row.assignee_id) for row in due_tasks}):
+        request_achievement_evaluation(db, family_id, user_id, reason="task_penalty_applied")
+    return True
 
 
 def _task_schedule_signature(task: Task) -> tuple:
@@ -626,6 +681,126 @@ def _dedupe_recurring_tasks_for_reminders(tasks: list[Task]) -> list[Task]:
     return merged
 
 
+def _lock_family_reminder_schedule(db: Session, family_id: int) -> None:
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    # Serialisiert parallele Abgleiche derselben Familie bis zum Ende der Transaktion.
+    lock_key = TASK_REMINDER_LOCK_BASE + int(family_id)
+    db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": lock_key})
+
+
+def _refresh_task_reminder_schedule(db: Session, family_id: int, touched_tasks: Iterable[Task] | None = None) -> None:
+    db.flush()
+    _lock_family_reminder_schedule(db, family_id)
+    task_query = db.query(Task).filter(
+        Task.family_id == family_id,
+        Task.is_active == True,  # noqa: E712
+        Task.status == TaskStatusEnum.open,
+        Task.due_at.is_not(None),
+    )
+    row_query = db.query(TaskReminderOccurrence).filter(TaskReminderOccurrence.family_id == family_id)
+    if touched_tasks is not None:
+        touched_tasks = list(touched_tasks)
+        if not touched_tasks:
+            return
+        # Die Deduplizierung haengt von Geschwistern derselben Serie ab; alle Serien teilen die zugewiesene Person,
+        # daher reichen Aufgaben der betroffenen (auch der bisherigen) Personen und Serien.
+        touched_ids = {int(task.id) for task in touched_tasks}
+        assignee_ids = {int(task.assignee_id) for task in touched_tasks}
+        series_ids = {str(task.series_id) for task in touched_tasks if task.series_id}
+        assignee_ids.update(
+            int(row[0])
+            for row in db.query(TaskReminderOccurrence.assignee_id)
+            .filter(TaskReminderOccurrence.task_id.in_(touched_ids))
+            .distinct()
+        )
+        task_query = task_query.filter(
+            or_(Task.id.in_(touched_ids), Task.assignee_id.in_(assignee_ids), Task.series_id.in_(series_ids))
+        )
+
+    tasks = task_query.order_by(Task.due_at.asc()).all()
+    desired: dict[tuple[int, int], tuple[int, str, datetime, datetime]] = {}
+    for task in _dedupe_recurring_tasks_for_reminders(tasks):
+        if not task.due_at:
+            continue
+        allowed_offsets = sorted(set(task.reminder_offsets_minutes or []))
+        if task.recurrence_type == RecurrenceTypeEnum.daily.value:
+            allowed_offsets = [offset for offset in allowed_offsets if offset in DAILY_REMINDER_OFFSETS]
+        for offset in allowed_offsets:
+            desired[(task.id, offset)] = (
+                task.assignee_id,
+                task.title,
+                task.due_at,
+                task.due_at - timedelta(minutes=offset),
+            )
+
+    if touched_tasks is not None:
+        row_query = row_query.filter(TaskReminderOccurrence.task_id.in_(touched_ids | {task.id for task in tasks}))
+    existing = {
+        (row.task_id, row.reminder_offset_minutes): row
+        for row in row_query.with_entities(
+            TaskReminderOccurrence.id,
+            TaskReminderOccurrence.task_id,
+            TaskReminderOccurrence.reminder_offset_minutes,
+            TaskReminderOccurrence.assignee_id,
+            TaskReminderOccurrence.title,
+            TaskReminderOccurrence.due_at,
+            TaskReminderOccurrence.notify_at,
+        )
+    }
+
+    # Nur Abweichungen schreiben, damit unveraenderte Termine ihre IDs behalten; Upsert und Sammel-DELETE
+    # vertragen auch einen parallelen Abgleich ohne Advisory-Lock.
+    stale_ids = [row.id for key, row in existing.items() if key not in desired]
+    upserts = [
+        {
+            "family_id": family_id,
+            "task_id": task_id,
+            "reminder_offset_minutes": offset,
+            "assignee_id": assignee_id,
+            "title": title,
+            "due_at": due_at,
+            "notify_at": notify_at,
+            "created_at": datetime.utcnow(),
+        }
+        for (task_id, offset), (assignee_id, title, due_at, notify_at) in desired.items()
+        if (task_id, offset) not in existing
+        or tuple(existing[(task_id, offset)][3:]) != (assignee_id, title, due_at, notify_at)
+    ]
+    if stale_ids:
+        db.query(TaskReminderOccurrence).filter(TaskReminderOccurrence.id.in_(stale_ids)).delete(
+            synchronize_session=False
+        )
+    if upserts:
+        connection = db.connection()
+        table = TaskReminderOccurrence.__table__
+        statement = dialect_insert(connection)(table).values(upserts)
+        connection.execute(
+            statement.on_conflict_do_update(
+                index_elements=[table.c.task_id, table.c.reminder_offset_minutes],
+                set_={
+                    column: statement.excluded[column]
+                    for column in ("family_id", "assignee_id", "title", "due_at", "notify_at")
+                },
+            )
+        )
+
+
+def _rebuild_task_reminder_schedules(db: Session) -> None:
+    for (family_id,) in db.query(Family.id).all():
+        _refresh_task_reminder_schedule(db, int(family_id))
+
+
+def _parse_reminder_cursor(cursor: str) -> tuple[datetime, int]:
+    raw_notify_at, separator, raw_id = cursor.partition(",")
+    try:
+        if not separator:
+            raise ValueError(cursor)
+        return datetime.fromisoformat(raw_notify_at), int(raw_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Ungültiger Cursor") from exc
+
+
 def _existing_open_recurring_successor(db: Session, source_task: Task) -> Task | None:
     if _is_weekly_flexible_task(source_task):
         query = (
@@ -868,6 +1043,8 @@ def _run_family_task_maintenance(db: Session, family_id: int) -> bool:
         changed = _rollover_missed_tasks_for_family(db, family_id) or changed
         changed = _advance_weekly_flexible_tasks_for_family(db, family_id) or changed
         changed = _apply_penalties_for_family(db, family_id) or changed
+        if changed:
+            _refresh_task_reminder_schedule(db, family_id)
         return changed
     finally:
         _release_family_task_maintenance_lock(db, family_id)
@@ -922,141 +1099,304 @@ def _create_next_recurring_task(db: Session, source_task: Task, created_by_id: i
     return next_task
 
 
-def _advance_weekly_flexible_tasks_for_family(db: Session, family_id: int) -> bool:
-    now = datetime.utcnow()
-    now_week_start = _start_of_week(now)
-    blocked_hashes = _active_generation_block_hashes(db, family_id, now)
-    raw_tasks = (
-        db.query(Task)
-        .filter(
-            Task.family_id == family_id,
-            Task.is_active == True,  # noqa: E712
-            Task.recurrence_type == RecurrenceTypeEnum.weekly.value,
-            Task.due_at.is_(None),
-            Task.status.in_([TaskStatusEnum.open, TaskStatusEnum.rejected, TaskStatusEnum.approved]),
-        )
-        .order_by(Task.created_at.asc(), Task.id.asc())
-        .all()
-    )
-
-    grouped_by_key: dict[tuple, list[Task]] = {}
-    for task in raw_tasks:
-        grouped_by_key.setdefault(_weekly_flexible_semantic_key(task), []).append(task)
-
+def _cleanup_weekly_flexible_group(db: Session, tasks: list[Task], now: datetime) -> tuple[bool, Task | None]:
+    tasks.sort(key=lambda entry: (entry.created_at, entry.id))
     changed = False
-    latest_by_key: dict[tuple, Task] = {}
-    for key, tasks in grouped_by_key.items():
-        tasks.sort(key=lambda entry: (entry.created_at, entry.id))
 
-        cycle_has_approved: dict[datetime, bool] = {}
-        for entry in tasks:
-            if entry.is_active and entry.status == TaskStatusEnum.approved:
-                cycle_has_approved[_start_of_week(entry.created_at)] = True
+    cycle_has_approved: dict[datetime, bool] = {}
+    for entry in tasks:
+        if entry.is_active and entry.status == TaskStatusEnum.approved:
+            cycle_has_approved[_start_of_week(entry.created_at)] = True
 
-        for entry in tasks:
-            if not entry.is_active:
-                continue
-            if entry.status not in {TaskStatusEnum.open, TaskStatusEnum.rejected}:
-                continue
-            if not cycle_has_approved.get(_start_of_week(entry.created_at), False):
+    for entry in tasks:
+        if not entry.is_active:
+            continue
+        if entry.status not in {TaskStatusEnum.open, TaskStatusEnum.rejected}:
+            continue
+        if not cycle_has_approved.get(_start_of_week(entry.created_at), False):
+            continue
+        entry.is_active = False
+        db.flush()
+        emit_live_event(
+            db,
+            family_id=entry.family_id,
+            event_type="task.updated",
+            payload=_task_event_payload(entry, reason="weekly_duplicate_cleanup"),
+        )
+        changed = True
+
+    active_tasks = [entry for entry in tasks if entry.is_active]
+    if not active_tasks:
+        return changed, None
+
+    active_open_rejected = [
+        entry for entry in active_tasks if entry.status in {TaskStatusEnum.open, TaskStatusEnum.rejected}
+    ]
+    if len(active_open_rejected) >= 2:
+        keeper = max(active_open_rejected, key=lambda entry: (_as_utc_naive(entry.updated_at), entry.id))
+        for duplicate in active_open_rejected:
+            if duplicate.id == keeper.id:
                 continue
-            entry.is_active = False
+            duplicate.is_active = False
             db.flush()
             emit_live_event(
                 db,
-                family_id=entry.family_id,
+                family_id=duplicate.family_id,
                 event_type="task.updated",
-                payload=_task_event_payload(entry, reason="weekly_duplicate_cleanup"),
+                payload=_task_event_payload(duplicate, reason="weekly_duplicate_cleanup"),
             )
             changed = True
-
         active_tasks = [entry for entry in tasks if entry.is_active]
         if not active_tasks:
-            continue
-
-        active_open_rejected = [
-            entry for entry in active_tasks if entry.status in {TaskStatusEnum.open, TaskStatusEnum.rejected}
-        ]
-        if len(active_open_rejected) >= 2:
-            keeper = max(active_open_rejected, key=lambda entry: (_as_utc_naive(entry.updated_at), entry.id))
-            for duplicate in active_open_rejected:
-                if duplicate.id == keeper.id:
-                    continue
-                duplicate.is_active = False
-                db.flush()
-                emit_live_event(
-                    db,
-                    family_id=duplicate.family_id,
-                    event_type="task.updated",
-                    payload=_task_event_payload(duplicate, reason="weekly_duplicate_cleanup"),
-                )
-                changed = True
+            return changed, None
+
+    if len(active_tasks) >= 2:
+        latest = active_tasks[-1]
+        previous = active_tasks[-2]
+        same_cycle = _start_of_week(latest.created_at) == _start_of_week(previous.created_at)
+        previous_updated = _as_utc_naive(previous.updated_at) or _as_utc_naive(previous.created_at) or now
+        latest_created = _as_utc_naive(latest.created_at) or now
+        approval_gap = latest_created - previous_updated
+        if (
+            same_cycle
+            and previous.status == TaskStatusEnum.approved
+            and latest.status in {TaskStatusEnum.open, TaskStatusEnum.rejected}
+            and timedelta(0) <= approval_gap <= timedelta(minutes=10)
+        ):
+            latest.is_active = False
+            db.flush()
+            emit_live_event(
+                db,
+                family_id=latest.family_id,
+                event_type="task.updated",
+                payload=_task_event_payload(latest, reason="weekly_duplicate_cleanup"),
+            )
+            changed = True
             active_tasks = [entry for entry in tasks if entry.is_active]
             if not active_tasks:
-                continue
+                return changed, None
 
-        if len(active_tasks) >= 2:
-            latest = active_tasks[-1]
-            previous = active_tasks[-2]
-            same_cycle = _start_of_week(latest.created_at) == _start_of_week(previous.created_at)
-            previous_updated = _as_utc_naive(previous.updated_at) or _as_utc_naive(previous.created_at) or now
-            latest_created = _as_utc_naive(latest.created_at) or now
-            approval_gap = latest_created - previous_updated
-            if (
-                same_cycle
-                and previous.status == TaskStatusEnum.approved
-                and latest.status in {TaskStatusEnum.open, TaskStatusEnum.rejected}
-                and timedelta(0) <= approval_gap <= timedelta(minutes=10)
-            ):
-                latest.is_active = False
-                db.flush()
-                emit_live_event(
-                    db,
-                    family_id=latest.family_id,
-                    event_type="task.updated",
-                    payload=_task_event_payload(latest, reason="weekly_duplicate_cleanup"),
-                )
-                changed = True
-                active_tasks = [entry for entry in tasks if entry.is_active]
-                if not active_tasks:
-                    continue
+    return changed, active_tasks[-1]
 
-        latest_by_key[key] = active_tasks[-1]
 
-    for task in latest_by_key.values():
-        key_hash = _recurring_identity_hash(_weekly_flexible_semantic_key(task))
-        if key_hash and key_hash in blocked_hashes:
-            continue
-        cycle_start = _start_of_week(task.created_at)
-        if cycle_start >= now_week_start:
-            continue
+def _advance_weekly_flexible_latest(
+    db: Session,
+    task: Task,
+    blocked_hashes: set[str],
+    now_week_start: datetime,
+) -> tuple[bool, Task]:
+    key_hash = _recurring_identity_hash(_weekly_flexible_semantic_key(task))
+    if key_hash and key_hash in blocked_hashes:
+        return False, task
+    if _start_of_week(task.created_at) >= now_week_start:
+        return False, task
 
-        if task.status in {TaskStatusEnum.open, TaskStatusEnum.rejected}:
-            db.add(
-                TaskSubmission(
-                    task_id=task.id,
-                    submitted_by_id=task.assignee_id,
-                    note="Automatisch als verpasst markiert (Wochenaufgabe)",
-                )
-            )
-            task.status = TaskStatusEnum.missed_submitted
-            db.flush()
-            emit_live_event(
-                db,
-                family_id=task.family_id,
-                event_type="task.missed_reported",
-                payload={"task_id": task.id, "assignee_id": task.assignee_id, "auto": True},
+    if task.status in {TaskStatusEnum.open, TaskStatusEnum.rejected}:
+        db.add(
+            TaskSubmission(
+                task_id=task.id,
+                submitted_by_id=task.assignee_id,
+                note="Automatisch als verpasst markiert (Wochenaufgabe)",
             )
-            _create_next_recurring_task(db, task, task.created_by_id, force=True)
-            changed = True
-            continue
+        )
+        task.status = TaskStatusEnum.missed_submitted
+        db.flush()
+        emit_live_event(
+            db,
+            family_id=task.family_id,
+            event_type="task.missed_reported",
+            payload={"task_id": task.id, "assignee_id": task.assignee_id, "auto": True},
+        )
+        next_task = _create_next_recurring_task(db, task, task.created_by_id, force=True)
+        return True, next_task or task
+
+    if task.status == TaskStatusEnum.approved:
+        next_task = _create_next_recurring_task(db, task, task.created_by_id, force=True)
+        if next_task is not None:
+            return True, next_task
+
+    return False, task
+
+
+def _weekly_flexible_group_query(db: Session, family_id: int, assignee_id: int, special_template_id: int):
+    query = db.query(Task).filter(
+        Task.family_id == family_id,
+        Task.assignee_id == assignee_id,
+        Task.is_active == True,  # noqa: E712
+        Task.recurrence_type == RecurrenceTypeEnum.weekly.value,
+        Task.due_at.is_(None),
+        Task.status.in_([TaskStatusEnum.open, TaskStatusEnum.rejected, TaskStatusEnum.approved]),
+    )
+    if special_template_id:
+        return query.filter(Task.special_template_id == special_template_id)
+    return query.filter(Task.special_template_id.is_(None))
+
+
+def _load_weekly_flexible_group(
+    db: Session,
+    family_id: int,
+    key: tuple,
+    since: datetime | None,
+) -> list[Task]:
+    assignee_id, _, _, special_template_id, _ = key
+    query = _weekly_flexible_group_query(db, family_id, assignee_id, special_template_id)
+    if since is None:
+        return [task for task in query.all() if _weekly_flexible_semantic_key(task) == key]
+
+    # Offene Eintraege sind wenige; genehmigte Historie nur ab dem aeltesten relevanten Zyklus laden.
+    open_like = [
+        task
+        for task in query.filter(Task.status.in_([TaskStatusEnum.open, TaskStatusEnum.rejected])).all()
+        if _weekly_flexible_semantic_key(task) == key
+    ]
+    for task in open_like:
+        since = min(since, _start_of_week(task.created_at))
+    approved = [
+        task
+        for task in query.filter(Task.status == TaskStatusEnum.approved, Task.created_at >= since).all()
+        if _weekly_flexible_semantic_key(task) == key
+    ]
+    return open_like + approved
+
+
+def _weekly_flexible_state_key(state: WeeklyFlexibleSeriesState) -> tuple:
+    return (
+        int(state.assignee_id),
+        state.title_key,
+        RecurrenceTypeEnum.weekly.value,
+        int(state.special_template_id or 0),
+        "weekly_flexible",
+    )
+
+
+def _store_weekly_flexible_state(
+    db: Session,
+    family_id: int,
+    key_hash: str,
+    state: WeeklyFlexibleSeriesState | None,
+    latest: Task,
+) -> None:
+    if state is None:
+        state = WeeklyFlexibleSeriesState(family_id=family_id, key_hash=key_hash)
+        db.add(state)
+    state.assignee_id = latest.assignee_id
+    state.title_key = latest.title.strip().lower()
+    state.special_template_id = int(latest.special_template_id or 0)
+    state.latest_task_id = latest.id
+    state.cycle_start = _start_of_week(latest.created_at)
+    state.latest_approved = latest.status == TaskStatusEnum.approved
+
 
-        if task.status == TaskStatusEnum.approved:
-            changed = _create_next_recurring_task(db, task, task.created_by_id, force=True) is not None or changed
+def _advance_weekly_flexible_tasks_for_family(db: Session, family_id: int) -> bool:
+    now = datetime.utcnow()
+    now_week_start = _start_of_week(now)
+    blocked_hashes = _active_generation_block_hashes(db, family_id, now)
+    states = {
+        state.key_hash: state
+        for state in db.query(WeeklyFlexibleSeriesState).filter(WeeklyFlexibleSeriesState.family_id == family_id).all()
+    }
+    with _weekly_flexible_watermark_guard:
+        watermark = _weekly_flexible_watermarks.get(family_id)
+
+    changed = False
+    if watermark is None or not states:
+        # Erster Lauf (Prozessstart oder noch kein Zustand): kompletter Abgleich, danach nur noch inkrementell.
+        raw_tasks = (
+            db.query(Task)
+            .filter(
+                Task.family_id == family_id,
+                Task.is_active == True,  # noqa: E712
+                Task.recurrence_type == RecurrenceTypeEnum.weekly.value,
+                Task.due_at.is_(None),
+                Task.status.in_([TaskStatusEnum.open, TaskStatusEnum.rejected, TaskStatusEnum.approved]),
+            )
+            .all()
+        )
+        groups: dict[tuple, list[Task]] = {}
+        for task in raw_tasks:
+            groups.setdefault(_weekly_flexible_semantic_key(task), []).append(task)
+        seen_hashes: set[str] = set()
+        for key, tasks in groups.items():
+            key_hash = _recurring_identity_hash(key)
+            group_changed, latest = _cleanup_weekly_flexible_group(db, tasks, now)
+            changed = group_changed or changed
+            if latest is None:
+                continue
+            advanced, latest = _advance_weekly_flexible_latest(db, latest, blocked_hashes, now_week_start)
+            changed = advanced or changed
+            _store_weekly_flexible_state(db, family_id, key_hash, states.get(key_hash), latest)
+            seen_hashes.add(key_hash)
+        for key_hash, state in states.items():
+            if key_hash not in seen_hashes:
+                db.delete(state)
+    else:
+        # Nur Schluessel mit geaenderten Aufgaben oder abgelaufenem Wochenzyklus anfassen.
+        dirty_rows = (
+            db.query(Task)
+            .filter(
+                Task.family_id == family_id,
+                Task.recurrence_type == RecurrenceTypeEnum.weekly.value,
+                Task.due_at.is_(None),
+                Task.updated_at >= watermark - WEEKLY_FLEXIBLE_WATERMARK_OVERLAP,
+            )
+            .all()
+        )
+        pending: dict[str, tuple[tuple | None, datetime | None]] = {}
+        for task in dirty_rows:
+            key = _weekly_flexible_semantic_key(task)
+            key_hash = _recurring_identity_hash(key)
+            cycle_start = _start_of_week(task.created_at)
+            previous = pending.get(key_hash)
+            pending[key_hash] = (key, min(previous[1], cycle_start) if previous else cycle_start)
+        for key_hash, state in states.items():
+            if key_hash in pending or state.cycle_start >= now_week_start:
+                continue
+            if key_hash in blocked_hashes:
+                continue
+            pending[key_hash] = (None, None)
+
+        for key_hash, (key, since) in pending.items():
+            state = states.get(key_hash)
+            if state is not None:
+                since = min(since, state.cycle_start) if since is not None else state.cycle_start
+                if key is None:
+                    key = _weekly_flexible_state_key(state)
+
+            tasks = _load_weekly_flexible_group(db, family_id, key, since)
+            if not tasks and state is not None:
+                tasks = _load_weekly_flexible_group(db, family_id, key, None)
+            group_changed, latest = _cleanup_weekly_flexible_group(db, tasks, now)
+            changed = group_changed or changed
+            if latest is None:
+                if state is not None:
+                    db.delete(state)
+                continue
+            advanced, latest = _advance_weekly_flexible_latest(db, latest, blocked_hashes, now_week_start)
+            changed = advanced or changed
+            _store_weekly_flexible_state(db, family_id, key_hash, state, latest)
 
+    db.flush()
+    # Erst nach dem Commit veroeffentlichen, sonst ueberspringt der naechste Lauf nicht gespeicherte Zeilen.
+    db.info.setdefault(WEEKLY_FLEXIBLE_WATERMARKS_KEY, {})[family_id] = now
     return changed
 
 
+@event.listens_for(Session, "after_commit")
+def _publish_weekly_flexible_watermarks(session: Session) -> None:
+    watermarks = session.info.pop(WEEKLY_FLEXIBLE_WATERMARKS_KEY, None)
+    if not watermarks:
+        return
+    with _weekly_flexible_watermark_guard:
+        _weekly_flexible_watermarks.update(watermarks)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_weekly_flexible_watermarks(session: Session, previous_transaction) -> None:
+    if previous_transaction.nested:
+        return
+    session.info.pop(WEEKLY_FLEXIBLE_WATERMARKS_KEY, None)
+
+
 @router.get("/families/{family_id}/tasks", response_model=list[TaskOut])
 def list_tasks(
     family_id: int,
@@ -1082,8 +1422,12 @@ def list_tasks(
 @router.get("/families/{family_id}/tasks/reminders/upcoming", response_model=list[TaskReminderOut])
 def list_upcoming_task_reminders(
     family_id: int,
+    request: Request,
+    response: Response,
     assignee_id: int | None = None,
     window_minutes: int = Query(default=2880, ge=1, le=10080),
+    cursor: str | None = None,
+    limit: int = Query(default=500, ge=1, le=1000),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -1095,44 +1439,56 @@ def list_upcoming_task_reminders(
         if target_assignee_id is not None:
             _ensure_assignee_in_family(db, family_id, target_assignee_id)
 
-    query = (
-        db.query(Task)
-        .filter(
-            Task.family_id == family_id,
-            Task.is_active == True,  # noqa: E712
-            Task.status == TaskStatusEnum.open,
-            Task.due_at.is_not(None),
-        )
-        .order_by(Task.due_at.asc())
-    )
-    if target_assignee_id is not None:
-        query = query.filter(Task.assignee_id == target_assignee_id)
-
     now = datetime.utcnow()
     window_end = now + timedelta(minutes=window_minutes)
-    reminders: list[TaskReminderOut] = []
-    reminder_tasks = _dedupe_recurring_tasks_for_reminders(query.all())
-    for task in reminder_tasks:
-        if not task.due_at:
-            continue
-        allowed_offsets = sorted(set(task.reminder_offsets_minutes or []))
-        if task.recurrence_type == RecurrenceTypeEnum.daily.value:
-            allowed_offsets = [offset for offset in allowed_offsets if offset in {15, 30, 60, 120}]
-        for offset in allowed_offsets:
-            notify_at = task.due_at - timedelta(minutes=offset)
-            if now <= notify_at <= window_end:
-                reminders.append(
-                    TaskReminderOut(
-                        task_id=task.id,
-                        title=task.title,
-                        assignee_id=task.assignee_id,
-                        due_at=task.due_at,
-                        reminder_offset_minutes=offset,
-                        notify_at=notify_at,
-                    )
-                )
-
-    reminders.sort(key=lambda entry: entry.notify_at)
+    query = db.query(TaskReminderOccurrence).filter(
+        TaskReminderOccurrence.family_id == family_id,
+        TaskReminderOccurrence.notify_at >= now,
+        TaskReminderOccurrence.notify_at <= window_end,
+    )
+    if target_assignee_id is not None:
+        query = query.filter(TaskReminderOccurrence.assignee_id == target_assignee_id)
+    if cursor:
+        cursor_notify_at, cursor_id = _parse_reminder_cursor(cursor)
+        query = query.filter(
+            or_(
+                TaskReminderOccurrence.notify_at > cursor_notify_at,
+                and_(
+                    TaskReminderOccurrence.notify_at == cursor_notify_at,
+                    TaskReminderOccurrence.id > cursor_id,
+                ),
+            )
+        )
+    rows = query.order_by(TaskReminderOccurrence.notify_at.asc(), TaskReminderOccurrence.id.asc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = f"{rows[-1].notify_at.isoformat()},{rows[-1].id}"
+
+    reminders = [
+        TaskReminderOut(
+            task_id=row.task_id,
+            title=row.title,
+            assignee_id=row.assignee_id,
+            due_at=row.due_at,
+            reminder_offset_minutes=row.reminder_offset_minutes,
+            notify_at=row.notify_at,
+        )
+        for row in rows
+    ]
+    digest = hashlib.sha256()
+    digest.update((next_cursor or "").encode("utf-8"))
+    for entry in reminders:
+        digest.update(entry.model_dump_json().encode("utf-8"))
+    etag = f'"{digest.hexdigest()}"'
+
+    headers = {"ETag": etag}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
     return reminders
 
 
@@ -1179,6 +1535,7 @@ def create_task(
         event_type="task.created",
         payload=_task_event_payload(task, reason="manual_create"),
     )
+    _refresh_task_reminder_schedule(db, family_id, [task])
     db.commit()
     db.refresh(task)
     return task
@@ -1334,14 +1691,14 @@ def update_task(
         payload=_task_event_payload(task, reason="manual_edit"),
     )
     if old_status != TaskStatusEnum.approved and task.status == TaskStatusEnum.approved:
-        evaluate_achievements_for_user(
+        request_achievement_evaluation(
             db,
             family_id=task.family_id,
             user_id=task.assignee_id,
             triggered_by_id=current_user.id,
             reason="task_approved_manual",
-            emit_events=True,
         )
+    _refresh_task_reminder_schedule(db, task.family_id, [task])
     db.commit()
     db.refresh(task)
     return task
@@ -1428,6 +1785,7 @@ def update_special_task_template(
         payload={"template_id": template.id},
     )
     db.commit()
+    _invalidate_special_task_usage(template.family_id)
     db.refresh(template)
     return template
 
@@ -1477,8 +1835,9 @@ def list_available_special_tasks(
 
     result: list[SpecialTaskAvailabilityOut] = []
     now = datetime.utcnow()
+    usage_counts = _special_task_usage_counts(db, templates)
     for template in templates:
-        used = _special_task_usage_count(db, template.id, template.interval_type)
+        used = usage_counts.get(template.id, 0)
         remaining = max(template.max_claims_per_interval - used, 0)
         available_now, unavailable_reason = _special_task_is_available_now(template, now)
         if remaining <= 0:
@@ -1569,6 +1928,7 @@ def claim_special_task(
         payload=_task_event_payload(task, source="special_task", reason="special_claim"),
     )
     db.commit()
+    _invalidate_special_task_usage(template.family_id)
     db.refresh(task)
     return task
 
@@ -1609,6 +1969,7 @@ def unclaim_special_task(
         },
     )
     db.commit()
+    _invalidate_special_task_usage(family_id_value)
     return {
         "deleted": True,
         "task_id": task_id_value,
@@ -1640,7 +2001,9 @@ def delete_task(
         event_type="task.deleted",
         payload={"task_id": task_id_value},
     )
+    _refresh_task_reminder_schedule(db, family_id_value, [task])
     db.commit()
+    _invalidate_special_task_usage(family_id_value)
     return {"deleted": True}
 
 
@@ -1688,6 +2051,7 @@ def delete_task_instance(
             "next_task_id": next_task.id if next_task else None,
         },
     )
+    _refresh_task_reminder_schedule(db, family_id_value, [task])
     db.commit()
     return {"deleted": True, "instance_only": True, "next_task_id": next_task.id if next_task else None}
 
@@ -1757,6 +2121,7 @@ def submit_task(
         event_type="task.submitted",
         payload={"task_id": task.id, "assignee_id": task.assignee_id},
     )
+    _refresh_task_reminder_schedule(db, task.family_id, [task])
     db.commit()
     db.refresh(task)
     return task
@@ -1797,6 +2162,7 @@ def report_task_missed(
         event_type="task.missed_reported",
         payload={"task_id": task.id, "assignee_id": task.assignee_id},
     )
+    _refresh_task_reminder_schedule(db, task.family_id, [task])
     db.commit()
     db.refresh(task)
     return task
@@ -1875,14 +2241,14 @@ def review_task(
         payload={"task_id": task.id, "status": task.status.value, "assignee_id": task.assignee_id},
     )
     if payload.decision == ApprovalDecisionEnum.approved:
-        evaluate_achievements_for_user(
+        request_achievement_evaluation(
             db,
             family_id=task.family_id,
             user_id=task.assignee_id,
             triggered_by_id=current_user.id,
             reason="task_approved_review",
-            emit_events=True,
         )
+    _refresh_task_reminder_schedule(db, task.family_id, [task])
     db.commit()
     db.refresh(task)
     return task
@@ -1963,14 +2329,14 @@ def review_missed_task(
             event_type="task.reviewed",
             payload={"task_id": task.id, "status": task.status.value, "assignee_id": task.assignee_id},
         )
-        evaluate_achievements_for_user(
+        request_achievement_evaluation(
             db,
             family_id=task.family_id,
             user_id=task.assignee_id,
             triggered_by_id=current_user.id,
             reason="task_approved_missed_review",
-            emit_events=True,
         )
+        _refresh_task_reminder_schedule(db, task.family_id, [task])
         db.commit()
         db.refresh(task)
         return {"deleted": False, "penalty_applied": 0, "approved": True, "task_id": task.id}
@@ -2021,14 +2387,14 @@ def review_missed_task(
         event_type="task.deleted",
         payload={"task_id": task_id_value, "assignee_id": assignee_id_value},
     )
-    evaluate_achievements_for_user(
+    request_achievement_evaluation(
         db,
         family_id=family_id_value,
         user_id=assignee_id_value,
         triggered_by_id=current_user.id,
         reason="task_missed_review",
-        emit_events=True,
     )
+    _refresh_task_reminder_schedule(db, family_id_value, [task])
     db.commit()
     return {"deleted": True, "penalty_applied": deduction}
 
@@ -2070,6 +2436,7 @@ def set_task_active(
         event_type="task.updated",
         payload=_task_event_payload(task, reason="active_toggle"),
     )
+    _refresh_task_reminder_schedule(db, task.family_id, [task])
     db.commit()
     db.refresh(task)
     return task
@@ -621,6 +621,10 @@ class PointsAdjustRequest(BaseModel):
     description: str = Field(min_length=2, max_length=255)
 
 
+class PointsBulkAdjustRequest(BaseModel):
+    entries: list[PointsAdjustRequest] = Field(min_length=1, max_length=200)
+
+
 class SpecialTaskTemplateCreate(BaseModel):
     title: str = Field(min_length=2, max_length=180)
     description: str | None = None
@@ -748,11 +752,18 @@ class SystemTestNotificationOut(BaseModel):
     home_assistant_delivery: dict[str, object] | None = None
 
 
+class SystemCacheStatsOut(BaseModel):
+    hits: int = 0
+    misses: int = 0
+    size: int = 0
+
+
 class SystemRuntimeOut(BaseModel):
     app_name: str
     app_version: str
     app_build_ref: str | None = None
     server_time_utc: datetime
+    access_token_cache: SystemCacheStatsOut | None = None
 
 
 class SystemEventOut(BaseModel):
@@ -1061,6 +1072,24 @@ class AchievementCalibrationOut(BaseModel):
     updated_at: datetime | None = None
 
 
+class AchievementMemberSummaryOut(BaseModel):
+    user_id: int
+    display_name: str
+    role: RoleEnum
+    unlocked_count: int
+    unlocked_by_difficulty: dict[AchievementDifficultyEnum, int] = Field(default_factory=dict)
+    profile_claimable_count: int = 0
+    reward_claimable_count: int = 0
+    last_unlocked_at: datetime | None = None
+    updated_at: datetime | None = None
+
+
+class AchievementFamilySummaryOut(BaseModel):
+    family_id: int
+    total_count: int
+    members: list[AchievementMemberSummaryOut]
+
+
 class AchievementOverviewOut(BaseModel):
     family_id: int
     user_id: int
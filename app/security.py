@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
+import hashlib
+from threading import Lock
+import time
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -10,6 +14,12 @@ from .config import settings
 # bcrypt_sha256 hasht zuerst mit SHA-256 und umgeht damit die 72-Byte-Grenze von bcrypt.
 pwd_context = CryptContext(schemes=["bcrypt_sha256"], deprecated="auto")
 
+_token_cache_guard = Lock()
+# Digest -> (exp als Unix-Zeit, Claims); Reihenfolge = zuletzt benutzt am Ende.
+_token_cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+_token_cache_hits = 0
+_token_cache_misses = 0
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -27,6 +37,49 @@ def create_access_token(subject: str) -> str:
 
 
 def decode_access_token(token: str) -> dict:
+    global _token_cache_hits, _token_cache_misses
+    max_size = settings.access_token_cache_size
+    if max_size <= 0:
+        return _decode_access_token_uncached(token)
+
+    digest = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    now = time.time()
+    with _token_cache_guard:
+        cached = _token_cache.get(digest)
+        if cached is not None and cached[0] > now:
+            _token_cache.move_to_end(digest)
+            _token_cache_hits += 1
+            return dict(cached[1])
+        if cached is not None:
+            del _token_cache[digest]
+        _token_cache_misses += 1
+
+    payload = _decode_access_token_uncached(token)
+    expires_at = payload.get("exp")
+    # Nur Tokens mit Ablaufzeit merken; ungueltige Tokens landen nie im Cache.
+    if isinstance(expires_at, (int, float)):
+        with _token_cache_guard:
+            _token_cache[digest] = (float(expires_at), dict(payload))
+            _token_cache.move_to_end(digest)
+            while len(_token_cache) > max_size:
+                _token_cache.popitem(last=False)
+    return payload
+
+
+def access_token_cache_stats() -> dict[str, int]:
+    with _token_cache_guard:
+        return {"hits": _token_cache_hits, "misses": _token_cache_misses, "size": len(_token_cache)}
+
+
+def clear_access_token_cache() -> None:
+    global _token_cache_hits, _token_cache_misses
+    with _token_cache_guard:
+        _token_cache.clear()
+        _token_cache_hits = 0
+        _token_cache_misses = 0
+
+
+def _decode_access_token_uncached(token: str) -> dict:
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
         return payload
@@ -2,28 +2,355 @@ from __future__ import annotations
 
 import json
 import logging
+import secrets
+from datetime import date, datetime
+from threading import Lock
 
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, case, event, func, insert, select, union_all
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, object_session
 
 from .live_bus import live_event_bus
-from .models import LiveUpdateEvent, PointsLedger
+from .models import (
+    FamilyMembership,
+    LiveUpdateEvent,
+    PointsBalance,
+    PointsDailyRollup,
+    PointsLedger,
+    PointsLedgerArchive,
+    PointsSourceEnum,
+    User,
+)
 from .notification_dispatcher import enqueue_remote_dispatch_job
 
 MAX_LIVE_EVENTS_PER_FAMILY = 5000
 LIVE_EVENT_TRIM_BATCH_SIZE = 500
+BALANCE_EARNED_SOURCES = {PointsSourceEnum.task_approval, PointsSourceEnum.manual_adjustment}
+BALANCE_SPENT_SOURCES = {PointsSourceEnum.reward_redemption, PointsSourceEnum.reward_contribution}
+TREND_EARNED_SOURCES = {
+    PointsSourceEnum.task_approval,
+    PointsSourceEnum.manual_adjustment,
+    PointsSourceEnum.achievement_unlock,
+}
+TREND_SPENT_SOURCES = {PointsSourceEnum.reward_redemption, PointsSourceEnum.reward_contribution}
+LEDGER_DIRTY_FAMILIES_KEY = "points_ledger_dirty_families"
 logger = logging.getLogger(__name__)
+_ledger_version_guard = Lock()
+# Prozess-Token, damit Versionen nach einem Neustart nicht mit alten ETags kollidieren.
+_ledger_version_boot = secrets.token_hex(4)
+_ledger_version_epoch = 0
+_family_ledger_versions: dict[int, int] = {}
+
+
+def family_ledger_version(family_id: int) -> str:
+    with _ledger_version_guard:
+        return f"{_ledger_version_boot}.{_ledger_version_epoch}.{_family_ledger_versions.get(family_id, 0)}"
+
+
+def mark_family_ledger_dirty(db: Session | None, family_id: int | None) -> None:
+    if db is None:
+        return
+    # family_id None steht fuer "alle Familien" (z. B. geaenderter Anzeigename).
+    db.info.setdefault(LEDGER_DIRTY_FAMILIES_KEY, set()).add(family_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_family_ledger_versions(session: Session) -> None:
+    global _ledger_version_epoch
+    dirty = session.info.pop(LEDGER_DIRTY_FAMILIES_KEY, None)
+    if not dirty:
+        return
+    with _ledger_version_guard:
+        if None in dirty:
+            _ledger_version_epoch += 1
+        for family_id in dirty:
+            if family_id is not None:
+                _family_ledger_versions[family_id] = _family_ledger_versions.get(family_id, 0) + 1
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_family_ledger_marks(session: Session, previous_transaction) -> None:
+    if previous_transaction.nested:
+        return
+    session.info.pop(LEDGER_DIRTY_FAMILIES_KEY, None)
+
+
+@event.listens_for(FamilyMembership, "after_insert")
+@event.listens_for(FamilyMembership, "after_update")
+@event.listens_for(FamilyMembership, "after_delete")
+def _membership_changed(_mapper, _connection, target: FamilyMembership) -> None:
+    mark_family_ledger_dirty(object_session(target), int(target.family_id))
+
+
+@event.listens_for(User, "after_update")
+def _user_changed(_mapper, _connection, target: User) -> None:
+    mark_family_ledger_dirty(object_session(target), None)
 
 
 def get_points_balance(db: Session, family_id: int, user_id: int) -> int:
     result = (
-        db.query(func.coalesce(func.sum(PointsLedger.points_delta), 0))
-        .filter(PointsLedger.family_id == family_id, PointsLedger.user_id == user_id)
+        db.query(PointsBalance.balance)
+        .filter(PointsBalance.family_id == family_id, PointsBalance.user_id == user_id)
         .scalar()
     )
     return int(result or 0)
 
 
+def add_points_ledger_entries(db: Session, entries: list[dict]) -> list[PointsLedger]:
+    if not entries:
+        return []
+    # Ein mehrzeiliges INSERT statt einzelner Flushes pro Buchung.
+    rows = list(
+        db.scalars(
+            insert(PointsLedger).returning(PointsLedger, sort_by_parameter_order=True),
+            entries,
+        ).all()
+    )
+    # Bulk-INSERTs loesen keine Mapper-Events aus, daher Salden hier direkt nachziehen.
+    _apply_points_ledger_aggregates(
+        db.connection(),
+        [(row.family_id, row.user_id, row.source_type, row.points_delta, row.created_at) for row in rows],
+    )
+    for family_id in {int(row.family_id) for row in rows}:
+        mark_family_ledger_dirty(db, family_id)
+    return rows
+
+
+def _balance_source(source_type) -> PointsSourceEnum | None:
+    try:
+        return PointsSourceEnum(source_type)
+    except ValueError:
+        return None
+
+
+def _apply_points_ledger_aggregates(connection, rows: list[tuple[int, int, object, int, datetime | None]]) -> None:
+    # Uebertraege aus der Verdichtung sind in Salden und Rollups bereits enthalten.
+    rows = [row for row in rows if _balance_source(row[2]) != PointsSourceEnum.opening_balance]
+    _apply_points_balance_deltas(connection, rows)
+    _apply_points_daily_rollup_deltas(connection, rows)
+
+
+def dialect_insert(connection):
+    return postgresql_insert if connection.dialect.name == "postgresql" else sqlite_insert
+
+
+def _apply_points_balance_deltas(connection, rows: list[tuple[int, int, object, int, datetime | None]]) -> None:
+    totals: dict[tuple[int, int], list[int]] = {}
+    for family_id, user_id, source_type, points_delta, _created_at in rows:
+        delta = int(points_delta or 0)
+        source = _balance_source(source_type)
+        bucket = totals.setdefault((int(family_id), int(user_id)), [0, 0, 0])
+        bucket[0] += delta
+        if delta > 0 and source in BALANCE_EARNED_SOURCES:
+            bucket[1] += delta
+        if delta < 0 and source in BALANCE_SPENT_SOURCES:
+            bucket[2] += abs(delta)
+    if not totals:
+        return
+
+    insert_statement = dialect_insert(connection)
+    table = PointsBalance.__table__
+    now = datetime.utcnow()
+    for (family_id, user_id), (balance, earned, spent) in sorted(totals.items()):
+        statement = insert_statement(table).values(
+            family_id=family_id,
+            user_id=user_id,
+            balance=balance,
+            earned_total=earned,
+            spent_total=spent,
+            version=1,
+            updated_at=now,
+        )
+        # Atomar am bestehenden Saldo addieren, damit parallele Buchungen sich nicht ueberschreiben.
+        connection.execute(
+            statement.on_conflict_do_update(
+                index_elements=[table.c.family_id, table.c.user_id],
+                set_={
+                    "balance": table.c.balance + statement.excluded.balance,
+                    "earned_total": table.c.earned_total + statement.excluded.earned_total,
+                    "spent_total": table.c.spent_total + statement.excluded.spent_total,
+                    "version": table.c.version + 1,
+                    "updated_at": statement.excluded.updated_at,
+                },
+            )
+        )
+
+
+def _apply_points_daily_rollup_deltas(connection, rows: list[tuple[int, int, object, int, datetime | None]]) -> None:
+    totals: dict[tuple[int, int, date], list[int]] = {}
+    for family_id, user_id, source_type, points_delta, created_at in rows:
+        delta = int(points_delta or 0)
+        source = _balance_source(source_type)
+        day_value = (created_at or datetime.utcnow()).date()
+        bucket = totals.setdefault((int(family_id), int(user_id), day_value), [0, 0, 0, 0])
+        bucket[2] += delta
+        if delta > 0 and source in TREND_EARNED_SOURCES:
+            bucket[0] += delta
+            if source == PointsSourceEnum.task_approval:
+                bucket[3] += 1
+        if delta < 0 and source in TREND_SPENT_SOURCES:
+            bucket[1] += abs(delta)
+    if not totals:
+        return
+
+    insert_statement = dialect_insert(connection)
+    table = PointsDailyRollup.__table__
+    now = datetime.utcnow()
+    for (family_id, user_id, day_value), (earned, spent, net, task_approvals) in sorted(totals.items()):
+        statement = insert_statement(table).values(
+            family_id=family_id,
+            user_id=user_id,
+            day=day_value,
+            earned=earned,
+            spent=spent,
+            net=net,
+            task_approvals=task_approvals,
+            updated_at=now,
+        )
+        connection.execute(
+            statement.on_conflict_do_update(
+                index_elements=[table.c.family_id, table.c.user_id, table.c.day],
+                set_={
+                    "earned": table.c.earned + statement.excluded.earned,
+                    "spent": table.c.spent + statement.excluded.spent,
+                    "net": table.c.net + statement.excluded.net,
+                    "task_approvals": table.c.task_approvals + statement.excluded.task_approvals,
+                    "updated_at": statement.excluded.updated_at,
+                },
+            )
+        )
+
+
+@event.listens_for(PointsLedger, "after_insert")
+def _points_ledger_after_insert(_mapper, connection, target: PointsLedger) -> None:
+    _apply_points_ledger_aggregates(
+        connection,
+        [(target.family_id, target.user_id, target.source_type, target.points_delta, target.created_at)],
+    )
+    mark_family_ledger_dirty(object_session(target), int(target.family_id))
+
+
+def points_ledger_detail_rows():
+    # Einzelbuchungen aus aktiver Tabelle und Archiv; Uebertraege fassen nur archivierte Zeilen zusammen.
+    hot = select(
+        PointsLedger.family_id,
+        PointsLedger.user_id,
+        PointsLedger.source_type,
+        PointsLedger.points_delta,
+        PointsLedger.created_at,
+    ).where(PointsLedger.source_type != PointsSourceEnum.opening_balance)
+    archived = select(
+        PointsLedgerArchive.family_id,
+        PointsLedgerArchive.user_id,
+        PointsLedgerArchive.source_type,
+        PointsLedgerArchive.points_delta,
+        PointsLedgerArchive.created_at,
+    )
+    return union_all(hot, archived).subquery("points_ledger_detail")
+
+
+def _expected_points_balances_query(db: Session, family_id: int | None = None, user_id: int | None = None):
+    detail = points_ledger_detail_rows()
+    query = db.query(
+        detail.c.family_id,
+        detail.c.user_id,
+        func.coalesce(func.sum(detail.c.points_delta), 0),
+        func.coalesce(
+            func.sum(
+                case(
+                    (
+                        and_(
+                            detail.c.source_type.in_(list(BALANCE_EARNED_SOURCES)),
+                            detail.c.points_delta > 0,
+                        ),
+                        detail.c.points_delta,
+                    ),
+                    else_=0,
+                )
+            ),
+            0,
+        ),
+        func.coalesce(
+            func.sum(
+                case(
+                    (
+                        and_(
+                            detail.c.source_type.in_(list(BALANCE_SPENT_SOURCES)),
+                            detail.c.points_delta < 0,
+                        ),
+                        -detail.c.points_delta,
+                    ),
+                    else_=0,
+                )
+            ),
+            0,
+        ),
+    )
+    if family_id is not None:
+        query = query.filter(detail.c.family_id == family_id)
+    if user_id is not None:
+        query = query.filter(detail.c.user_id == user_id)
+    return query.group_by(detail.c.family_id, detail.c.user_id)
+
+
+def expected_points_balances(db: Session, family_id: int | None = None) -> dict[tuple[int, int], tuple[int, int, int]]:
+    return {
+        (int(row[0]), int(row[1])): (int(row[2] or 0), int(row[3] or 0), int(row[4] or 0))
+        for row in _expected_points_balances_query(db, family_id).all()
+    }
+
+
+def reconcile_points_balances(db: Session, family_id: int | None = None) -> int:
+    db.flush()
+    balance_query = db.query(PointsBalance)
+    if family_id is not None:
+        balance_query = balance_query.filter(PointsBalance.family_id == family_id)
+
+    expected = expected_points_balances(db, family_id)
+    stored = {
+        (int(row.family_id), int(row.user_id)): (int(row.balance), int(row.earned_total), int(row.spent_total))
+        for row in balance_query.all()
+    }
+    drifted = sorted(
+        key for key in set(expected) | set(stored) if expected.get(key, (0, 0, 0)) != stored.get(key, (0, 0, 0))
+    )
+    if not drifted:
+        return 0
+
+    corrected = 0
+    for drift_family_id, drift_user_id in drifted:
+        # Zeile sperren und erst danach neu aggregieren, damit parallele Buchungen nicht verloren gehen.
+        row = (
+            db.query(PointsBalance)
+            .filter(PointsBalance.family_id == drift_family_id, PointsBalance.user_id == drift_user_id)
+            .with_for_update()
+            .first()
+        )
+        fresh = _expected_points_balances_query(db, drift_family_id, drift_user_id).first()
+        balance, earned, spent = (int(fresh[2] or 0), int(fresh[3] or 0), int(fresh[4] or 0)) if fresh else (0, 0, 0)
+        if row is None:
+            row = PointsBalance(family_id=drift_family_id, user_id=drift_user_id, version=0)
+            db.add(row)
+        elif (row.balance, row.earned_total, row.spent_total) == (balance, earned, spent):
+            continue
+        logger.warning(
+            "Punktesaldo korrigiert (family_id=%s, user_id=%s): %s -> %s",
+            drift_family_id,
+            drift_user_id,
+            row.balance,
+            balance,
+        )
+        row.balance = balance
+        row.earned_total = earned
+        row.spent_total = spent
+        row.version = int(row.version or 0) + 1
+        mark_family_ledger_dirty(db, drift_family_id)
+        corrected += 1
+    db.flush()
+    return corrected
+
+
 def emit_live_event(
     db: Session,
     family_id: int,
@@ -87,3 +414,50 @@ def parse_live_payload(payload_json: str | None) -> dict:
     except json.JSONDecodeError:
         return {}
     return payload if isinstance(payload, dict) else {}
+
+
+def rebuild_points_daily_rollups(db: Session) -> None:
+    detail = points_ledger_detail_rows()
+    day_expr = func.date(detail.c.created_at)
+    earned_expr = case(
+        (
+            and_(detail.c.source_type.in_(list(TREND_EARNED_SOURCES)), detail.c.points_delta > 0),
+            detail.c.points_delta,
+        ),
+        else_=0,
+    )
+    spent_expr = case(
+        (
+            and_(detail.c.source_type.in_(list(TREND_SPENT_SOURCES)), detail.c.points_delta < 0),
+            -detail.c.points_delta,
+        ),
+        else_=0,
+    )
+    approvals_expr = case(
+        (
+            and_(detail.c.source_type == PointsSourceEnum.task_approval, detail.c.points_delta > 0),
+            1,
+        ),
+        else_=0,
+    )
+    aggregate = (
+        db.query(
+            detail.c.family_id,
+            detail.c.user_id,
+            day_expr,
+            func.sum(earned_expr),
+            func.sum(spent_expr),
+            func.sum(detail.c.points_delta),
+            func.sum(approvals_expr),
+            func.max(detail.c.created_at),
+        )
+        .group_by(detail.c.family_id, detail.c.user_id, day_expr)
+        .statement
+    )
+    db.query(PointsDailyRollup).delete(synchronize_session=False)
+    db.execute(
+        insert(PointsDailyRollup).from_select(
+            ["family_id", "user_id", "day", "earned", "spent", "net", "task_approvals", "updated_at"],
+            aggregate,
+        )
+    )
@@ -860,6 +860,7 @@ function pointsSourceLabel(sourceType) {
     task_penalty: "Minuspunkte Aufgabe",
     manual_adjustment: "Manuelle Anpassung",
     achievement_unlock: "Erfolgs-Belohnung",
+    opening_balance: "Übertrag",
   };
   return map[sourceType] || sourceType;
 }
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@contextmanager
+def capture_statements(engine: Engine, *, with_parameters: bool = False) -> Iterator[list]:
+    # Sammelt alle SQL-Anweisungen des Blocks; mit with_parameters als (statement, parameters).
+    captured: list = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, tuple(parameters or ())) if with_parameters else statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+def is_task_select(statement: str) -> bool:
+    return statement.lstrip().upper().startswith("SELECT") and "FROM tasks" in statement
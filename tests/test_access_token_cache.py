@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import time
+import unittest
+from unittest.mock import patch
+
+from app import security
+from app.config import settings
+from app.security import access_token_cache_stats, clear_access_token_cache, create_access_token, decode_access_token
+
+
+class AccessTokenCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_access_token_cache()
+        self.addCleanup(clear_access_token_cache)
+
+    def test_token_is_verified_once_until_it_expires(self) -> None:
+        token = create_access_token("7")
+        with patch.object(security.jwt, "decode", wraps=security.jwt.decode) as decode:
+            for _ in range(5):
+                self.assertEqual(decode_access_token(token)["sub"], "7")
+            self.assertEqual(decode.call_count, 1)
+
+            # Mutationen am Ergebnis duerfen den Cache nicht veraendern.
+            decode_access_token(token)["sub"] = "8"
+            self.assertEqual(decode_access_token(token)["sub"], "7")
+
+            # Nach exp wird wieder voll geprueft (jose entscheidet dann ueber den Ablauf).
+            expired_at = time.time() + settings.access_token_expire_minutes * 60 + 1
+            with patch.object(security.time, "time", return_value=expired_at):
+                decode_access_token(token)
+            self.assertEqual(decode.call_count, 2)
+
+        self.assertEqual(access_token_cache_stats(), {"hits": 6, "misses": 2, "size": 1})
+
+    def test_invalid_tokens_are_not_cached_and_size_is_bounded(self) -> None:
+        with self.assertRaises(ValueError):
+            decode_access_token("kein-token")
+        self.assertEqual(access_token_cache_stats()["size"], 0)
+
+        with patch.object(settings, "access_token_cache_size", 2):
+            tokens = [create_access_token(str(user_id)) for user_id in (1, 2, 3)]
+            for token in tokens:
+                decode_access_token(token)
+            self.assertEqual(access_token_cache_stats()["size"], 2)
+            decode_access_token(tokens[0])
+        self.assertEqual(access_token_cache_stats()["hits"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import achievement_catalog
+from app.achievement_catalog import (
+    ACHIEVEMENT_CATALOG,
+    CATALOG_HASH_STATE_KEY,
+    active_achievement_definitions,
+    catalog_content_hash,
+    sync_achievement_catalog_if_changed,
+)
+from app.achievement_engine import ensure_achievement_catalog, evaluate_achievements_for_user
+from app.database import Base
+from app.models import AchievementDefinition, Family, FamilyMembership, RoleEnum, SystemState, User
+from app.security import hash_password
+from sql_capture import capture_statements
+
+
+class AchievementCatalogSyncTests(unittest.TestCase):
+    def setUp(self) -> None:
+        fd, db_path = tempfile.mkstemp(prefix="hq-catalog-sync-test-", suffix=".sqlite3")
+        os.close(fd)
+        self._db_path = db_path
+        self._engine = create_engine(
+            f"sqlite:///{db_path}",
+            connect_args={"check_same_thread": False},
+        )
+        self._session_factory = sessionmaker(bind=self._engine, autoflush=False, autocommit=False)
+        Base.metadata.create_all(bind=self._engine)
+
+    def tearDown(self) -> None:
+        self._engine.dispose()
+        if os.path.exists(self._db_path):
+            os.unlink(self._db_path)
+
+    def _record_statements(self, callback) -> list[str]:
+        with capture_statements(self._engine) as statements:
+            callback()
+        return statements
+
+    def test_sync_runs_once_per_catalog_hash(self) -> None:
+        db = self._session_factory()
+        try:
+            self.assertTrue(sync_achievement_catalog_if_changed(db))
+            db.commit()
+            state = db.query(SystemState).filter(SystemState.key == CATALOG_HASH_STATE_KEY).one()
+            self.assertEqual(state.value, catalog_content_hash())
+
+            statements = self._record_statements(lambda: self.assertFalse(sync_achievement_catalog_if_changed(db)))
+            self.assertFalse(any(statement.startswith(("UPDATE", "INSERT")) for statement in statements))
+
+            # Neuer Hash, unveraenderte Inhalte: nur der Zustand wird geschrieben.
+            with patch.object(achievement_catalog, "catalog_content_hash", return_value="neu"):
+                statements = self._record_statements(lambda: sync_achievement_catalog_if_changed(db))
+            writes = [statement for statement in statements if statement.startswith(("UPDATE", "INSERT"))]
+            self.assertEqual(len(writes), 1)
+            self.assertIn("system_state", writes[0])
+        finally:
+            db.close()
+
+    def test_engine_reads_immutable_definition_cache(self) -> None:
+        db = self._session_factory()
+        try:
+            family = Family(name="Testfamilie")
+            user = User(email="kind@example.com", display_name="Kind", password_hash=hash_password("123"))
+            db.add_all([family, user])
+            db.flush()
+            db.add(FamilyMembership(family_id=family.id, user_id=user.id, role=RoleEnum.child))
+            ensure_achievement_catalog(db)
+            db.commit()
+
+            definitions = active_achievement_definitions(db)
+            self.assertEqual(len(definitions), len(ACHIEVEMENT_CATALOG))
+            with self.assertRaises(TypeError):
+                definitions[0].rule_config["target"] = 1
+            json.dumps(dict(definitions[0].rule_config))
+
+            statements = self._record_statements(
+                lambda: evaluate_achievements_for_user(db, family.id, user.id, emit_events=False)
+            )
+            self.assertFalse(any("achievement_definitions" in statement for statement in statements))
+            self.assertFalse(db.query(AchievementDefinition).filter(AchievementDefinition.is_active == False).count())  # noqa: E712
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
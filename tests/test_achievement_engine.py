@@ -4,28 +4,44 @@ import os
 import tempfile
 import unittest
 from datetime import datetime, timedelta
+from unittest.mock import patch
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
-from app.achievement_calibration import preview_family_achievement_calibration
+from app import achievement_calibration, achievement_engine
+from app.achievement_calibration import (
+    ensure_family_achievement_calibration,
+    preview_family_achievement_calibration,
+)
+from app.achievement_catalog import active_achievement_definitions, invalidate_achievement_definition_cache
 from app.achievement_engine import (
+    build_achievement_family_summary,
     build_achievement_overview,
     claim_achievement_profile,
     claim_achievement_reward,
     ensure_achievement_catalog,
     evaluate_achievements_for_user,
+    rebuild_achievement_user_counters,
     record_task_outcome,
 )
 from app.database import Base
+from app.routers import achievements as achievements_router
 from app.models import (
     AchievementDefinition,
+    AchievementDifficultyEnum,
     AchievementFamilyCalibration,
     AchievementFreezeScopeEnum,
     AchievementFreezeWindow,
     AchievementProgress,
+    AchievementRuleKindEnum,
     AchievementTaskOutcomeEnum,
+    AchievementTaskRecord,
+    AchievementUnlockEvent,
+    AchievementUserCounter,
+    AchievementUserSummary,
     Family,
+    FamilyMembership,
     PointsLedger,
     PointsSourceEnum,
     RedemptionStatusEnum,
@@ -38,6 +54,7 @@ from app.models import (
     User,
 )
 from app.security import hash_password
+from sql_capture import capture_statements
 
 
 class AchievementEngineTests(unittest.TestCase):
@@ -72,6 +89,28 @@ class AchievementEngineTests(unittest.TestCase):
         db.refresh(user)
         return db, family, user
 
+    def _make_task(self, family, user, **overrides) -> Task:
+        values = {
+            "family_id": family.id,
+            "title": "Aufgabe",
+            "description": None,
+            "assignee_id": user.id,
+            "due_at": datetime.utcnow(),
+            "points": 5,
+            "reminder_offsets_minutes": [],
+            "active_weekdays": [],
+            "recurrence_type": "none",
+            "always_submittable": False,
+            "penalty_enabled": False,
+            "penalty_points": 0,
+            "special_template_id": None,
+            "is_active": True,
+            "status": "approved",
+            "created_by_id": user.id,
+        }
+        values.update(overrides)
+        return Task(**values)
+
     def _set_ready_calibration(self, db, family) -> None:
         db.add(
             AchievementFamilyCalibration(
@@ -373,24 +412,14 @@ class AchievementEngineTests(unittest.TestCase):
             )
             for index in range(10):
                 db.add(
-                    Task(
-                        family_id=family.id,
+                    self._make_task(
+                        family,
+                        user,
                         title=f"Wöchentliche Aufgabe {index}",
-                        description=None,
-                        assignee_id=user.id,
-                        due_at=datetime.utcnow(),
                         points=50,
-                        reminder_offsets_minutes=[],
-                        active_weekdays=[],
                         recurrence_type="weekly",
                         series_id=f"series-{index}",
-                        always_submittable=False,
-                        penalty_enabled=False,
-                        penalty_points=0,
-                        special_template_id=None,
-                        is_active=True,
                         status="open",
-                        created_by_id=user.id,
                     )
                 )
             for index in range(5):
@@ -544,41 +573,21 @@ class AchievementEngineTests(unittest.TestCase):
             )
             db.flush()
 
-            first_task = Task(
-                family_id=family.id,
+            first_task = self._make_task(
+                family,
+                user,
                 title="Aktuelle Woche",
-                description=None,
-                assignee_id=user.id,
                 due_at=current_week_start + timedelta(days=2),
                 points=10,
-                reminder_offsets_minutes=[],
-                active_weekdays=[],
                 recurrence_type="weekly",
-                always_submittable=False,
-                penalty_enabled=False,
-                penalty_points=0,
-                special_template_id=None,
-                is_active=True,
-                status="approved",
-                created_by_id=user.id,
             )
-            second_task = Task(
-                family_id=family.id,
+            second_task = self._make_task(
+                family,
+                user,
                 title="Vor zwei Wochen",
-                description=None,
-                assignee_id=user.id,
                 due_at=older_week_start + timedelta(days=2),
                 points=10,
-                reminder_offsets_minutes=[],
-                active_weekdays=[],
                 recurrence_type="weekly",
-                always_submittable=False,
-                penalty_enabled=False,
-                penalty_points=0,
-                special_template_id=None,
-                is_active=True,
-                status="approved",
-                created_by_id=user.id,
             )
             db.add_all([first_task, second_task])
             db.flush()
@@ -650,41 +659,21 @@ class AchievementEngineTests(unittest.TestCase):
             db.add_all([template_a, template_b])
             db.flush()
 
-            task_a = Task(
-                family_id=family.id,
+            task_a = self._make_task(
+                family,
+                user,
                 title="Fenster putzen",
-                description=None,
-                assignee_id=user.id,
                 due_at=datetime.utcnow() - timedelta(days=2),
                 points=15,
-                reminder_offsets_minutes=[],
-                active_weekdays=[],
-                recurrence_type="none",
-                always_submittable=False,
-                penalty_enabled=False,
-                penalty_points=0,
                 special_template_id=template_a.id,
-                is_active=True,
-                status="approved",
-                created_by_id=user.id,
             )
-            task_b = Task(
-                family_id=family.id,
+            task_b = self._make_task(
+                family,
+                user,
                 title="Keller aufräumen",
-                description=None,
-                assignee_id=user.id,
                 due_at=datetime.utcnow() - timedelta(days=1),
                 points=20,
-                reminder_offsets_minutes=[],
-                active_weekdays=[],
-                recurrence_type="none",
-                always_submittable=False,
-                penalty_enabled=False,
-                penalty_points=0,
                 special_template_id=template_b.id,
-                is_active=True,
-                status="approved",
-                created_by_id=user.id,
             )
             db.add_all([task_a, task_b])
             db.flush()
@@ -724,6 +713,525 @@ class AchievementEngineTests(unittest.TestCase):
         finally:
             db.close()
 
+    def test_overview_is_read_only_until_a_period_boundary(self) -> None:
+        db, family, user = self._create_family_and_user()
+        try:
+            ensure_achievement_catalog(db)
+            evaluate_achievements_for_user(db, family.id, user.id, emit_events=False)
+            db.commit()
+
+            with capture_statements(self._engine) as statements:
+                overview = build_achievement_overview(db, family.id, user.id)
+            self.assertEqual(overview["total_count"], len(overview["items"]))
+            self.assertFalse(any(statement.startswith(("INSERT", "UPDATE", "DELETE")) for statement in statements))
+
+            stale = datetime.utcnow() - timedelta(days=40)
+            db.query(AchievementProgress).update({AchievementProgress.last_evaluated_at: stale})
+            db.commit()
+            build_achievement_overview(db, family.id, user.id)
+            db.commit()
+            # Nur Serien haengen von Periodengrenzen ab; Summen-Erfolge bleiben unberuehrt.
+            stale_kinds = {
+                row[0]
+                for row in (
+                    db.query(AchievementDefinition.rule_kind)
+                    .join(AchievementProgress, AchievementProgress.achievement_id == AchievementDefinition.id)
+                    .filter(AchievementProgress.last_evaluated_at == stale)
+                    .distinct()
+                )
+            }
+            self.assertEqual(stale_kinds, {AchievementRuleKindEnum.aggregate_count})
+        finally:
+            db.close()
+
+    def test_trigger_reason_limits_evaluation_to_affected_metrics(self) -> None:
+        db, family, user = self._create_family_and_user()
+        try:
+            ensure_achievement_catalog(db)
+            evaluate_achievements_for_user(db, family.id, user.id, emit_events=False)
+            db.commit()
+
+            tasks = [
+                self._make_task(family, user, title=f"Aufgabe {index}", recurrence_type="weekly" if index % 2 else "none")
+                for index in range(3)
+            ]
+            db.add_all(tasks)
+            db.flush()
+            for task in tasks:
+                record_task_outcome(
+                    db,
+                    task,
+                    outcome=AchievementTaskOutcomeEnum.approved,
+                    completed_at=datetime.utcnow(),
+                    reviewed_at=datetime.utcnow(),
+                    points_awarded=5,
+                )
+            # Ein nachtraeglich verpasstes Ergebnis nimmt den Beitrag wieder heraus.
+            record_task_outcome(
+                db,
+                tasks[1],
+                outcome=AchievementTaskOutcomeEnum.missed,
+                completed_at=None,
+                reviewed_at=datetime.utcnow(),
+                points_awarded=0,
+            )
+            db.commit()
+
+            counter = db.query(AchievementUserCounter).filter(AchievementUserCounter.user_id == user.id).one()
+            self.assertEqual(
+                (counter.approved_tasks_total, counter.approved_special_tasks_total, counter.approved_weekly_tasks_total),
+                (2, 0, 0),
+            )
+            rebuild_achievement_user_counters(db)
+            db.commit()
+            counter = db.query(AchievementUserCounter).filter(AchievementUserCounter.user_id == user.id).one()
+            self.assertEqual(counter.approved_tasks_total, 2)
+
+            with capture_statements(self._engine) as statements:
+                evaluate_achievements_for_user(db, family.id, user.id, reason="points_manual_adjustment", emit_events=False)
+            self.assertFalse(any("achievement_task_records" in statement for statement in statements))
+            self.assertFalse(any("achievement_user_counters" in statement for statement in statements))
+
+            evaluate_achievements_for_user(db, family.id, user.id, reason="task_approved_manual", emit_events=False)
+            db.commit()
+            progress = (
+                db.query(AchievementProgress)
+                .join(AchievementDefinition, AchievementDefinition.id == AchievementProgress.achievement_id)
+                .filter(
+                    AchievementDefinition.rule_config["metric"].as_string() == "approved_tasks_total",
+                    AchievementProgress.user_id == user.id,
+                )
+                .all()
+            )
+            self.assertTrue(progress)
+            self.assertTrue(all(row.current_value == 2 for row in progress))
+        finally:
+            db.close()
+
+    def test_streak_benchmark_two_years_of_daily_tasks(self) -> None:
+        db, family, user = self._create_family_and_user()
+        try:
+            ensure_achievement_catalog(db)
+            now = datetime.utcnow().replace(hour=8, minute=0, second=0, microsecond=0)
+            days = 730
+            tasks = [
+                self._make_task(
+                    family,
+                    user,
+                    title=f"Tag {index}",
+                    due_at=now - timedelta(days=index),
+                    points=1,
+                    recurrence_type="daily",
+                )
+                for index in range(days)
+            ]
+            db.add_all(tasks)
+            db.flush()
+            db.add_all(
+                [
+                    AchievementTaskRecord(
+                        family_id=family.id,
+                        user_id=user.id,
+                        task_id=task.id,
+                        task_title=task.title,
+                        recurrence_type=task.recurrence_type,
+                        outcome=AchievementTaskOutcomeEnum.approved,
+                        due_at=task.due_at,
+                        completed_at=task.due_at,
+                        reviewed_at=task.due_at,
+                        points_awarded=1,
+                    )
+                    for task in tasks
+                ]
+            )
+            db.commit()
+
+            # Jede Aufgabe wird pro Periodenart genau einmal einsortiert, unabhaengig von der Zahl der Serien;
+            # dazu kommt ein Aufruf je gepruefter Periode.
+            with patch.object(achievement_engine, "_period_start", wraps=achievement_engine._period_start) as proxy:
+                evaluate_achievements_for_user(db, family.id, user.id, reason="freeze_updated", emit_events=False)
+            db.commit()
+            self.assertLess(proxy.call_count, 3 * 2 * days)
+
+            progress = (
+                db.query(AchievementProgress)
+                .join(AchievementDefinition, AchievementDefinition.id == AchievementProgress.achievement_id)
+                .filter(AchievementDefinition.key == "streak_2", AchievementProgress.user_id == user.id)
+                .one()
+            )
+            self.assertIsNotNone(progress.unlocked_at)
+            self.assertGreaterEqual(progress.best_streak, 24)
+        finally:
+            db.close()
+
+    def test_context_cache_is_reused_until_sources_change(self) -> None:
+        db, family, user = self._create_family_and_user()
+        try:
+            ensure_achievement_catalog(db)
+            task = self._make_task(family, user, title="Zimmer")
+            db.add(task)
+            db.commit()
+
+            def history_loads(callback) -> int:
+                with capture_statements(self._engine) as statements:
+                    callback()
+                return len([statement for statement in statements if "FROM achievement_task_records" in statement])
+
+            def evaluate() -> None:
+                evaluate_achievements_for_user(db, family.id, user.id, emit_events=False)
+
+            self.assertEqual(history_loads(evaluate), 1)
+            self.assertEqual(history_loads(evaluate), 0)
+
+            record_task_outcome(
+                db,
+                task,
+                outcome=AchievementTaskOutcomeEnum.approved,
+                completed_at=datetime.utcnow(),
+                reviewed_at=datetime.utcnow(),
+                points_awarded=5,
+            )
+            self.assertEqual(history_loads(evaluate), 1)
+            db.commit()
+            self.assertEqual(history_loads(evaluate), 1)
+        finally:
+            db.close()
+
+    def test_evaluation_writes_progress_in_one_upsert_and_skips_unchanged_rows(self) -> None:
+        db, family, user = self._create_family_and_user()
+        try:
+            ensure_achievement_catalog(db)
+            db.commit()
+            def progress_writes() -> list[str]:
+                with capture_statements(self._engine) as statements:
+                    evaluate_achievements_for_user(db, family.id, user.id, emit_events=False)
+                return [
+                    statement
+                    for statement in statements
+                    if statement.startswith(("INSERT INTO achievement_progress", "UPDATE achievement_progress"))
+                ]
+
+            first = progress_writes()
+            self.assertEqual(len(first), 1)
+            self.assertIn("ON CONFLICT", first[0])
+            db.commit()
+            progress_count = db.query(AchievementProgress).filter(AchievementProgress.user_id == user.id).count()
+            self.assertEqual(progress_count, len(active_achievement_definitions(db)))
+
+            # Unveraenderte Zeilen bekommen nur den Auswertungszeitpunkt in einem gemeinsamen UPDATE.
+            second = progress_writes()
+            self.assertEqual(len(second), 1)
+            self.assertTrue(second[0].startswith("UPDATE achievement_progress SET last_evaluated_at"))
+
+            db.add(
+                PointsLedger(
+                    family_id=family.id,
+                    user_id=user.id,
+                    source_type=PointsSourceEnum.manual_adjustment,
+                    source_id=0,
+                    points_delta=25,
+                    description="Bonus",
+                )
+            )
+            db.flush()
+            third = progress_writes()
+            self.assertEqual(len([statement for statement in third if statement.startswith("INSERT")]), 1)
+            db.commit()
+            earned = (
+                db.query(AchievementProgress)
+                .join(AchievementDefinition, AchievementDefinition.id == AchievementProgress.achievement_id)
+                .filter(
+                    AchievementDefinition.rule_config["metric"].as_string() == "earned_points_total",
+                    AchievementProgress.user_id == user.id,
+                )
+                .first()
+            )
+            self.assertEqual(earned.current_value, 25)
+        finally:
+            db.close()
+
+    def test_parallel_unlock_does_not_emit_a_second_event(self) -> None:
+        db, family, user = self._create_family_and_user()
+        try:
+            ensure_achievement_catalog(db)
+            self._set_ready_calibration(db, family)
+            evaluate_achievements_for_user(db, family.id, user.id, emit_events=False)
+            db.commit()
+            bronze = db.query(AchievementDefinition).filter(AchievementDefinition.key == "point_collector_bronze").one()
+            db.add(
+                PointsLedger(
+                    family_id=family.id,
+                    user_id=user.id,
+                    source_type=PointsSourceEnum.task_approval,
+                    source_id=1,
+                    points_delta=500,
+                    description="Viele Punkte",
+                    created_by_id=user.id,
+                )
+            )
+            db.flush()
+
+            earlier = datetime.utcnow() - timedelta(minutes=1)
+            original_upsert = achievement_engine._upsert_progress_rows
+
+            def upsert_after_parallel_unlock(session, rows):
+                # Eine parallele Auswertung hat die Freischaltung nach unserem Lesen bereits gesetzt.
+                session.query(AchievementProgress).filter(
+                    AchievementProgress.user_id == user.id,
+                    AchievementProgress.achievement_id == bronze.id,
+                ).update({AchievementProgress.unlocked_at: earlier}, synchronize_session=False)
+                return original_upsert(session, rows)
+
+            with patch.object(achievement_engine, "_upsert_progress_rows", upsert_after_parallel_unlock):
+                events = evaluate_achievements_for_user(db, family.id, user.id, emit_events=False)
+            db.commit()
+
+            self.assertNotIn(bronze.id, {unlock_event.achievement_id for unlock_event in events})
+            self.assertEqual(
+                db.query(AchievementUnlockEvent).filter(AchievementUnlockEvent.achievement_id == bronze.id).count(),
+                0,
+            )
+            progress = (
+                db.query(AchievementProgress)
+                .filter(AchievementProgress.user_id == user.id, AchievementProgress.achievement_id == bronze.id)
+                .one()
+            )
+            self.assertEqual(progress.unlocked_at, earlier)
+
+            # Ohne Konkurrenz erzeugt die eigene Freischaltung genau ein Ereignis.
+            silver = db.query(AchievementDefinition).filter(AchievementDefinition.key == "point_collector_silver").one()
+            db.add(
+                PointsLedger(
+                    family_id=family.id,
+                    user_id=user.id,
+                    source_type=PointsSourceEnum.task_approval,
+                    source_id=2,
+                    points_delta=5000,
+                    description="Noch mehr Punkte",
+                    created_by_id=user.id,
+                )
+            )
+            db.flush()
+            events = evaluate_achievements_for_user(db, family.id, user.id, emit_events=False)
+            self.assertIn(silver.id, {unlock_event.achievement_id for unlock_event in events})
+        finally:
+            db.close()
+
+    def test_family_calibration_is_cached_until_tasks_or_rewards_change(self) -> None:
+        db, family, user = self._create_family_and_user()
+        try:
+            now = datetime.utcnow()
+            calibration = ensure_family_achievement_calibration(db, family.id, now=now)
+            db.commit()
+            self.assertEqual(calibration.computed_at, now)
+
+            with patch(
+                "app.achievement_calibration.compute_family_achievement_calibration",
+                wraps=achievement_calibration.compute_family_achievement_calibration,
+            ) as compute:
+                ensure_family_achievement_calibration(db, family.id, now=now + timedelta(hours=2))
+                self.assertEqual(compute.call_count, 0)
+
+                db.add(
+                    Reward(
+                        family_id=family.id,
+                        title="Kino",
+                        description=None,
+                        cost_points=100,
+                        is_shareable=False,
+                        is_active=True,
+                        created_by_id=user.id,
+                    )
+                )
+                db.flush()
+                calibration = ensure_family_achievement_calibration(db, family.id, now=now + timedelta(hours=3))
+                self.assertEqual(compute.call_count, 1)
+                self.assertEqual(calibration.rewards_configured_count, 1)
+                db.commit()
+
+                # Andere Sessions sehen die Invalidierung ueber computed_at.
+                other = self._session_factory()
+                try:
+                    ensure_family_achievement_calibration(other, family.id, now=now + timedelta(hours=4))
+                    self.assertEqual(compute.call_count, 1)
+                    other.add(
+                        Reward(
+                            family_id=family.id,
+                            title="Eis",
+                            description=None,
+                            cost_points=50,
+                            is_shareable=False,
+                            is_active=True,
+                            created_by_id=user.id,
+                        )
+                    )
+                    other.commit()
+                finally:
+                    other.close()
+
+                ensure_family_achievement_calibration(db, family.id, now=now + timedelta(hours=5))
+                self.assertEqual(compute.call_count, 2)
+                db.commit()
+
+                ensure_family_achievement_calibration(db, family.id, now=now + timedelta(days=1, hours=6))
+                self.assertEqual(compute.call_count, 3)
+        finally:
+            db.close()
+
+    def test_status_only_task_changes_keep_the_family_calibration(self) -> None:
+        db, family, user = self._create_family_and_user()
+        try:
+            task = self._make_task(family, user, title="Zimmer aufraeumen", recurrence_type="weekly", status="open")
+            db.add(task)
+            db.flush()
+            now = datetime.utcnow()
+            ensure_family_achievement_calibration(db, family.id, now=now)
+            db.commit()
+
+            with capture_statements(self._engine) as statements:
+                task.status = "approved"
+                task.penalty_last_applied_at = now
+                db.commit()
+            self.assertFalse(any("achievement_family_calibrations" in statement for statement in statements))
+            calibration = db.query(AchievementFamilyCalibration).filter_by(family_id=family.id).one()
+            self.assertEqual(calibration.computed_at, now)
+
+            # Punkte sind eine Eingabe der Kalibrierung und verwerfen den Stand.
+            task.points = 10
+            db.commit()
+            db.refresh(calibration)
+            self.assertIsNone(calibration.computed_at)
+
+            # Angewendete Kalibrierungen werden nicht mehr angefasst.
+            calibration.status = "applied"
+            calibration.computed_at = now
+            db.commit()
+            task.points = 15
+            db.commit()
+            db.refresh(calibration)
+            self.assertEqual(calibration.computed_at, now)
+        finally:
+            db.close()
+
+    def test_family_summary_is_maintained_by_evaluator_and_claims(self) -> None:
+        db, family, child = self._create_family_and_user()
+        try:
+            parent = User(email="eltern@example.com", display_name="Eltern", password_hash=hash_password("123"))
+            db.add(parent)
+            db.flush()
+            db.add_all(
+                [
+                    FamilyMembership(family_id=family.id, user_id=child.id, role=RoleEnum.child),
+                    FamilyMembership(family_id=family.id, user_id=parent.id, role=RoleEnum.parent),
+                ]
+            )
+            ensure_achievement_catalog(db)
+            self._set_ready_calibration(db, family)
+            db.add(
+                PointsLedger(
+                    family_id=family.id,
+                    user_id=child.id,
+                    source_type=PointsSourceEnum.task_approval,
+                    source_id=1,
+                    points_delta=500,
+                    description="Viele Punkte",
+                    created_by_id=parent.id,
+                )
+            )
+            db.flush()
+            evaluate_achievements_for_user(db, family.id, child.id, emit_events=False)
+            db.commit()
+
+            summary = build_achievement_family_summary(db, family.id)
+            db.commit()
+            self.assertEqual(summary["total_count"], len(active_achievement_definitions(db)))
+            self.assertEqual([member["user_id"] for member in summary["members"]], [child.id, parent.id])
+            child_summary, parent_summary = summary["members"]
+            self.assertGreaterEqual(child_summary["unlocked_count"], 1)
+            self.assertGreaterEqual(child_summary["unlocked_by_difficulty"][AchievementDifficultyEnum.bronze], 1)
+            self.assertEqual(child_summary["profile_claimable_count"], child_summary["unlocked_count"])
+            self.assertEqual(child_summary["reward_claimable_count"], 0)
+            self.assertIsNotNone(child_summary["last_unlocked_at"])
+            self.assertEqual(parent_summary["unlocked_count"], 0)
+
+            points_bronze = db.query(AchievementDefinition).filter(AchievementDefinition.key == "point_collector_bronze").one()
+            claim_achievement_profile(db, family.id, child.id, points_bronze.id)
+            db.commit()
+
+            with capture_statements(self._engine) as statements:
+                with patch.object(achievement_engine, "evaluate_achievements_for_user") as evaluate:
+                    summary = build_achievement_family_summary(db, family.id)
+            evaluate.assert_not_called()
+            self.assertEqual(len([statement for statement in statements if "achievement_user_summaries" in statement]), 1)
+            claimed_summary = summary["members"][0]
+            self.assertEqual(claimed_summary["profile_claimable_count"], child_summary["profile_claimable_count"] - 1)
+            self.assertEqual(claimed_summary["reward_claimable_count"], 1)
+        finally:
+            db.close()
+
+    def test_family_summary_follows_catalog_changes_and_recalibration(self) -> None:
+        db, family, child = self._create_family_and_user()
+        try:
+            parent = User(email="eltern@example.com", display_name="Eltern", password_hash=hash_password("123"))
+            db.add(parent)
+            db.flush()
+            db.add_all(
+                [
+                    FamilyMembership(family_id=family.id, user_id=child.id, role=RoleEnum.child),
+                    FamilyMembership(family_id=family.id, user_id=parent.id, role=RoleEnum.parent),
+                ]
+            )
+            ensure_achievement_catalog(db)
+            self._set_ready_calibration(db, family)
+            db.add(
+                PointsLedger(
+                    family_id=family.id,
+                    user_id=child.id,
+                    source_type=PointsSourceEnum.task_approval,
+                    source_id=1,
+                    points_delta=500,
+                    description="Viele Punkte",
+                    created_by_id=parent.id,
+                )
+            )
+            db.flush()
+            evaluate_achievements_for_user(db, family.id, child.id, emit_events=False)
+            db.commit()
+
+            def child_summary() -> AchievementUserSummary:
+                db.expire_all()
+                return (
+                    db.query(AchievementUserSummary)
+                    .filter(AchievementUserSummary.family_id == family.id, AchievementUserSummary.user_id == child.id)
+                    .one()
+                )
+
+            unlocked_count = child_summary().unlocked_count
+            self.assertGreaterEqual(unlocked_count, 1)
+
+            # Ein deaktivierter Erfolg zaehlt nicht mehr; die naechste Katalog-Synchronisierung
+            # aktiviert ihn wieder und baut die Zusammenfassungen neu auf.
+            bronze = db.query(AchievementDefinition).filter(AchievementDefinition.key == "point_collector_bronze").one()
+            bronze.is_active = False
+            db.flush()
+            invalidate_achievement_definition_cache(db)
+            achievement_engine.refresh_achievement_user_summary(db, family.id, child.id)
+            db.commit()
+            self.assertEqual(child_summary().unlocked_count, unlocked_count - 1)
+            ensure_achievement_catalog(db)
+            db.commit()
+            self.assertEqual(child_summary().unlocked_count, unlocked_count)
+
+            # Die Neukalibrierung aktualisiert die Zusammenfassung auch ohne geaenderten Fortschritt.
+            stale = child_summary()
+            stale.reward_claimable_count = 5
+            db.commit()
+            with patch.object(achievements_router, "evaluate_achievements_for_user"):
+                achievements_router.recalculate_achievement_calibration(family.id, current_user=parent, db=db)
+            self.assertEqual(child_summary().reward_claimable_count, 0)
+        finally:
+            db.close()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import maintenance
+from app.achievement_engine import PERIOD_SWEEP_STATE_KEY, ensure_achievement_catalog, period_sweep_user_keys
+from app.database import Base
+from app.models import (
+    AchievementDefinition,
+    AchievementProgress,
+    AchievementRuleKindEnum,
+    AchievementTaskOutcomeEnum,
+    AchievementTaskRecord,
+    Family,
+    FamilyMembership,
+    RoleEnum,
+    SystemState,
+    Task,
+    User,
+)
+from app.security import hash_password
+
+
+class AchievementPeriodSweepTests(unittest.TestCase):
+    def setUp(self) -> None:
+        fd, db_path = tempfile.mkstemp(prefix="hq-period-sweep-test-", suffix=".sqlite3")
+        os.close(fd)
+        self._db_path = db_path
+        self._engine = create_engine(
+            f"sqlite:///{db_path}",
+            connect_args={"check_same_thread": False},
+        )
+        self._session_factory = sessionmaker(bind=self._engine, autoflush=False, autocommit=False)
+        Base.metadata.create_all(bind=self._engine)
+        patcher = patch.object(maintenance, "SessionLocal", self._session_factory)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        self._engine.dispose()
+        if os.path.exists(self._db_path):
+            os.unlink(self._db_path)
+
+    def test_sweep_evaluates_streaks_of_active_users_once_per_boundary(self) -> None:
+        db = self._session_factory()
+        try:
+            family = Family(name="Testfamilie")
+            active = User(email="aktiv@example.com", display_name="Aktiv", password_hash=hash_password("123"))
+            idle = User(email="ruhig@example.com", display_name="Ruhig", password_hash=hash_password("123"))
+            db.add_all([family, active, idle])
+            db.flush()
+            db.add_all(
+                [
+                    FamilyMembership(family_id=family.id, user_id=active.id, role=RoleEnum.child),
+                    FamilyMembership(family_id=family.id, user_id=idle.id, role=RoleEnum.child),
+                ]
+            )
+            now = datetime.utcnow()
+            db.add(
+                Task(
+                    family_id=family.id,
+                    title="Letzte Woche",
+                    description=None,
+                    assignee_id=active.id,
+                    due_at=now - timedelta(days=7),
+                    points=5,
+                    reminder_offsets_minutes=[],
+                    active_weekdays=[],
+                    recurrence_type="weekly",
+                    always_submittable=False,
+                    penalty_enabled=False,
+                    penalty_points=0,
+                    special_template_id=None,
+                    is_active=True,
+                    status="approved",
+                    created_by_id=active.id,
+                )
+            )
+            ensure_achievement_catalog(db)
+            db.commit()
+
+            self.assertEqual(maintenance.run_achievement_period_sweep_once(now), 1)
+            rule_kinds = {
+                row[0]
+                for row in (
+                    db.query(AchievementDefinition.rule_kind)
+                    .join(AchievementProgress, AchievementProgress.achievement_id == AchievementDefinition.id)
+                    .filter(AchievementProgress.user_id == active.id)
+                    .distinct()
+                )
+            }
+            self.assertEqual(rule_kinds, {AchievementRuleKindEnum.streak})
+            self.assertEqual(db.query(AchievementProgress).filter(AchievementProgress.user_id == idle.id).count(), 0)
+            self.assertIsNotNone(db.get(SystemState, PERIOD_SWEEP_STATE_KEY))
+
+            # Dieselbe Grenze wird nicht erneut verarbeitet, die naechste schon.
+            self.assertEqual(maintenance.run_achievement_period_sweep_once(now), 0)
+            self.assertEqual(maintenance.run_achievement_period_sweep_once(now + timedelta(days=7)), 1)
+        finally:
+            db.close()
+
+
+    def test_tasks_without_due_date_count_as_active(self) -> None:
+        db = self._session_factory()
+        try:
+            family = Family(name="Testfamilie")
+            users = [
+                User(email=f"kind{index}@example.com", display_name=f"Kind {index}", password_hash=hash_password("123"))
+                for index in range(3)
+            ]
+            db.add_all([family, *users])
+            db.flush()
+            now = datetime.utcnow()
+            active_since = now - timedelta(days=7)
+            # Ganze Woche verfuegbar: kein due_at, nur der Erstellzeitpunkt liegt in der Periode.
+            db.add(
+                Task(
+                    family_id=family.id,
+                    title="Irgendwann diese Woche",
+                    assignee_id=users[0].id,
+                    due_at=None,
+                    points=5,
+                    recurrence_type="weekly",
+                    status="open",
+                    created_by_id=users[0].id,
+                    created_at=now - timedelta(days=2),
+                )
+            )
+            records = [
+                (users[1], now - timedelta(days=1), now - timedelta(days=30)),
+                (users[2], now - timedelta(days=30), now - timedelta(days=30)),
+            ]
+            for task_id, (user, reviewed_at, created_at) in enumerate(records, start=1):
+                db.add(
+                    AchievementTaskRecord(
+                        family_id=family.id,
+                        user_id=user.id,
+                        task_id=task_id,
+                        task_title="Erledigt",
+                        recurrence_type="weekly",
+                        outcome=AchievementTaskOutcomeEnum.approved,
+                        due_at=None,
+                        reviewed_at=reviewed_at,
+                        created_at=created_at,
+                    )
+                )
+            db.commit()
+
+            self.assertEqual(
+                period_sweep_user_keys(db, active_since),
+                [(family.id, users[0].id), (family.id, users[1].id)],
+            )
+        finally:
+            db.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import achievement_queue
+from app.achievement_engine import ensure_achievement_catalog
+from app.achievement_queue import (
+    request_achievement_evaluation,
+    start_achievement_queue,
+    stop_achievement_queue,
+    wait_for_achievement_queue,
+)
+from app.config import settings
+from app.database import Base
+from app.models import AchievementProgress, Family, FamilyMembership, RoleEnum, User
+from app.security import hash_password
+
+
+class AchievementQueueTests(unittest.TestCase):
+    def setUp(self) -> None:
+        fd, db_path = tempfile.mkstemp(prefix="hq-achievement-queue-test-", suffix=".sqlite3")
+        os.close(fd)
+        self._db_path = db_path
+        self._engine = create_engine(
+            f"sqlite:///{db_path}",
+            connect_args={"check_same_thread": False},
+        )
+        self._session_factory = sessionmaker(bind=self._engine, autoflush=False, autocommit=False)
+        Base.metadata.create_all(bind=self._engine)
+        for patcher in (
+            patch.object(achievement_queue, "SessionLocal", self._session_factory),
+            patch.object(settings, "achievement_evaluation_debounce_seconds", 0.5),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        start_achievement_queue()
+        self.addCleanup(stop_achievement_queue)
+
+    def tearDown(self) -> None:
+        self._engine.dispose()
+        if os.path.exists(self._db_path):
+            os.unlink(self._db_path)
+
+    def _seed(self, db):
+        family = Family(name="Testfamilie")
+        child = User(email="kind@example.com", display_name="Kind", password_hash=hash_password("123"))
+        db.add_all([family, child])
+        db.flush()
+        db.add(FamilyMembership(family_id=family.id, user_id=child.id, role=RoleEnum.child))
+        ensure_achievement_catalog(db)
+        db.commit()
+        return family, child
+
+    def test_requests_are_coalesced_and_run_after_commit(self) -> None:
+        db = self._session_factory()
+        try:
+            family, child = self._seed(db)
+            with patch.object(
+                achievement_queue,
+                "evaluate_achievements_for_user",
+                wraps=achievement_queue.evaluate_achievements_for_user,
+            ) as evaluate:
+                for reason in ("task_approved_review", "task_approved_review", "points_manual_adjustment"):
+                    request_achievement_evaluation(db, family.id, child.id, triggered_by_id=None, reason=reason)
+                    db.commit()
+
+                # Verworfene Transaktionen reihen nichts ein.
+                request_achievement_evaluation(db, family.id, child.id + 1, reason="points_manual_adjustment")
+                db.rollback()
+
+                self.assertEqual(db.query(AchievementProgress).count(), 0)
+                self.assertTrue(wait_for_achievement_queue(timeout_seconds=10))
+
+            self.assertEqual(evaluate.call_count, 1)
+            self.assertEqual(evaluate.call_args.kwargs["user_id"], child.id)
+            self.assertEqual(evaluate.call_args.kwargs["reason"], "points_manual_adjustment")
+            self.assertEqual(evaluate.call_args.kwargs["coalesced_reasons"], ("task_approved_review",))
+            self.assertGreater(
+                db.query(AchievementProgress).filter(AchievementProgress.user_id == child.id).count(),
+                0,
+            )
+        finally:
+            db.close()
+
+
+    def test_debounce_is_capped_by_max_wait(self) -> None:
+        stop_achievement_queue()
+        self.addCleanup(achievement_queue._pending.clear)
+        key = (1, 2)
+        with (
+            patch.object(settings, "achievement_evaluation_debounce_seconds", 2.0),
+            patch.object(settings, "achievement_evaluation_max_wait_seconds", 5.0),
+        ):
+            for now in (100.0, 101.5, 103.0, 104.5):
+                session = SimpleNamespace(
+                    info={achievement_queue.PENDING_EVALUATIONS_KEY: [(*key, None, "task_approved_review")]}
+                )
+                with patch.object(achievement_queue.time, "monotonic", return_value=now):
+                    achievement_queue._enqueue_after_commit(session)
+                expected = min(now + 2.0, 105.0)
+                self.assertEqual(achievement_queue._pending[key].due_at, expected)
+        self.assertEqual(achievement_queue._pending[key].reasons, ["task_approved_review"])
+
+if __name__ == "__main__":
+    unittest.main()
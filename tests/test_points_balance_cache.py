@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+
+from fastapi import Request, Response
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Family, FamilyMembership, PointsLedger, PointsSourceEnum, RoleEnum, User
+from app.routers import points as points_router
+from app.security import hash_password
+from sql_capture import capture_statements
+
+
+def _request(etag: str | None = None) -> Request:
+    headers = [(b"if-none-match", etag.encode())] if etag else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+class PointsBalanceCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        fd, db_path = tempfile.mkstemp(prefix="hq-balance-cache-test-", suffix=".sqlite3")
+        os.close(fd)
+        self._db_path = db_path
+        self._engine = create_engine(
+            f"sqlite:///{db_path}",
+            connect_args={"check_same_thread": False},
+        )
+        self._session_factory = sessionmaker(bind=self._engine, autoflush=False, autocommit=False)
+        Base.metadata.create_all(bind=self._engine)
+        points_router._balance_snapshots.clear()
+        self.addCleanup(points_router._balance_snapshots.clear)
+
+    def tearDown(self) -> None:
+        self._engine.dispose()
+        if os.path.exists(self._db_path):
+            os.unlink(self._db_path)
+
+    def _seed(self, db):
+        family = Family(name="Testfamilie")
+        parent = User(email="eltern@example.com", display_name="Eltern", password_hash=hash_password("123"))
+        child = User(email="kind@example.com", display_name="Kind", password_hash=hash_password("123"))
+        db.add_all([family, parent, child])
+        db.flush()
+        db.add_all(
+            [
+                FamilyMembership(family_id=family.id, user_id=parent.id, role=RoleEnum.parent),
+                FamilyMembership(family_id=family.id, user_id=child.id, role=RoleEnum.child),
+            ]
+        )
+        db.add(
+            PointsLedger(
+                family_id=family.id,
+                user_id=child.id,
+                source_type=PointsSourceEnum.manual_adjustment,
+                source_id=0,
+                points_delta=12,
+                description="Start",
+            )
+        )
+        db.commit()
+        return family, parent, child
+
+    def _balances(self, db, family, user, etag: str | None = None):
+        response = Response()
+        result = points_router.list_balances(
+            family_id=family.id,
+            request=_request(etag),
+            response=response,
+            current_user=user,
+            db=db,
+        )
+        if isinstance(result, Response):
+            return result, result.headers["ETag"]
+        return result, response.headers["ETag"]
+
+    def _count_balance_queries(self, callback):
+        with capture_statements(self._engine) as statements:
+            result = callback()
+        return result, len([statement for statement in statements if "points_balances" in statement])
+
+    def test_revalidation_and_snapshot_skip_balance_queries(self) -> None:
+        db = self._session_factory()
+        try:
+            family, parent, child = self._seed(db)
+            items, etag = self._balances(db, family, parent)
+            self.assertEqual({item.display_name: item.balance for item in items}, {"Eltern": 0, "Kind": 12})
+
+            (not_modified, same_etag), queries = self._count_balance_queries(
+                lambda: self._balances(db, family, parent, etag)
+            )
+            self.assertEqual(not_modified.status_code, 304)
+            self.assertEqual(same_etag, etag)
+            self.assertEqual(queries, 0)
+
+            (child_items, child_etag), queries = self._count_balance_queries(lambda: self._balances(db, family, child))
+            self.assertEqual(queries, 0)
+            self.assertEqual([item.user_id for item in child_items], [child.id])
+            self.assertNotEqual(child_etag, etag)
+        finally:
+            db.close()
+
+    def test_ledger_and_member_changes_invalidate(self) -> None:
+        db = self._session_factory()
+        try:
+            family, parent, child = self._seed(db)
+            _, etag = self._balances(db, family, parent)
+
+            db.add(
+                PointsLedger(
+                    family_id=family.id,
+                    user_id=child.id,
+                    source_type=PointsSourceEnum.manual_adjustment,
+                    source_id=0,
+                    points_delta=3,
+                    description="Bonus",
+                )
+            )
+            db.commit()
+            items, ledger_etag = self._balances(db, family, parent, etag)
+            self.assertNotEqual(ledger_etag, etag)
+            self.assertEqual({item.display_name: item.balance for item in items}["Kind"], 15)
+
+            child.display_name = "Kind Neu"
+            db.commit()
+            items, renamed_etag = self._balances(db, family, parent, ledger_etag)
+            self.assertNotEqual(renamed_etag, ledger_etag)
+            self.assertIn("Kind Neu", [item.display_name for item in items])
+
+            # Ein Rollback verwirft die Markierung, die Version bleibt stehen.
+            db.add(
+                PointsLedger(
+                    family_id=family.id,
+                    user_id=child.id,
+                    source_type=PointsSourceEnum.manual_adjustment,
+                    source_id=0,
+                    points_delta=1,
+                    description="Verworfen",
+                )
+            )
+            db.flush()
+            db.rollback()
+            not_modified, _ = self._balances(db, family, parent, renamed_etag)
+            self.assertEqual(not_modified.status_code, 304)
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.migrations import _create_points_balances_table
+from app.models import Family, PointsBalance, PointsLedger, PointsSourceEnum, User
+from app.security import hash_password
+from app.services import add_points_ledger_entries, get_points_balance, reconcile_points_balances
+
+
+class PointsBalanceTests(unittest.TestCase):
+    def setUp(self) -> None:
+        fd, db_path = tempfile.mkstemp(prefix="hq-points-balances-test-", suffix=".sqlite3")
+        os.close(fd)
+        self._db_path = db_path
+        self._engine = create_engine(
+            f"sqlite:///{db_path}",
+            connect_args={"check_same_thread": False},
+        )
+        self._session_factory = sessionmaker(bind=self._engine, autoflush=False, autocommit=False)
+        Base.metadata.create_all(bind=self._engine)
+
+    def tearDown(self) -> None:
+        self._engine.dispose()
+        if os.path.exists(self._db_path):
+            os.unlink(self._db_path)
+
+    def _seed(self, db):
+        family = Family(name="Testfamilie")
+        child = User(email="kind@example.com", display_name="Kind", password_hash=hash_password("123"))
+        db.add_all([family, child])
+        db.flush()
+        return family, child
+
+    @staticmethod
+    def _entry(family_id: int, user_id: int, source_type: PointsSourceEnum, delta: int) -> PointsLedger:
+        return PointsLedger(
+            family_id=family_id,
+            user_id=user_id,
+            source_type=source_type,
+            source_id=1,
+            points_delta=delta,
+            description="Test",
+        )
+
+    def test_ledger_inserts_update_balance_in_same_transaction(self) -> None:
+        db = self._session_factory()
+        try:
+            family, child = self._seed(db)
+            db.add_all(
+                [
+                    self._entry(family.id, child.id, PointsSourceEnum.task_approval, 30),
+                    self._entry(family.id, child.id, PointsSourceEnum.achievement_unlock, 5),
+                    self._entry(family.id, child.id, PointsSourceEnum.reward_redemption, -12),
+                    self._entry(family.id, child.id, PointsSourceEnum.task_penalty, -3),
+                ]
+            )
+            db.flush()
+            add_points_ledger_entries(
+                db,
+                [
+                    {
+                        "family_id": family.id,
+                        "user_id": child.id,
+                        "source_type": PointsSourceEnum.manual_adjustment,
+                        "source_id": child.id,
+                        "points_delta": 10,
+                        "description": "Bonus",
+                    },
+                    {
+                        "family_id": family.id,
+                        "user_id": child.id,
+                        "source_type": PointsSourceEnum.reward_contribution,
+                        "source_id": 2,
+                        "points_delta": -4,
+                        "description": "Beitrag",
+                    },
+                ],
+            )
+            self.assertEqual(get_points_balance(db, family.id, child.id), 26)
+
+            db.rollback()
+            self.assertEqual(db.query(PointsBalance).count(), 0)
+
+            family, child = self._seed(db)
+            db.add(self._entry(family.id, child.id, PointsSourceEnum.task_approval, 7))
+            db.commit()
+            balance = db.query(PointsBalance).one()
+            self.assertEqual((balance.balance, balance.earned_total, balance.spent_total), (7, 7, 0))
+            self.assertEqual(reconcile_points_balances(db), 0)
+        finally:
+            db.close()
+
+    def test_reconciliation_repairs_drift(self) -> None:
+        db = self._session_factory()
+        try:
+            family, child = self._seed(db)
+            db.add_all(
+                [
+                    self._entry(family.id, child.id, PointsSourceEnum.task_approval, 20),
+                    self._entry(family.id, child.id, PointsSourceEnum.reward_redemption, -8),
+                ]
+            )
+            db.commit()
+            db.execute(text("UPDATE points_balances SET balance = 999, spent_total = 0"))
+            db.commit()
+
+            self.assertEqual(reconcile_points_balances(db, family.id), 1)
+            db.commit()
+            balance = db.query(PointsBalance).one()
+            self.assertEqual((balance.balance, balance.earned_total, balance.spent_total), (12, 20, 8))
+            self.assertEqual(reconcile_points_balances(db), 0)
+        finally:
+            db.close()
+
+    def test_migration_backfills_existing_history(self) -> None:
+        db = self._session_factory()
+        try:
+            family, child = self._seed(db)
+            db.add_all(
+                [
+                    self._entry(family.id, child.id, PointsSourceEnum.task_approval, 15),
+                    self._entry(family.id, child.id, PointsSourceEnum.reward_contribution, -6),
+                ]
+            )
+            db.commit()
+            db.execute(text("DELETE FROM points_balances"))
+            db.commit()
+
+            _create_points_balances_table(self._engine)
+            balance = db.query(PointsBalance).one()
+            self.assertEqual((balance.balance, balance.earned_total, balance.spent_total), (9, 15, 6))
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.achievement_engine import ensure_achievement_catalog
+from app.database import Base
+from app.models import AchievementProgress, Family, FamilyMembership, LiveUpdateEvent, PointsLedger, RoleEnum, User
+from app.routers import points as points_router
+from app.schemas import PointsAdjustRequest, PointsBulkAdjustRequest
+from app.security import hash_password
+from app.services import get_points_balance
+
+
+class PointsBulkAdjustTests(unittest.TestCase):
+    def setUp(self) -> None:
+        fd, db_path = tempfile.mkstemp(prefix="hq-points-bulk-test-", suffix=".sqlite3")
+        os.close(fd)
+        self._db_path = db_path
+        self._engine = create_engine(
+            f"sqlite:///{db_path}",
+            connect_args={"check_same_thread": False},
+        )
+        self._session_factory = sessionmaker(bind=self._engine, autoflush=False, autocommit=False)
+        Base.metadata.create_all(bind=self._engine)
+        patcher = patch.object(points_router, "SessionLocal", self._session_factory)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        self._engine.dispose()
+        if os.path.exists(self._db_path):
+            os.unlink(self._db_path)
+
+    def _seed(self, db):
+        family = Family(name="Testfamilie")
+        parent = User(email="eltern@example.com", display_name="Eltern", password_hash=hash_password("123"))
+        children = [
+            User(email=f"kind{index}@example.com", display_name=f"Kind {index}", password_hash=hash_password("123"))
+            for index in range(3)
+        ]
+        db.add_all([family, parent, *children])
+        db.flush()
+        db.add(FamilyMembership(family_id=family.id, user_id=parent.id, role=RoleEnum.parent))
+        db.add_all(
+            [FamilyMembership(family_id=family.id, user_id=child.id, role=RoleEnum.child) for child in children]
+        )
+        db.commit()
+        return family, parent, children
+
+    def test_bulk_adjust_writes_once_and_evaluates_each_user_once(self) -> None:
+        db = self._session_factory()
+        try:
+            family, parent, children = self._seed(db)
+            ensure_achievement_catalog(db)
+            payload = PointsBulkAdjustRequest(
+                entries=[
+                    PointsAdjustRequest(user_id=children[0].id, points_delta=10, description="Taschengeld"),
+                    PointsAdjustRequest(user_id=children[1].id, points_delta=10, description="Taschengeld"),
+                    PointsAdjustRequest(user_id=children[0].id, points_delta=5, description="Bonus"),
+                ]
+            )
+            with patch.object(
+                points_router,
+                "request_achievement_evaluation",
+                wraps=points_router.request_achievement_evaluation,
+            ) as request_evaluation:
+                result = points_router.adjust_points_bulk(
+                    family_id=family.id,
+                    payload=payload,
+                    current_user=parent,
+                    db=db,
+                )
+
+            self.assertEqual([entry.points_delta for entry in result], [10, 10, 5])
+            self.assertEqual(result[0].user_display_name, "Kind 0")
+            self.assertEqual(db.query(PointsLedger).count(), 3)
+            self.assertEqual(get_points_balance(db, family.id, children[0].id), 15)
+
+            events = db.query(LiveUpdateEvent).filter(LiveUpdateEvent.event_type == "points.adjusted").all()
+            self.assertEqual(len(events), 1)
+            self.assertEqual(json.loads(events[0].payload_json)["user_ids"], [children[0].id, children[1].id])
+
+            self.assertEqual(
+                [call.kwargs["user_id"] for call in request_evaluation.call_args_list],
+                [children[0].id, children[1].id],
+            )
+            # Ohne laufende Queue wird direkt im Request ausgewertet.
+            evaluated_user_ids = {row[0] for row in db.query(AchievementProgress.user_id).distinct()}
+            self.assertEqual(evaluated_user_ids, {children[0].id, children[1].id})
+        finally:
+            db.close()
+
+    def test_bulk_adjust_rejects_foreign_users_without_writing(self) -> None:
+        db = self._session_factory()
+        try:
+            family, parent, children = self._seed(db)
+            stranger = User(email="fremd@example.com", display_name="Fremd", password_hash=hash_password("123"))
+            db.add(stranger)
+            db.commit()
+            with self.assertRaises(HTTPException) as ctx:
+                points_router.adjust_points_bulk(
+                    family_id=family.id,
+                    payload=PointsBulkAdjustRequest(
+                        entries=[
+                            PointsAdjustRequest(user_id=children[0].id, points_delta=3, description="Bonus"),
+                            PointsAdjustRequest(user_id=stranger.id, points_delta=3, description="Bonus"),
+                        ]
+                    ),
+                    current_user=parent,
+                    db=db,
+                )
+            self.assertEqual(ctx.exception.status_code, 404)
+            self.assertEqual(db.query(PointsLedger).count(), 0)
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import ledger_compaction
+from app.database import Base
+from app.ledger_compaction import LedgerCompactionError, compact_family_ledger, compactable_family_ids
+from app.models import (
+    Family,
+    FamilyMembership,
+    PointsBalance,
+    PointsDailyRollup,
+    PointsLedger,
+    PointsLedgerArchive,
+    PointsSourceEnum,
+    RedemptionStatusEnum,
+    Reward,
+    RewardRedemption,
+    RoleEnum,
+    User,
+)
+from app.routers import points as points_router
+from app.security import hash_password
+from app.services import rebuild_points_daily_rollups, reconcile_points_balances
+
+
+class PointsLedgerCompactionTests(unittest.TestCase):
+    def setUp(self) -> None:
+        fd, db_path = tempfile.mkstemp(prefix="hq-ledger-compaction-test-", suffix=".sqlite3")
+        os.close(fd)
+        self._db_path = db_path
+        self._engine = create_engine(
+            f"sqlite:///{db_path}",
+            connect_args={"check_same_thread": False},
+        )
+        self._session_factory = sessionmaker(bind=self._engine, autoflush=False, autocommit=False)
+        Base.metadata.create_all(bind=self._engine)
+        patcher = patch.object(points_router, "SessionLocal", self._session_factory)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        self._engine.dispose()
+        if os.path.exists(self._db_path):
+            os.unlink(self._db_path)
+
+    def _seed(self, db):
+        family = Family(name="Testfamilie")
+        parent = User(email="eltern@example.com", display_name="Eltern", password_hash=hash_password("123"))
+        children = [
+            User(email=f"kind{index}@example.com", display_name=f"Kind {index}", password_hash=hash_password("123"))
+            for index in range(2)
+        ]
+        db.add_all([family, parent, *children])
+        db.flush()
+        db.add(FamilyMembership(family_id=family.id, user_id=parent.id, role=RoleEnum.parent))
+        db.add_all(
+            [FamilyMembership(family_id=family.id, user_id=child.id, role=RoleEnum.child) for child in children]
+        )
+        reward = Reward(family_id=family.id, title="Kino", cost_points=30, created_by_id=parent.id)
+        db.add(reward)
+        db.flush()
+        approved = RewardRedemption(reward_id=reward.id, requested_by_id=children[0].id, status=RedemptionStatusEnum.approved)
+        pending = RewardRedemption(reward_id=reward.id, requested_by_id=children[0].id, status=RedemptionStatusEnum.pending)
+        db.add_all([approved, pending])
+        db.flush()
+
+        start = datetime(2024, 1, 1, 9, 0, 0)
+        for index in range(300):
+            child = children[index % 2]
+            db.add(
+                PointsLedger(
+                    family_id=family.id,
+                    user_id=child.id,
+                    source_type=PointsSourceEnum.task_approval if index % 7 else PointsSourceEnum.task_penalty,
+                    source_id=index,
+                    points_delta=10 if index % 7 else -3,
+                    description=f"Eintrag {index}",
+                    created_at=start + timedelta(days=index * 2),
+                )
+            )
+        for redemption, created_at in ((approved, start + timedelta(days=10)), (pending, start + timedelta(days=20))):
+            db.add(
+                PointsLedger(
+                    family_id=family.id,
+                    user_id=children[0].id,
+                    source_type=PointsSourceEnum.reward_redemption,
+                    source_id=redemption.id,
+                    points_delta=-30,
+                    description="Belohnung",
+                    created_at=created_at,
+                )
+            )
+        # Nullsumme: erzeugt keinen Uebertrag.
+        for delta in (5, -5):
+            db.add(
+                PointsLedger(
+                    family_id=family.id,
+                    user_id=parent.id,
+                    source_type=PointsSourceEnum.manual_adjustment,
+                    source_id=0,
+                    points_delta=delta,
+                    description="Korrektur",
+                    created_at=start,
+                )
+            )
+        db.commit()
+        return family, parent, children, pending, start
+
+    def _balances(self, db, family):
+        return {
+            row.user_id: (row.balance, row.earned_total, row.spent_total)
+            for row in db.query(PointsBalance).filter(PointsBalance.family_id == family.id)
+        }
+
+    def _rollups(self, db):
+        return [
+            (row.user_id, row.day, row.earned, row.spent, row.net, row.task_approvals)
+            for row in db.query(PointsDailyRollup).order_by(PointsDailyRollup.user_id, PointsDailyRollup.day)
+        ]
+
+    def test_compaction_moves_rows_and_keeps_totals(self) -> None:
+        db = self._session_factory()
+        try:
+            family, parent, children, pending, start = self._seed(db)
+            original_ids = sorted(row[0] for row in db.query(PointsLedger.id))
+            balances = self._balances(db, family)
+            rollups = self._rollups(db)
+            cutoff = start + timedelta(days=400)
+
+            self.assertEqual(compactable_family_ids(db, cutoff), [family.id])
+            result = compact_family_ledger(db, family.id, cutoff)
+            db.commit()
+
+            self.assertEqual(result.opening_rows, 2)
+            self.assertEqual(db.query(PointsLedgerArchive).count(), result.archived_rows)
+            openings = (
+                db.query(PointsLedger)
+                .filter(PointsLedger.source_type == PointsSourceEnum.opening_balance)
+                .order_by(PointsLedger.user_id)
+                .all()
+            )
+            self.assertEqual([row.user_id for row in openings], [child.id for child in children])
+            self.assertEqual(
+                db.query(PointsLedger)
+                .filter(
+                    PointsLedger.created_at < cutoff,
+                    PointsLedger.source_type != PointsSourceEnum.opening_balance,
+                )
+                .one()
+                .source_id,
+                pending.id,
+            )
+            self.assertEqual(
+                db.query(PointsLedger).count() + db.query(PointsLedgerArchive).count(),
+                len(original_ids) + len(openings),
+            )
+
+            self.assertEqual(self._balances(db, family), balances)
+            self.assertEqual(reconcile_points_balances(db), 0)
+            rebuild_points_daily_rollups(db)
+            db.commit()
+            self.assertEqual(self._rollups(db), rollups)
+            self.assertEqual(compactable_family_ids(db, cutoff), [])
+            self.assertEqual(compact_family_ledger(db, family.id, cutoff).archived_rows, 0)
+
+            user_names = points_router._family_user_name_map(db, family.id)
+            lines = "".join(
+                points_router._iter_ledger_export(family.id, None, "ndjson", user_names, None, None, None, True)
+            ).splitlines()
+            self.assertEqual([json.loads(line)["id"] for line in lines], original_ids)
+
+            # Ein spaeterer Lauf faltet den alten Uebertrag in den neuen.
+            later = compact_family_ledger(db, family.id, cutoff + timedelta(days=100))
+            db.commit()
+            self.assertGreater(later.archived_rows, 0)
+            self.assertEqual(
+                db.query(PointsLedger).filter(PointsLedger.source_type == PointsSourceEnum.opening_balance).count(),
+                2,
+            )
+            self.assertEqual(self._balances(db, family), balances)
+            self.assertEqual(reconcile_points_balances(db), 0)
+        finally:
+            db.close()
+
+    def test_failed_verification_rolls_back(self) -> None:
+        db = self._session_factory()
+        try:
+            family, _, _, _, start = self._seed(db)
+            ledger_count = db.query(PointsLedger).count()
+            with patch.object(ledger_compaction, "_verification_snapshot", side_effect=[{"hot": {}}, {"hot": {1: 1}}]):
+                with self.assertRaises(LedgerCompactionError):
+                    compact_family_ledger(db, family.id, start + timedelta(days=400))
+            db.rollback()
+            self.assertEqual(db.query(PointsLedger).count(), ledger_count)
+            self.assertEqual(db.query(PointsLedgerArchive).count(), 0)
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Family, FamilyMembership, PointsLedger, PointsSourceEnum, RoleEnum, User
+from app.routers import points as points_router
+from app.security import hash_password
+
+
+class PointsLedgerExportTests(unittest.TestCase):
+    def setUp(self) -> None:
+        fd, db_path = tempfile.mkstemp(prefix="hq-ledger-export-test-", suffix=".sqlite3")
+        os.close(fd)
+        self._db_path = db_path
+        self._engine = create_engine(
+            f"sqlite:///{db_path}",
+            connect_args={"check_same_thread": False},
+        )
+        self._session_factory = sessionmaker(bind=self._engine, autoflush=False, autocommit=False)
+        Base.metadata.create_all(bind=self._engine)
+        patcher = patch.object(points_router, "SessionLocal", self._session_factory)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        self._engine.dispose()
+        if os.path.exists(self._db_path):
+            os.unlink(self._db_path)
+
+    def _seed(self, db):
+        family = Family(name="Testfamilie")
+        parent = User(email="eltern@example.com", display_name="Eltern", password_hash=hash_password("123"))
+        child = User(email="kind@example.com", display_name="=Kind", password_hash=hash_password("123"))
+        db.add_all([family, parent, child])
+        db.flush()
+        db.add_all(
+            [
+                FamilyMembership(family_id=family.id, user_id=parent.id, role=RoleEnum.parent),
+                FamilyMembership(family_id=family.id, user_id=child.id, role=RoleEnum.child),
+            ]
+        )
+        start = datetime(2025, 1, 1, 8, 0, 0)
+        for index in range(1203):
+            db.add(
+                PointsLedger(
+                    family_id=family.id,
+                    user_id=child.id if index % 3 else parent.id,
+                    source_type=PointsSourceEnum.task_approval,
+                    source_id=index,
+                    points_delta=5,
+                    description=f"Aufgabe {index}, erledigt",
+                    created_at=start + timedelta(hours=index),
+                )
+            )
+        db.commit()
+        return family, parent, child
+
+    def _export_chunks(self, family, user_names, *, export_format: str, user_id: int | None = None) -> list[str]:
+        return list(
+            points_router._iter_ledger_export(
+                family.id,
+                user_id,
+                export_format,
+                user_names,
+                None,
+                None,
+                None,
+            )
+        )
+
+    def test_csv_export_streams_in_batches(self) -> None:
+        db = self._session_factory()
+        try:
+            family, _, child = self._seed(db)
+            user_names = points_router._family_user_name_map(db, family.id)
+            chunks = self._export_chunks(family, user_names, export_format="csv")
+
+            self.assertEqual(len(chunks), 3)
+            rows = list(csv.reader(io.StringIO("".join(chunks))))
+            self.assertEqual(rows[0][0:3], ["id", "created_at", "user_id"])
+            self.assertEqual(len(rows), 1204)
+            self.assertEqual([int(row[0]) for row in rows[1:]], sorted(int(row[0]) for row in rows[1:]))
+            child_row = next(row for row in rows[1:] if int(row[2]) == child.id)
+            self.assertEqual(child_row[3], "'=Kind")
+            self.assertTrue(child_row[7].startswith("Aufgabe "))
+        finally:
+            db.close()
+
+    def test_ndjson_export_and_child_scope(self) -> None:
+        db = self._session_factory()
+        try:
+            family, parent, child = self._seed(db)
+            user_names = points_router._family_user_name_map(db, family.id)
+            lines = "".join(
+                self._export_chunks(family, user_names, export_format="ndjson", user_id=child.id)
+            ).splitlines()
+            self.assertEqual(len(lines), 802)
+            first = json.loads(lines[0])
+            self.assertEqual(first["user_display_name"], "=Kind")
+            self.assertEqual(first["source_type"], "task_approval")
+
+            response = points_router.export_ledger(
+                family_id=family.id,
+                export_format="ndjson",
+                user_id=None,
+                source_type=None,
+                created_from=None,
+                created_to=None,
+                current_user=child,
+                db=db,
+            )
+            self.assertEqual(response.media_type, "application/x-ndjson")
+            self.assertIn(f'homequests-punkte-{family.id}-{child.id}.ndjson', response.headers["content-disposition"])
+
+            with self.assertRaises(HTTPException):
+                points_router.export_ledger(
+                    family_id=family.id,
+                    export_format="csv",
+                    user_id=parent.id,
+                    source_type=None,
+                    created_from=None,
+                    created_to=None,
+                    current_user=child,
+                    db=db,
+                )
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException, Response
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.migrations import _add_points_ledger_keyset_indexes
+from app.models import Family, FamilyMembership, PointsLedger, PointsSourceEnum, RoleEnum, User
+from app.routers.points import export_ledger, list_ledger, list_user_ledger
+from app.security import hash_password
+
+
+class PointsLedgerPageTests(unittest.TestCase):
+    def setUp(self) -> None:
+        fd, db_path = tempfile.mkstemp(prefix="hq-ledger-pages-test-", suffix=".sqlite3")
+        os.close(fd)
+        self._db_path = db_path
+        self._engine = create_engine(
+            f"sqlite:///{db_path}",
+            connect_args={"check_same_thread": False},
+        )
+        self._session_factory = sessionmaker(bind=self._engine, autoflush=False, autocommit=False)
+        Base.metadata.create_all(bind=self._engine)
+        _add_points_ledger_keyset_indexes(self._engine)
+
+    def tearDown(self) -> None:
+        self._engine.dispose()
+        if os.path.exists(self._db_path):
+            os.unlink(self._db_path)
+
+    def _seed(self, db):
+        family = Family(name="Testfamilie")
+        parent = User(email="eltern@example.com", display_name="Eltern", password_hash=hash_password("123"))
+        child = User(email="kind@example.com", display_name="Kind", password_hash=hash_password("123"))
+        db.add_all([family, parent, child])
+        db.flush()
+        db.add_all(
+            [
+                FamilyMembership(family_id=family.id, user_id=parent.id, role=RoleEnum.parent),
+                FamilyMembership(family_id=family.id, user_id=child.id, role=RoleEnum.child),
+            ]
+        )
+        start = datetime(2026, 1, 1, 8, 0, 0)
+        for index in range(25):
+            db.add(
+                PointsLedger(
+                    family_id=family.id,
+                    user_id=child.id if index % 5 else parent.id,
+                    source_type=PointsSourceEnum.task_penalty if index % 4 == 0 else PointsSourceEnum.task_approval,
+                    source_id=index,
+                    points_delta=-1 if index % 4 == 0 else 5,
+                    description=f"Eintrag {index}",
+                    created_at=start + timedelta(days=index),
+                )
+            )
+        db.commit()
+        return family, parent, child, start
+
+    def _user_page(self, db, family, parent, child, **kwargs):
+        response = Response()
+        params = {
+            "before_id": None,
+            "limit": 200,
+            "source_type": None,
+            "created_from": None,
+            "created_to": None,
+        }
+        params.update(kwargs)
+        entries = list_user_ledger(
+            family_id=family.id,
+            user_id=child.id,
+            response=response,
+            current_user=parent,
+            db=db,
+            **params,
+        )
+        return entries, response.headers.get("X-Next-Cursor")
+
+    def test_user_ledger_pages_backwards_by_id(self) -> None:
+        db = self._session_factory()
+        try:
+            family, parent, child, _ = self._seed(db)
+            seen: list[int] = []
+            cursor = None
+            while True:
+                entries, next_cursor = self._user_page(
+                    db,
+                    family,
+                    parent,
+                    child,
+                    limit=7,
+                    before_id=int(cursor) if cursor else None,
+                )
+                seen.extend(entry.id for entry in entries)
+                if not next_cursor:
+                    break
+                cursor = next_cursor
+            expected = [
+                row.id
+                for row in db.query(PointsLedger)
+                .filter(PointsLedger.user_id == child.id)
+                .order_by(PointsLedger.id.desc())
+            ]
+            self.assertEqual(seen, expected)
+        finally:
+            db.close()
+
+    def test_filters_by_source_type_and_range(self) -> None:
+        db = self._session_factory()
+        try:
+            family, parent, child, start = self._seed(db)
+            entries, next_cursor = self._user_page(
+                db,
+                family,
+                parent,
+                child,
+                source_type=PointsSourceEnum.task_penalty,
+                created_from=start + timedelta(days=4),
+                created_to=start + timedelta(days=20),
+            )
+            self.assertIsNone(next_cursor)
+            self.assertEqual([entry.source_id for entry in entries], [16, 12, 8, 4])
+
+            family_response = Response()
+            family_entries = list_ledger(
+                family_id=family.id,
+                response=family_response,
+                before_id=None,
+                limit=3,
+                source_type=None,
+                created_from=None,
+                created_to=None,
+                current_user=parent,
+                db=db,
+            )
+            self.assertEqual([entry.source_id for entry in family_entries], [24, 23, 22])
+            self.assertEqual(family_response.headers["X-Next-Cursor"], str(family_entries[-1].id))
+
+            with self.assertRaises(HTTPException):
+                self._user_page(db, family, parent, child, created_from=start, created_to=start - timedelta(days=1))
+        finally:
+            db.close()
+
+    def test_range_accepts_mixed_naive_and_offset_values(self) -> None:
+        db = self._session_factory()
+        try:
+            family, parent, child, start = self._seed(db)
+            berlin = timezone(timedelta(hours=2))
+            # 10:00 +02:00 entspricht dem naiven UTC-Zeitpunkt 08:00 in created_at.
+            entries, _ = self._user_page(
+                db,
+                family,
+                parent,
+                child,
+                source_type=PointsSourceEnum.task_penalty,
+                created_from=(start + timedelta(days=4, hours=2)).replace(tzinfo=berlin),
+                created_to=start + timedelta(days=20),
+            )
+            self.assertEqual([entry.source_id for entry in entries], [16, 12, 8, 4])
+
+            with self.assertRaises(HTTPException) as ctx:
+                self._user_page(
+                    db,
+                    family,
+                    parent,
+                    child,
+                    created_from=start,
+                    created_to=(start - timedelta(days=1)).replace(tzinfo=timezone.utc),
+                )
+            self.assertEqual(ctx.exception.status_code, 400)
+            with self.assertRaises(HTTPException) as ctx:
+                export_ledger(
+                    family_id=family.id,
+                    export_format="csv",
+                    user_id=None,
+                    source_type=None,
+                    created_from=start.replace(tzinfo=timezone.utc),
+                    created_to=start - timedelta(days=1),
+                    include_archive=False,
+                    current_user=parent,
+                    db=db,
+                )
+            self.assertEqual(ctx.exception.status_code, 400)
+        finally:
+            db.close()
+
+    def test_keyset_query_uses_composite_index(self) -> None:
+        with self._engine.connect() as conn:
+            plan = " | ".join(
+                str(row[-1])
+                for row in conn.exec_driver_sql(
+                    "EXPLAIN QUERY PLAN SELECT * FROM points_ledger "
+                    "WHERE family_id = 1 AND user_id = 2 AND id < 100 ORDER BY id DESC LIMIT 51"
+                ).all()
+            )
+        self.assertIn("ix_points_ledger_family_user_id", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.migrations import _create_points_daily_rollups_table
+from app.models import (
+    Family,
+    FamilyMembership,
+    PointsDailyRollup,
+    PointsLedger,
+    PointsSourceEnum,
+    RedemptionStatusEnum,
+    Reward,
+    RewardContribution,
+    RewardContributionStatusEnum,
+    RewardRedemption,
+    RoleEnum,
+    User,
+)
+from app.routers.points import get_points_stats
+from app.security import hash_password
+from sql_capture import capture_statements
+from app.services import rebuild_points_daily_rollups
+
+
+class PointsStatsRollupTests(unittest.TestCase):
+    def setUp(self) -> None:
+        fd, db_path = tempfile.mkstemp(prefix="hq-points-stats-test-", suffix=".sqlite3")
+        os.close(fd)
+        self._db_path = db_path
+        self._engine = create_engine(
+            f"sqlite:///{db_path}",
+            connect_args={"check_same_thread": False},
+        )
+        self._session_factory = sessionmaker(bind=self._engine, autoflush=False, autocommit=False)
+        Base.metadata.create_all(bind=self._engine)
+
+    def tearDown(self) -> None:
+        self._engine.dispose()
+        if os.path.exists(self._db_path):
+            os.unlink(self._db_path)
+
+    def _seed(self, db):
+        family = Family(name="Testfamilie")
+        parent = User(email="eltern@example.com", display_name="Eltern", password_hash=hash_password("123"))
+        child = User(email="kind@example.com", display_name="Kind", password_hash=hash_password("123"))
+        db.add_all([family, parent, child])
+        db.flush()
+        db.add_all(
+            [
+                FamilyMembership(family_id=family.id, user_id=parent.id, role=RoleEnum.parent),
+                FamilyMembership(family_id=family.id, user_id=child.id, role=RoleEnum.child),
+            ]
+        )
+        now = datetime.utcnow().replace(hour=12, minute=0, second=0, microsecond=0)
+        entries = []
+        for days_ago in range(0, 800, 3):
+            created_at = now - timedelta(days=days_ago)
+            entries.append((PointsSourceEnum.task_approval, 10, created_at))
+            if days_ago % 9 == 0:
+                entries.append((PointsSourceEnum.reward_redemption, -25, created_at))
+            if days_ago % 15 == 0:
+                entries.append((PointsSourceEnum.task_penalty, -2, created_at))
+        entries.append((PointsSourceEnum.achievement_unlock, 50, now))
+        for source_type, delta, created_at in entries:
+            db.add(
+                PointsLedger(
+                    family_id=family.id,
+                    user_id=child.id,
+                    source_type=source_type,
+                    source_id=0,
+                    points_delta=delta,
+                    description="Test",
+                    created_at=created_at,
+                )
+            )
+        db.commit()
+        return family, parent, child, entries
+
+    def test_stats_read_rollups_instead_of_ledger(self) -> None:
+        db = self._session_factory()
+        try:
+            family, parent, child, entries = self._seed(db)
+            with capture_statements(self._engine) as statements:
+                stats = get_points_stats(family_id=family.id, user_id=child.id, current_user=parent, db=db)
+
+            self.assertFalse(any("FROM points_ledger" in statement and "GROUP BY" not in statement for statement in statements))
+            earned = sum(delta for source, delta, _ in entries if delta > 0)
+            spent = sum(-delta for source, delta, _ in entries if source == PointsSourceEnum.reward_redemption)
+            self.assertEqual(stats.lifetime_earned_points, earned)
+            self.assertEqual(stats.lifetime_spent_points, spent)
+            self.assertEqual(stats.approved_tasks_count, sum(1 for source, _, _ in entries if source == PointsSourceEnum.task_approval))
+            self.assertEqual(stats.active_days, 799)
+            self.assertEqual(stats.current_points, sum(delta for _, delta, _ in entries))
+
+            today_bucket = stats.trends_daily[-1]
+            self.assertEqual((today_bucket.earned_points, today_bucket.spent_points, today_bucket.net_points), (60, 25, 33))
+            self.assertEqual(len(stats.trends_monthly), 12)
+            first_month = stats.trends_monthly[0].bucket_key
+            self.assertEqual(
+                sum(bucket.net_points for bucket in stats.trends_monthly),
+                sum(delta for _, delta, created_at in entries if created_at.date().isoformat() >= first_month),
+            )
+        finally:
+            db.close()
+
+    def test_reward_breakdown_comes_from_one_query(self) -> None:
+        db = self._session_factory()
+        try:
+            family, parent, child, _ = self._seed(db)
+            kino = Reward(family_id=family.id, title="Kino", cost_points=30, created_by_id=parent.id)
+            eis = Reward(family_id=family.id, title="Eis", cost_points=10, is_shareable=True, created_by_id=parent.id)
+            db.add_all([kino, eis])
+            db.flush()
+            redemptions = [
+                RewardRedemption(reward_id=kino.id, requested_by_id=child.id, status=RedemptionStatusEnum.approved),
+                RewardRedemption(reward_id=kino.id, requested_by_id=child.id, status=RedemptionStatusEnum.rejected),
+                RewardRedemption(reward_id=eis.id, requested_by_id=child.id, status=RedemptionStatusEnum.pending),
+            ]
+            contribution = RewardContribution(
+                family_id=family.id,
+                reward_id=eis.id,
+                user_id=child.id,
+                points_reserved=4,
+                status=RewardContributionStatusEnum.consumed,
+            )
+            db.add_all([*redemptions, contribution])
+            db.flush()
+            for source_type, source_id, delta in (
+                (PointsSourceEnum.reward_redemption, redemptions[0].id, -30),
+                (PointsSourceEnum.reward_redemption, redemptions[1].id, -30),
+                (PointsSourceEnum.reward_redemption, redemptions[1].id, 30),
+                (PointsSourceEnum.reward_contribution, contribution.id, -4),
+            ):
+                db.add(
+                    PointsLedger(
+                        family_id=family.id,
+                        user_id=child.id,
+                        source_type=source_type,
+                        source_id=source_id,
+                        points_delta=delta,
+                        description="Belohnung",
+                    )
+                )
+            db.commit()
+
+            with capture_statements(self._engine) as statements:
+                stats = get_points_stats(family_id=family.id, user_id=child.id, current_user=parent, db=db)
+
+            self.assertEqual(len([statement for statement in statements if "FROM reward" in statement]), 1)
+            self.assertEqual(
+                [(item.reward_title, item.request_count, item.approved_count, item.rejected_count, item.pending_count) for item in stats.reward_request_stats],
+                [("Kino", 2, 1, 1, 0), ("Eis", 1, 0, 0, 1)],
+            )
+            self.assertEqual(stats.reward_requests_count, 3)
+            self.assertEqual(stats.reward_contributions_count, 1)
+            self.assertEqual(
+                [(item.reward_title, item.points_spent, item.share_percent) for item in stats.reward_spent_stats],
+                [("Kino", 30, 88.24), ("Eis", 4, 11.76)],
+            )
+        finally:
+            db.close()
+
+    def test_rebuild_and_migration_match_incremental_rollups(self) -> None:
+        db = self._session_factory()
+        try:
+            family, _, child, _ = self._seed(db)
+
+            def snapshot():
+                return [
+                    (row.day, row.earned, row.spent, row.net, row.task_approvals)
+                    for row in db.query(PointsDailyRollup)
+                    .filter(PointsDailyRollup.family_id == family.id, PointsDailyRollup.user_id == child.id)
+                    .order_by(PointsDailyRollup.day.asc())
+                ]
+
+            incremental = snapshot()
+            self.assertEqual(len(incremental), 267)
+
+            rebuild_points_daily_rollups(db)
+            db.commit()
+            db.expire_all()
+            self.assertEqual(snapshot(), incremental)
+
+            db.execute(text("DELETE FROM points_daily_rollups"))
+            db.commit()
+            _create_points_daily_rollups_table(self._engine)
+            db.expire_all()
+            self.assertEqual(snapshot(), incremental)
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.deps import clear_principal_cache, get_current_user_from_token_value
+from app.models import Family, FamilyMembership, RoleEnum, User
+from app.rbac import find_membership, get_membership_or_403
+from app.security import create_access_token, hash_password
+from sql_capture import capture_statements
+
+
+class PrincipalCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        fd, db_path = tempfile.mkstemp(prefix="hq-principal-cache-test-", suffix=".sqlite3")
+        os.close(fd)
+        self._db_path = db_path
+        self._engine = create_engine(
+            f"sqlite:///{db_path}",
+            connect_args={"check_same_thread": False},
+        )
+        self._session_factory = sessionmaker(bind=self._engine, autoflush=False, autocommit=False)
+        Base.metadata.create_all(bind=self._engine)
+        clear_principal_cache()
+        self.addCleanup(clear_principal_cache)
+
+    def tearDown(self) -> None:
+        self._engine.dispose()
+        if os.path.exists(self._db_path):
+            os.unlink(self._db_path)
+
+    def _seed(self):
+        with self._session_factory() as db:
+            family = Family(name="Testfamilie")
+            parent = User(email="eltern@example.com", display_name="Eltern", password_hash=hash_password("123"))
+            child = User(email="kind@example.com", display_name="Kind", password_hash=hash_password("123"))
+            db.add_all([family, parent, child])
+            db.flush()
+            db.add_all(
+                [
+                    FamilyMembership(family_id=family.id, user_id=parent.id, role=RoleEnum.parent),
+                    FamilyMembership(family_id=family.id, user_id=child.id, role=RoleEnum.child),
+                ]
+            )
+            db.commit()
+            return family.id, parent.id, child.id
+
+    def _selects(self, callback) -> list[str]:
+        with capture_statements(self._engine) as statements:
+            callback()
+        return [statement for statement in statements if statement.lstrip().upper().startswith("SELECT")]
+
+    def test_user_and_membership_resolve_in_one_query_and_are_cached(self) -> None:
+        family_id, parent_id, child_id = self._seed()
+        token = create_access_token(str(child_id))
+
+        def authenticate() -> None:
+            with self._session_factory() as db:
+                user = get_current_user_from_token_value(token, db, family_id=family_id)
+                self.assertEqual(user.display_name, "Kind")
+                self.assertEqual(get_membership_or_403(db, family_id, user.id).role, RoleEnum.child)
+                self.assertIsNotNone(find_membership(db, family_id, user.id))
+
+        first = self._selects(authenticate)
+        self.assertEqual(len(first), 1)
+        self.assertIn("family_memberships", first[0])
+        self.assertEqual(self._selects(authenticate), [])
+
+        # Rollenwechsel verwirft den gemerkten Stand.
+        with self._session_factory() as db:
+            membership = find_membership(db, family_id, child_id)
+            membership.role = RoleEnum.parent
+            db.commit()
+        with self._session_factory() as db:
+            get_current_user_from_token_value(token, db, family_id=family_id)
+            self.assertEqual(get_membership_or_403(db, family_id, child_id).role, RoleEnum.parent)
+
+        # Entfernte Mitglieder verlieren den Zugriff sofort.
+        with self._session_factory() as db:
+            db.delete(find_membership(db, family_id, child_id))
+            db.commit()
+        with self._session_factory() as db:
+            get_current_user_from_token_value(token, db, family_id=family_id)
+            with self.assertRaises(HTTPException) as ctx:
+                get_membership_or_403(db, family_id, child_id)
+            self.assertEqual(ctx.exception.status_code, 403)
+
+        parent_token = create_access_token(str(parent_id))
+        with self._session_factory() as db:
+            get_current_user_from_token_value(parent_token, db, family_id=family_id)
+        with self._session_factory() as db:
+            db.get(User, parent_id).is_active = False
+            db.commit()
+        with self._session_factory() as db:
+            with self.assertRaises(HTTPException) as ctx:
+                get_current_user_from_token_value(parent_token, db, family_id=family_id)
+            self.assertEqual(ctx.exception.status_code, 401)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import (
+    Family,
+    FamilyMembership,
+    RecurrenceTypeEnum,
+    RoleEnum,
+    SpecialTaskIntervalEnum,
+    SpecialTaskTemplate,
+    Task,
+    TaskStatusEnum,
+    User,
+)
+from app.routers import tasks as tasks_router
+from app.security import hash_password
+from sql_capture import capture_statements, is_task_select
+
+
+class SpecialTaskUsageCountTests(unittest.TestCase):
+    def setUp(self) -> None:
+        fd, db_path = tempfile.mkstemp(prefix="hq-special-usage-test-", suffix=".sqlite3")
+        os.close(fd)
+        self._db_path = db_path
+        self._engine = create_engine(
+            f"sqlite:///{db_path}",
+            connect_args={"check_same_thread": False},
+        )
+        self._session_factory = sessionmaker(bind=self._engine, autoflush=False, autocommit=False)
+        Base.metadata.create_all(bind=self._engine)
+        tasks_router._special_usage_cache.clear()
+        # Der Advisory-Lock ist Postgres-spezifisch; die Tests laufen auf SQLite.
+        patcher = patch.object(tasks_router, "_lock_special_task_claim_window")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        tasks_router._special_usage_cache.clear()
+        self._engine.dispose()
+        if os.path.exists(self._db_path):
+            os.unlink(self._db_path)
+
+    def _seed(self, db):
+        family = Family(name="Testfamilie")
+        parent = User(email="eltern@example.com", display_name="Eltern", password_hash=hash_password("123"))
+        child = User(email="kind@example.com", display_name="Kind", password_hash=hash_password("123"))
+        db.add_all([family, parent, child])
+        db.flush()
+        db.add_all(
+            [
+                FamilyMembership(family_id=family.id, user_id=parent.id, role=RoleEnum.parent),
+                FamilyMembership(family_id=family.id, user_id=child.id, role=RoleEnum.child),
+            ]
+        )
+        templates = {
+            interval_type: SpecialTaskTemplate(
+                family_id=family.id,
+                title=f"Extra {interval_type.value}",
+                points=5,
+                interval_type=interval_type,
+                max_claims_per_interval=5,
+                created_by_id=parent.id,
+            )
+            for interval_type in SpecialTaskIntervalEnum
+        }
+        db.add_all(templates.values())
+        db.flush()
+
+        now = datetime.utcnow()
+        claims = [
+            (SpecialTaskIntervalEnum.daily, now),
+            (SpecialTaskIntervalEnum.daily, now - timedelta(days=1, minutes=1)),
+            (SpecialTaskIntervalEnum.weekly, now),
+            (SpecialTaskIntervalEnum.weekly, now),
+            (SpecialTaskIntervalEnum.weekly, now - timedelta(days=8)),
+            (SpecialTaskIntervalEnum.monthly, now),
+            (SpecialTaskIntervalEnum.monthly, now - timedelta(days=40)),
+        ]
+        for interval_type, created_at in claims:
+            db.add(
+                Task(
+                    family_id=family.id,
+                    title=templates[interval_type].title,
+                    assignee_id=child.id,
+                    points=5,
+                    recurrence_type=RecurrenceTypeEnum.none.value,
+                    special_template_id=templates[interval_type].id,
+                    status=TaskStatusEnum.approved,
+                    created_by_id=child.id,
+                    created_at=created_at,
+                )
+            )
+        db.commit()
+        return family, child, templates
+
+    def _task_selects(self, callback) -> int:
+        with capture_statements(self._engine) as statements:
+            callback()
+        return len([statement for statement in statements if is_task_select(statement)])
+
+    def test_counts_are_grouped_per_interval_and_cached_until_claim_or_unclaim(self) -> None:
+        db = self._session_factory()
+        try:
+            _, child, templates = self._seed(db)
+            ordered = list(templates.values())
+            counts: dict[int, int] = {}
+
+            def load() -> None:
+                counts.clear()
+                counts.update(tasks_router._special_task_usage_counts(db, ordered))
+
+            self.assertEqual(self._task_selects(load), 1)
+            self.assertEqual(
+                counts,
+                {
+                    templates[SpecialTaskIntervalEnum.daily].id: 1,
+                    templates[SpecialTaskIntervalEnum.weekly].id: 2,
+                    templates[SpecialTaskIntervalEnum.monthly].id: 1,
+                },
+            )
+            self.assertEqual(self._task_selects(load), 0)
+
+            daily = templates[SpecialTaskIntervalEnum.daily]
+            claimed = tasks_router.claim_special_task(daily.id, current_user=child, db=db)
+            self.assertEqual(self._task_selects(load), 1)
+            self.assertEqual(counts[daily.id], 2)
+
+            tasks_router.unclaim_special_task(claimed.id, current_user=child, db=db)
+            self.assertEqual(self._task_selects(load), 1)
+            self.assertEqual(counts[daily.id], 1)
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import call, patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import (
+    Family,
+    LiveUpdateEvent,
+    PointsLedger,
+    PointsSourceEnum,
+    RecurrenceTypeEnum,
+    Task,
+    TaskStatusEnum,
+    User,
+)
+from app.routers import tasks as tasks_router
+from app.routers.tasks import _apply_penalties_for_family
+from app.security import hash_password
+
+
+class TaskPenaltyTests(unittest.TestCase):
+    def setUp(self) -> None:
+        fd, db_path = tempfile.mkstemp(prefix="hq-penalties-test-", suffix=".sqlite3")
+        os.close(fd)
+        self._db_path = db_path
+        self._engine = create_engine(
+            f"sqlite:///{db_path}",
+            connect_args={"check_same_thread": False},
+        )
+        self._session_factory = sessionmaker(bind=self._engine, autoflush=False, autocommit=False)
+        Base.metadata.create_all(bind=self._engine)
+
+    def tearDown(self) -> None:
+        self._engine.dispose()
+        if os.path.exists(self._db_path):
+            os.unlink(self._db_path)
+
+    def test_family_penalties_are_written_in_one_batch(self) -> None:
+        db = self._session_factory()
+        try:
+            family = Family(name="Testfamilie")
+            children = [
+                User(email=f"kind{index}@example.com", display_name=f"Kind {index}", password_hash=hash_password("123"))
+                for index in range(2)
+            ]
+            db.add_all([family, *children])
+            db.flush()
+            now = datetime.utcnow()
+            overdue = []
+            for index in range(3):
+                task = Task(
+                    family_id=family.id,
+                    title=f"Aufgabe {index}",
+                    assignee_id=children[index % 2].id,
+                    due_at=now - timedelta(hours=index + 1),
+                    points=5,
+                    recurrence_type=RecurrenceTypeEnum.daily.value,
+                    penalty_enabled=True,
+                    penalty_points=2 + index,
+                    status=TaskStatusEnum.open,
+                    created_by_id=children[0].id,
+                )
+                overdue.append(task)
+            not_due = Task(
+                family_id=family.id,
+                title="Spaeter",
+                assignee_id=children[0].id,
+                due_at=now + timedelta(hours=2),
+                recurrence_type=RecurrenceTypeEnum.daily.value,
+                penalty_enabled=True,
+                penalty_points=5,
+                status=TaskStatusEnum.open,
+                created_by_id=children[0].id,
+            )
+            db.add_all([*overdue, not_due])
+            db.commit()
+
+            with patch.object(tasks_router, "request_achievement_evaluation") as request_evaluation:
+                self.assertTrue(_apply_penalties_for_family(db, family.id))
+            db.commit()
+            # Punkte-Erfolge der betroffenen Kinder werden einmal pro Kind nachgezogen.
+            self.assertEqual(
+                request_evaluation.call_args_list,
+                [call(db, family.id, child.id, reason="task_penalty_applied") for child in children],
+            )
+
+            entries = db.query(PointsLedger).order_by(PointsLedger.source_id.asc()).all()
+            self.assertEqual([entry.source_id for entry in entries], [task.id for task in overdue])
+            self.assertTrue(all(entry.source_type == PointsSourceEnum.task_penalty for entry in entries))
+            self.assertEqual([entry.points_delta for entry in entries], [-2, -3, -4])
+            for task in overdue:
+                db.refresh(task)
+                self.assertEqual(task.penalty_last_applied_at, task.due_at)
+            db.refresh(not_due)
+            self.assertIsNone(not_due.penalty_last_applied_at)
+
+            events = db.query(LiveUpdateEvent).filter(LiveUpdateEvent.event_type == "points.adjusted").all()
+            self.assertEqual(len(events), 1)
+            payload = json.loads(events[0].payload_json)
+            self.assertEqual(payload["points_delta"], -9)
+            self.assertEqual(payload["user_ids"], sorted(child.id for child in children))
+
+            self.assertFalse(_apply_penalties_for_family(db, family.id))
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
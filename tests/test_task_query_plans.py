@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.maintenance import _maintenance_family_ids
+from app.migrations import _add_task_maintenance_indexes, _create_weekly_flexible_series_states_table
+from app.models import Family, RecurrenceTypeEnum, Task, TaskStatusEnum, User
+from app.routers import tasks as tasks_router
+from app.security import hash_password
+from sql_capture import capture_statements, is_task_select
+
+
+def _inline_parameters(statement: str, parameters) -> str:
+    # Wie psycopg2 werden Parameter clientseitig eingesetzt, damit partielle Indizes greifen koennen.
+    rendered = statement
+    for value in parameters:
+        if value is None:
+            literal = "NULL"
+        elif isinstance(value, bool):
+            literal = "1" if value else "0"
+        elif isinstance(value, (int, float)):
+            literal = str(value)
+        else:
+            literal = "'" + str(value).replace("'", "''") + "'"
+        rendered = rendered.replace("?", literal, 1)
+    return rendered
+
+
+class TaskQueryPlanTests(unittest.TestCase):
+    def setUp(self) -> None:
+        fd, db_path = tempfile.mkstemp(prefix="hq-query-plans-test-", suffix=".sqlite3")
+        os.close(fd)
+        self._db_path = db_path
+        self._engine = create_engine(
+            f"sqlite:///{db_path}",
+            connect_args={"check_same_thread": False},
+        )
+        self._session_factory = sessionmaker(bind=self._engine, autoflush=False, autocommit=False)
+        Base.metadata.create_all(bind=self._engine)
+        _create_weekly_flexible_series_states_table(self._engine)
+        _add_task_maintenance_indexes(self._engine)
+        tasks_router._weekly_flexible_watermarks.clear()
+        self._seed()
+
+    def tearDown(self) -> None:
+        tasks_router._weekly_flexible_watermarks.clear()
+        self._engine.dispose()
+        if os.path.exists(self._db_path):
+            os.unlink(self._db_path)
+
+    def _seed(self) -> None:
+        now = datetime.utcnow()
+        with self._session_factory() as db:
+            families = [Family(name=f"Familie {index}") for index in range(4)]
+            users = [
+                User(email=f"user{index}@example.com", display_name=f"User {index}", password_hash=hash_password("123"))
+                for index in range(4)
+            ]
+            db.add_all(families + users)
+            db.flush()
+            rows = []
+            for family, user in zip(families, users):
+                for day in range(400):
+                    created = now - timedelta(days=day + 1)
+                    rows.append(
+                        Task(
+                            family_id=family.id,
+                            title="Zaehne putzen",
+                            assignee_id=user.id,
+                            due_at=created + timedelta(hours=12),
+                            points=5,
+                            recurrence_type=RecurrenceTypeEnum.daily.value,
+                            status=TaskStatusEnum.approved,
+                            is_active=day % 3 == 0,
+                            created_by_id=user.id,
+                            created_at=created,
+                            updated_at=created,
+                        )
+                    )
+                for week in range(60):
+                    created = now - timedelta(weeks=week + 1)
+                    rows.append(
+                        Task(
+                            family_id=family.id,
+                            title="Zimmer aufraeumen",
+                            assignee_id=user.id,
+                            due_at=None,
+                            points=10,
+                            recurrence_type=RecurrenceTypeEnum.weekly.value,
+                            status=TaskStatusEnum.approved,
+                            is_active=True,
+                            created_by_id=user.id,
+                            created_at=created,
+                            updated_at=created,
+                        )
+                    )
+                rows.append(
+                    Task(
+                        family_id=family.id,
+                        title="Muell rausbringen",
+                        assignee_id=user.id,
+                        due_at=now + timedelta(hours=6),
+                        points=5,
+                        recurrence_type=RecurrenceTypeEnum.daily.value,
+                        penalty_enabled=True,
+                        penalty_points=3,
+                        status=TaskStatusEnum.open,
+                        is_active=True,
+                        created_by_id=user.id,
+                        created_at=now - timedelta(hours=1),
+                        updated_at=now - timedelta(hours=1),
+                    )
+                )
+            db.add_all(rows)
+            db.commit()
+        with self._engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+
+    def _capture_task_queries(self, fn) -> list[str]:
+        with capture_statements(self._engine, with_parameters=True) as captured:
+            with self._session_factory() as db:
+                fn(db)
+                db.rollback()
+
+        plans: list[str] = []
+        with self._engine.connect() as conn:
+            for statement, parameters in captured:
+                if not is_task_select(statement):
+                    continue
+                rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + _inline_parameters(statement, parameters)).all()
+                plans.append(" | ".join(str(row[-1]) for row in rows))
+        return plans
+
+    def test_open_like_maintenance_queries_use_partial_index(self) -> None:
+        for fn in (
+            lambda db: tasks_router._realign_daily_tasks_for_family(db, 1),
+            lambda db: tasks_router._rollover_missed_tasks_for_family(db, 1),
+            lambda db: tasks_router._apply_penalties_for_family(db, 1),
+        ):
+            plans = self._capture_task_queries(fn)
+            self.assertIn("ix_tasks_family_open_like_due", plans[0])
+
+    def test_weekly_flexible_queries_use_partial_indexes(self) -> None:
+        plans = self._capture_task_queries(lambda db: tasks_router._advance_weekly_flexible_tasks_for_family(db, 1))
+        self.assertIn("ix_tasks_family_weekly_flexible", plans[0])
+
+        with self._session_factory() as db:
+            tasks_router._advance_weekly_flexible_tasks_for_family(db, 1)
+            db.commit()
+        plans = self._capture_task_queries(lambda db: tasks_router._advance_weekly_flexible_tasks_for_family(db, 1))
+        self.assertIn("ix_tasks_weekly_flexible_family_updated", plans[0])
+
+    def test_worker_family_discovery_avoids_table_scans(self) -> None:
+        plans = self._capture_task_queries(lambda db: _maintenance_family_ids(db, datetime.utcnow()))
+        self.assertEqual(len(plans), 4)
+        for plan in plans[:3]:
+            self.assertIn("ix_tasks_family_open_like_due", plan)
+        self.assertRegex(plans[3], r"ix_tasks_(family_weekly_flexible|weekly_flexible_family_updated)")
+
+
+if __name__ == "__main__":
+    unittest.main()
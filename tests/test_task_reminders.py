@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from fastapi import Response
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from app.database import Base
+from app.models import (
+    Family,
+    FamilyMembership,
+    RecurrenceTypeEnum,
+    RoleEnum,
+    Task,
+    TaskReminderOccurrence,
+    TaskStatusEnum,
+    User,
+)
+from app.routers.tasks import _refresh_task_reminder_schedule, list_upcoming_task_reminders
+from app.security import hash_password
+
+
+class TaskReminderScheduleTests(unittest.TestCase):
+    def setUp(self) -> None:
+        fd, db_path = tempfile.mkstemp(prefix="hq-reminders-test-", suffix=".sqlite3")
+        os.close(fd)
+        self._db_path = db_path
+        self._engine = create_engine(
+            f"sqlite:///{db_path}",
+            connect_args={"check_same_thread": False},
+        )
+        self._session_factory = sessionmaker(bind=self._engine, autoflush=False, autocommit=False)
+        Base.metadata.create_all(bind=self._engine)
+
+    def tearDown(self) -> None:
+        self._engine.dispose()
+        if os.path.exists(self._db_path):
+            os.unlink(self._db_path)
+
+    @staticmethod
+    def _make_request(headers: list[tuple[bytes, bytes]] | None = None) -> Request:
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/families/1/tasks/reminders/upcoming",
+            "headers": headers or [],
+            "scheme": "http",
+            "query_string": b"",
+            "client": ("testclient", 12345),
+            "server": ("testserver", 80),
+        }
+        return Request(scope)
+
+    def _seed(self, db):
+        family = Family(name="Testfamilie")
+        parent = User(email="eltern@example.com", display_name="Eltern", password_hash=hash_password("123"))
+        child = User(email="kind@example.com", display_name="Kind", password_hash=hash_password("123"))
+        db.add_all([family, parent, child])
+        db.flush()
+        db.add_all(
+            [
+                FamilyMembership(family_id=family.id, user_id=parent.id, role=RoleEnum.parent),
+                FamilyMembership(family_id=family.id, user_id=child.id, role=RoleEnum.child),
+            ]
+        )
+        now = datetime.utcnow().replace(microsecond=0)
+
+        def task(title: str, due_in: timedelta, offsets: list[int], recurrence: str, series_id: str | None = None):
+            return Task(
+                family_id=family.id,
+                title=title,
+                assignee_id=child.id,
+                due_at=now + due_in,
+                reminder_offsets_minutes=offsets,
+                recurrence_type=recurrence,
+                series_id=series_id,
+                status=TaskStatusEnum.open,
+                created_by_id=parent.id,
+            )
+
+        db.add_all(
+            [
+                task("Zaehne putzen", timedelta(hours=3), [15, 45, 60], RecurrenceTypeEnum.daily.value),
+                task("Blumen giessen", timedelta(hours=2), [30], RecurrenceTypeEnum.weekly.value, "series-blumen"),
+                task("Blumen giessen", timedelta(days=7, hours=2), [30], RecurrenceTypeEnum.weekly.value, "series-blumen"),
+                task("Arzttermin", timedelta(hours=5), [60], RecurrenceTypeEnum.none.value),
+            ]
+        )
+        db.commit()
+        return family, parent
+
+    def test_schedule_materializes_deduplicated_occurrences(self) -> None:
+        db = self._session_factory()
+        try:
+            family, _ = self._seed(db)
+            _refresh_task_reminder_schedule(db, family.id)
+            db.commit()
+
+            rows = db.query(TaskReminderOccurrence).order_by(TaskReminderOccurrence.notify_at.asc()).all()
+            self.assertEqual(
+                [(row.title, row.reminder_offset_minutes) for row in rows],
+                [("Blumen giessen", 30), ("Zaehne putzen", 60), ("Zaehne putzen", 15), ("Arzttermin", 60)],
+            )
+            first_ids = [row.id for row in rows]
+
+            _refresh_task_reminder_schedule(db, family.id)
+            db.commit()
+            self.assertEqual(
+                [row.id for row in db.query(TaskReminderOccurrence).order_by(TaskReminderOccurrence.notify_at.asc())],
+                first_ids,
+            )
+
+            done = db.query(Task).filter(Task.title == "Arzttermin").one()
+            done.status = TaskStatusEnum.submitted
+            _refresh_task_reminder_schedule(db, family.id)
+            db.commit()
+            self.assertEqual(db.query(TaskReminderOccurrence).count(), 3)
+        finally:
+            db.close()
+
+    def test_touched_task_refresh_keeps_series_dedupe(self) -> None:
+        db = self._session_factory()
+        try:
+            family, _ = self._seed(db)
+            _refresh_task_reminder_schedule(db, family.id)
+            db.commit()
+
+            # Die erste Serienaufgabe faellt weg; die Folgeaufgabe derselben Serie uebernimmt die Erinnerung.
+            first, second = (
+                db.query(Task).filter(Task.series_id == "series-blumen").order_by(Task.due_at.asc()).all()
+            )
+            other_ids = sorted(
+                row.id
+                for row in db.query(TaskReminderOccurrence).filter(TaskReminderOccurrence.title != "Blumen giessen")
+            )
+            db.delete(first)
+            _refresh_task_reminder_schedule(db, family.id, [first])
+            db.commit()
+            blumen = db.query(TaskReminderOccurrence).filter(TaskReminderOccurrence.title == "Blumen giessen").one()
+            self.assertEqual(blumen.task_id, second.id)
+
+            # Termine anderer Aufgaben behalten ihre Zeilen.
+            self.assertEqual(
+                sorted(
+                    row.id
+                    for row in db.query(TaskReminderOccurrence).filter(TaskReminderOccurrence.title != "Blumen giessen")
+                ),
+                other_ids,
+            )
+        finally:
+            db.close()
+
+    def test_endpoint_pages_by_cursor_and_honours_etag(self) -> None:
+        db = self._session_factory()
+        try:
+            family, parent = self._seed(db)
+            _refresh_task_reminder_schedule(db, family.id)
+            db.commit()
+
+            first_response = Response()
+            first_page = list_upcoming_task_reminders(
+                family_id=family.id,
+                request=self._make_request(),
+                response=first_response,
+                assignee_id=None,
+                window_minutes=2880,
+                cursor=None,
+                limit=2,
+                current_user=parent,
+                db=db,
+            )
+            self.assertEqual([entry.title for entry in first_page], ["Blumen giessen", "Zaehne putzen"])
+            next_cursor = first_response.headers["X-Next-Cursor"]
+
+            second_page = list_upcoming_task_reminders(
+                family_id=family.id,
+                request=self._make_request(),
+                response=Response(),
+                assignee_id=None,
+                window_minutes=2880,
+                cursor=next_cursor,
+                limit=2,
+                current_user=parent,
+                db=db,
+            )
+            self.assertEqual(
+                [(entry.title, entry.reminder_offset_minutes) for entry in second_page],
+                [("Zaehne putzen", 15), ("Arzttermin", 60)],
+            )
+
+            etag = first_response.headers["ETag"]
+            not_modified = list_upcoming_task_reminders(
+                family_id=family.id,
+                request=self._make_request([(b"if-none-match", etag.encode("utf-8"))]),
+                response=Response(),
+                assignee_id=None,
+                window_minutes=2880,
+                cursor=None,
+                limit=2,
+                current_user=parent,
+                db=db,
+            )
+            self.assertEqual(not_modified.status_code, 304)
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
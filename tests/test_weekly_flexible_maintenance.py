@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import (
+    Family,
+    FamilyMembership,
+    RecurrenceTypeEnum,
+    RoleEnum,
+    Task,
+    TaskStatusEnum,
+    User,
+    WeeklyFlexibleSeriesState,
+)
+from app.routers import tasks as tasks_router
+from app.security import hash_password
+from sql_capture import capture_statements, is_task_select
+
+
+class WeeklyFlexibleMaintenanceTests(unittest.TestCase):
+    def setUp(self) -> None:
+        fd, db_path = tempfile.mkstemp(prefix="hq-weekly-flexible-test-", suffix=".sqlite3")
+        os.close(fd)
+        self._db_path = db_path
+        self._engine = create_engine(
+            f"sqlite:///{db_path}",
+            connect_args={"check_same_thread": False},
+        )
+        self._session_factory = sessionmaker(bind=self._engine, autoflush=False, autocommit=False)
+        Base.metadata.create_all(bind=self._engine)
+        tasks_router._weekly_flexible_watermarks.clear()
+
+    def tearDown(self) -> None:
+        tasks_router._weekly_flexible_watermarks.clear()
+        self._engine.dispose()
+        if os.path.exists(self._db_path):
+            os.unlink(self._db_path)
+
+    def _create_family(self):
+        db = self._session_factory()
+        family = Family(name="Testfamilie")
+        parent = User(email="eltern@example.com", display_name="Eltern", password_hash=hash_password("123"))
+        child = User(email="kind@example.com", display_name="Kind", password_hash=hash_password("123"))
+        db.add_all([family, parent, child])
+        db.flush()
+        db.add_all(
+            [
+                FamilyMembership(family_id=family.id, user_id=parent.id, role=RoleEnum.parent),
+                FamilyMembership(family_id=family.id, user_id=child.id, role=RoleEnum.child),
+            ]
+        )
+        db.commit()
+        return db, family, parent, child
+
+    def _weekly_task(self, family, parent, child, created_at: datetime, status: TaskStatusEnum) -> Task:
+        return Task(
+            family_id=family.id,
+            title="Zimmer aufraeumen",
+            assignee_id=child.id,
+            due_at=None,
+            points=10,
+            recurrence_type=RecurrenceTypeEnum.weekly.value,
+            series_id="series-zimmer",
+            status=status,
+            is_active=True,
+            created_by_id=parent.id,
+            created_at=created_at,
+            updated_at=created_at,
+        )
+
+    def test_missed_week_rolls_over_and_records_state(self) -> None:
+        db, family, parent, child = self._create_family()
+        try:
+            now_week_start = tasks_router._start_of_week(datetime.utcnow())
+            for weeks_ago in range(10, 1, -1):
+                db.add(
+                    self._weekly_task(
+                        family, parent, child, now_week_start - timedelta(weeks=weeks_ago), TaskStatusEnum.approved
+                    )
+                )
+            last_week = self._weekly_task(
+                family, parent, child, now_week_start - timedelta(days=3), TaskStatusEnum.open
+            )
+            db.add(last_week)
+            db.commit()
+
+            changed = tasks_router._advance_weekly_flexible_tasks_for_family(db, family.id)
+            db.commit()
+
+            self.assertTrue(changed)
+            db.refresh(last_week)
+            self.assertEqual(last_week.status, TaskStatusEnum.missed_submitted)
+            current = (
+                db.query(Task)
+                .filter(Task.family_id == family.id, Task.status == TaskStatusEnum.open, Task.is_active == True)  # noqa: E712
+                .one()
+            )
+            self.assertGreaterEqual(current.created_at, now_week_start)
+
+            state = db.query(WeeklyFlexibleSeriesState).filter(WeeklyFlexibleSeriesState.family_id == family.id).one()
+            self.assertEqual(state.latest_task_id, current.id)
+            self.assertEqual(state.cycle_start, now_week_start)
+            self.assertFalse(state.latest_approved)
+        finally:
+            db.close()
+
+    def test_incremental_pass_skips_unchanged_history(self) -> None:
+        db, family, parent, child = self._create_family()
+        try:
+            now_week_start = tasks_router._start_of_week(datetime.utcnow())
+            for weeks_ago in range(52, 0, -1):
+                db.add(
+                    self._weekly_task(
+                        family, parent, child, now_week_start - timedelta(weeks=weeks_ago), TaskStatusEnum.approved
+                    )
+                )
+            current = self._weekly_task(family, parent, child, now_week_start, TaskStatusEnum.open)
+            current.updated_at = datetime.utcnow() - timedelta(hours=1)
+            db.add(current)
+            db.commit()
+
+            tasks_router._advance_weekly_flexible_tasks_for_family(db, family.id)
+            db.commit()
+
+            with capture_statements(self._engine) as captured:
+                changed = tasks_router._advance_weekly_flexible_tasks_for_family(db, family.id)
+                db.commit()
+            statements = [statement for statement in captured if is_task_select(statement)]
+
+            self.assertFalse(changed)
+            # Nur die Abfrage nach geaenderten Aufgaben, keine Gruppen-Ladevorgaenge fuer die Historie.
+            self.assertEqual(len(statements), 1)
+            self.assertIn("updated_at >=", statements[0])
+        finally:
+            db.close()
+
+    def test_approval_in_current_week_updates_state_without_new_task(self) -> None:
+        db, family, parent, child = self._create_family()
+        try:
+            now_week_start = tasks_router._start_of_week(datetime.utcnow())
+            current = self._weekly_task(family, parent, child, now_week_start + timedelta(hours=1), TaskStatusEnum.open)
+            db.add(current)
+            db.commit()
+            tasks_router._advance_weekly_flexible_tasks_for_family(db, family.id)
+            db.commit()
+
+            current.status = TaskStatusEnum.approved
+            db.commit()
+            changed = tasks_router._advance_weekly_flexible_tasks_for_family(db, family.id)
+            db.commit()
+
+            self.assertFalse(changed)
+            self.assertEqual(db.query(Task).filter(Task.family_id == family.id).count(), 1)
+            state = db.query(WeeklyFlexibleSeriesState).filter(WeeklyFlexibleSeriesState.family_id == family.id).one()
+            self.assertEqual(state.latest_task_id, current.id)
+            self.assertTrue(state.latest_approved)
+        finally:
+            db.close()
+
+
+    def test_watermark_is_published_only_after_commit(self) -> None:
+        db, family, parent, child = self._create_family()
+        try:
+            db.add(
+                self._weekly_task(
+                    family, parent, child, tasks_router._start_of_week(datetime.utcnow()), TaskStatusEnum.open
+                )
+            )
+            db.commit()
+
+            tasks_router._advance_weekly_flexible_tasks_for_family(db, family.id)
+            db.rollback()
+            self.assertNotIn(family.id, tasks_router._weekly_flexible_watermarks)
+
+            tasks_router._advance_weekly_flexible_tasks_for_family(db, family.id)
+            self.assertNotIn(family.id, tasks_router._weekly_flexible_watermarks)
+            db.commit()
+            self.assertIn(family.id, tasks_router._weekly_flexible_watermarks)
+        finally:
+            db.close()
+
+if __name__ == "__main__":
+    unittest.main()